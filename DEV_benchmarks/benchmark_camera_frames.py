@@ -0,0 +1,192 @@
+"""
+Benchmark Kamera-Frames - IDS-Frame-Pfad mit Puffer-Pool gegen den alten Kopier-Pfad
+Nutzt einen Mock-Datastream (keine Kamera nötig), der IDS-Buffer und IPL-Konvertierung nachbildet
+
+Gemessen pro Frame:
+    - Anzahl neu angelegter Frame-Puffer (Konvertierung, Farbraum, Normalisierung, Kopie)
+    - Speicherspitze über tracemalloc (in Frame-Größen)
+    - Zeit
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/benchmark_camera_frames.py [anzahl_frames]
+"""
+
+import os
+import sys
+import time
+import types
+import tracemalloc
+from collections import deque
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import camera_manager as camera_module
+from camera_manager import CameraManager
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+FRAMES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+WIDTH, HEIGHT = 1936, 1216   # IDS-Kamera
+FRAME_BYTES = WIDTH * HEIGHT * 3
+
+
+# -----------------------------
+# MOCK IDS PEAK / IPL
+# -----------------------------
+def convert_rgb_payload(array, pixel_format):
+    """RGB8-Payload in das Zielformat konvertieren (immer neuer Speicher, wie IPL)."""
+    if pixel_format == 'BGR8':
+        return cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+    return array.copy()
+
+
+class MockImage:
+    """IPL-Bild: hält ein numpy-Array; get_numpy_3D() ist eine Sicht (wie bei IPL)."""
+
+    allocations = 0
+
+    def __init__(self, array):
+        self.array = array
+
+    def ConvertTo(self, pixel_format):
+        MockImage.allocations += 1
+        return MockImage(convert_rgb_payload(self.array, pixel_format))
+
+    def get_numpy_3D(self):
+        return self.array
+
+
+class MockConverter:
+    """IPL-ImageConverter: liefert pro Aufruf ein neues Bild im Zielformat."""
+
+    def Convert(self, image, pixel_format):
+        MockImage.allocations += 1
+        return MockImage(convert_rgb_payload(image.array, pixel_format))
+
+
+class MockDatastream:
+    """Liefert reihum vorbereitete Kamera-Buffer (RGB8-Payload)."""
+
+    def __init__(self, count=4):
+        rng = np.random.default_rng(0)
+        self.buffers = [rng.integers(0, 255, (HEIGHT, WIDTH, 3), dtype=np.uint8) for _ in range(count)]
+        self.index = 0
+        self.queued = 0
+
+    def WaitForFinishedBuffer(self, timeout):
+        buffer = self.buffers[self.index % len(self.buffers)]
+        self.index += 1
+        return buffer
+
+    def QueueBuffer(self, buffer):
+        self.queued += 1
+
+
+def install_mocks():
+    """IPL-Module im camera_manager durch Mocks ersetzen (RGB8-Payload)."""
+    camera_module.IDS_IPL_AVAILABLE = True
+    camera_module.ids_ipl_extension = types.SimpleNamespace(BufferToImage=MockImage)
+    camera_module.ids_ipl = types.SimpleNamespace(
+        ImageConverter=MockConverter,
+        PixelFormatName_RGB8='RGB8',
+        PixelFormatName_BGR8='BGR8',
+    )
+
+
+def legacy_get_frame(datastream):
+    """Alter Pfad aus CameraManager._get_ids_frame (vor dem Puffer-Pool).
+
+    Returns:
+        tuple: (frame, Liste der Zwischenergebnisse)
+    """
+    buffer = datastream.WaitForFinishedBuffer(10)
+    raw_image = camera_module.ids_ipl_extension.BufferToImage(buffer)
+    color_image = raw_image.ConvertTo(camera_module.ids_ipl.PixelFormatName_RGB8)
+    datastream.QueueBuffer(buffer)
+    frame = color_image.get_numpy_3D()
+    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    frame_norm = cv2.normalize(frame, None, 0, 255, cv2.NORM_MINMAX)
+    frame_astype = frame_norm.astype(np.uint8)
+    current = frame_astype.copy()
+    return current, [color_image.array, frame, frame_norm, frame_astype, current]
+
+
+def count_new_buffers(arrays):
+    """Anzahl Arrays, die keinen Speicher mit einem Vorgänger teilen."""
+    count = 0
+    for i, array in enumerate(arrays):
+        if not any(np.shares_memory(array, earlier) for earlier in arrays[:i]):
+            count += 1
+    return count
+
+
+def measure(name, grab, frames):
+    """Zeit und Speicherspitze pro Frame messen."""
+    grab()  # Aufwärmen (Pool-Puffer anlegen)
+    tracemalloc.start()
+    peak_total = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        grab()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - base
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    print(f"{name:22s} {elapsed / frames * 1000:7.2f} ms/Frame   "
+          f"Speicherspitze {peak_total / frames / FRAME_BYTES:5.2f} Frame-Größen")
+
+
+def main():
+    install_mocks()
+    print(f"{FRAMES} Frames {WIDTH}x{HEIGHT}, Mock-Datastream\n")
+
+    # --- Alter Pfad ---
+    datastream = MockDatastream()
+    _, intermediates = legacy_get_frame(datastream)
+    legacy_allocs = count_new_buffers(intermediates)
+    measure("alt (5 Kopien)", lambda: legacy_get_frame(datastream), FRAMES)
+
+    # --- Neuer Pfad über CameraManager ---
+    for normalize in (False, True):
+        manager = CameraManager()
+        manager.source_type = 'ids'
+        manager.ids_datastream = MockDatastream()
+        manager.configure_frames(pool_size=8, normalize=normalize)
+
+        MockImage.allocations = 0
+        pool_before = manager.frame_pool.allocations
+        held = deque(maxlen=4)   # Verbraucher halten einige Frames (Pipeline, GUI)
+        for _ in range(FRAMES):
+            held.append(manager.get_frame())
+        in_pool = all(f.pool is manager.frame_pool and not f.flags.writeable for f in held)
+        assert manager.frame_pool.grown == 0 and manager.frame_pool.dropped == 0, \
+            "Frame-Puffer-Pool zu klein"
+        pool_allocs = manager.frame_pool.allocations - pool_before
+        converter_allocs = MockImage.allocations
+        per_frame = (converter_allocs + pool_allocs) / FRAMES
+        label = "neu (Pool, normalize)" if normalize else "neu (Pool)"
+        measure(label, manager.get_frame, FRAMES)
+        print(f"{'':22s} Frame-Puffer neu angelegt: {per_frame:.2f}/Frame "
+              f"(Konverter {converter_allocs}, Pool {pool_allocs}), schreibgeschützte Pool-Sichten: {in_pool}")
+
+    print(f"\nalt: {legacy_allocs} Frame-Puffer neu angelegt pro Frame")
+
+    # Ergebnis gleich (ohne Normalisierung bei Vollbereich identisch)
+    datastream = MockDatastream()
+    legacy, _ = legacy_get_frame(datastream)
+    manager = CameraManager()
+    manager.source_type = 'ids'
+    manager.ids_datastream = MockDatastream()
+    manager.configure_frames(normalize=True)
+    assert np.array_equal(legacy, manager.get_frame()), "Frames weichen vom alten Pfad ab"
+    print("Frames identisch zum alten Pfad (mit Normalisierung)")
+
+
+if __name__ == "__main__":
+    main()
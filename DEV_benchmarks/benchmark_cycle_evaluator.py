@@ -0,0 +1,180 @@
+"""
+Benchmark CycleEvaluator - vorübersetzte Regeltabelle gegen die alte Auswertung pro Klasse
+Prüft, dass beide für jeden Zyklus dasselbe Gut/Schlecht-Ergebnis liefern, und misst die Zeit pro Zyklus
+
+Ohne Argument werden zufällige Zyklen erzeugt. Mit Pfad zu einem Zyklus-Log
+(detection_cycles_YYYY-MM-DD.parquet) werden die aufgezeichneten Zyklen ausgewertet;
+die Regeln kommen dann aus settings.json (oder dem zweiten Argument).
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/benchmark_cycle_evaluator.py [detection_cycles.parquet [settings.json]]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cycle_evaluator import CycleEvaluator
+from cycle_statistics import CycleStatistics, ClassStatistics
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+CYCLES_PATH = sys.argv[1] if len(sys.argv) > 1 else None
+SETTINGS_PATH = sys.argv[2] if len(sys.argv) > 2 else 'settings.json'
+RANDOM_CYCLES = 20000
+CLASSES = 12
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def legacy_evaluate(settings, cycle_detections, cycle_image_count):
+    """Alte Auswertung aus DetectionApp.evaluate_detection_results (vor der Regeltabelle)."""
+    class_assignments = settings.get('class_assignments', {})
+    bad_parts_found = False
+
+    if class_assignments:
+        for class_name, stats in cycle_detections.items():
+            class_id = stats.get('class_id', 0)
+            max_conf = stats.get('max_confidence', 0.0)
+            total_detections = stats.get('total_detections', 0)
+            avg_count = round(total_detections / cycle_image_count) if cycle_image_count > 0 else 0
+
+            assignment = class_assignments.get(str(class_id), {})
+            assignment_type = assignment.get('assignment', 'ignore')
+            expected_count = assignment.get('expected_count', -1)
+            min_confidence = assignment.get('min_confidence', 0.5)
+
+            if assignment_type == 'bad' and max_conf >= min_confidence:
+                bad_parts_found = True
+            elif assignment_type == 'good' and expected_count != -1:
+                if avg_count != expected_count and max_conf >= min_confidence:
+                    bad_parts_found = True
+    else:
+        bad_part_classes = settings.get('bad_part_classes', [])
+        red_threshold = settings.get('red_threshold', 1)
+        min_confidence = settings.get('bad_part_min_confidence', 0.5)
+        for class_name, stats in cycle_detections.items():
+            if (stats.get('class_id', 0) in bad_part_classes and
+                    stats.get('total_detections', 0) >= red_threshold and
+                    stats.get('max_confidence', 0.0) >= min_confidence):
+                bad_parts_found = True
+
+    return bad_parts_found
+
+
+def random_settings(rng):
+    """Zufällige Klassenzuteilung über alle Arten."""
+    class_assignments = {}
+    for class_id in range(CLASSES):
+        kind = rng.choice(['ignore', 'good', 'bad'], p=[0.3, 0.5, 0.2])
+        class_assignments[str(class_id)] = {
+            'assignment': str(kind),
+            'expected_count': int(rng.choice([-1, 1, 2, 4])),
+            'min_confidence': round(float(rng.uniform(0.3, 0.8)), 2),
+        }
+    return {'class_assignments': class_assignments}
+
+
+def random_cycles(rng, count):
+    """Zufällige Zyklen: (cycle_detections, cycle_image_count)."""
+    cycles = []
+    for _ in range(count):
+        image_count = int(rng.integers(0, 30))
+        detections = {}
+        for class_id in rng.choice(CLASSES + 3, int(rng.integers(0, 6)), replace=False).tolist():
+            detections[f"Class {class_id}"] = {
+                'class_id': class_id,
+                'total_detections': int(rng.integers(1, 4 * max(image_count, 1))),
+                'max_confidence': float(rng.uniform(0.2, 1.0)),
+            }
+        cycles.append((detections, image_count))
+    return cycles
+
+
+def recorded_cycles(path):
+    """Zyklen aus einem Zyklus-Log (typisiertes Parquet-Schema des DetectionLoggers)."""
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=['image_count', 'classes'])
+    cycles = []
+    for image_count, classes in zip(table.column('image_count').to_pylist(), table.column('classes').to_pylist()):
+        detections = {entry['class_name'] or f"Class {entry['class_id']}": entry for entry in classes or []}
+        cycles.append((detections, image_count or 0))
+    return cycles
+
+
+def as_cycle_statistics(detections):
+    """Zyklus als CycleStatistics (wie im Betrieb); nur Anzahl und Maximum sind für die Auswertung relevant."""
+    statistics = CycleStatistics()
+    for class_name, stats in detections.items():
+        class_statistics = statistics[class_name] = ClassStatistics(stats.get('class_id', 0))
+        class_statistics.count = stats.get('total_detections', 0)
+        class_statistics.max_confidence = stats.get('max_confidence', 0.0)
+    return statistics
+
+
+def measure(name, evaluate, cycles):
+    start = time.perf_counter()
+    results = [evaluate(detections, image_count) for detections, image_count in cycles]
+    elapsed = time.perf_counter() - start
+    print(f"{name:28s} {elapsed / len(cycles) * 1e6:8.2f} µs/Zyklus")
+    return results
+
+
+def compare(settings, cycles):
+    """Beide Auswertungen laufen lassen und Ergebnisse vergleichen."""
+    start = time.perf_counter()
+    evaluator = CycleEvaluator.from_settings(settings)
+    print(f"{'Regeltabelle übersetzen':28s} {(time.perf_counter() - start) * 1e6:8.2f} µs (einmal pro Änderung)")
+
+    expected = measure("alt (dict pro Klasse)", lambda d, n: legacy_evaluate(settings, d, n), cycles)
+    actual = measure("CycleEvaluator (dict)", lambda d, n: evaluator.evaluate(d, n).bad_parts_detected, cycles)
+    live_cycles = [(as_cycle_statistics(detections), image_count) for detections, image_count in cycles]
+    live = measure("CycleEvaluator (Statistik)", lambda d, n: evaluator.evaluate(d, n).bad_parts_detected,
+                   live_cycles)
+
+    # Alle Zyklen in einem Aufruf (offline): Klassen-Zeilen flach, Ergebnis pro Zyklus zusammenfassen
+    rows = [(index, stats.get('class_id', 0), stats.get('total_detections', 0), stats.get('max_confidence', 0.0),
+             image_count)
+            for index, (detections, image_count) in enumerate(cycles) for stats in detections.values()]
+    cycle_index, class_ids, totals, maxima, image_counts = (np.array(column) for column in zip(*rows or [(0,) * 5]))
+    start = time.perf_counter()
+    reasons = evaluator.evaluate_arrays(class_ids, totals, maxima, image_counts)
+    batch = np.zeros(len(cycles), dtype=bool)
+    batch[cycle_index[reasons != 0]] = True
+    elapsed = time.perf_counter() - start
+    print(f"{'CycleEvaluator (alle Zyklen)':28s} {elapsed / len(cycles) * 1e6:8.2f} µs/Zyklus")
+
+    mismatches = sum(a != b for a, b in zip(expected, actual))
+    mismatches += sum(a != b for a, b in zip(expected, live))
+    mismatches += int(np.count_nonzero(batch != np.array(expected)))
+    print(f"{len(cycles)} Zyklen, {sum(expected)} schlecht, Abweichungen: {mismatches}")
+    return mismatches
+
+
+def main():
+    if CYCLES_PATH:
+        with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+        mismatches = compare(settings, recorded_cycles(CYCLES_PATH))
+    else:
+        rng = np.random.default_rng(0)
+        cycles = random_cycles(rng, RANDOM_CYCLES)
+        print("Neue Struktur (class_assignments):")
+        mismatches = compare(random_settings(rng), cycles)
+        print("\nAlte Struktur (bad_part_classes):")
+        mismatches += compare({'bad_part_classes': [1, 4, 13], 'red_threshold': 3,
+                               'bad_part_min_confidence': 0.6}, cycles)
+
+    assert mismatches == 0, "CycleEvaluator weicht von der alten Auswertung ab"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark DetectionLogger - Kosten pro Event über 100k Events
+Zeigt, dass die Schreibkosten pro Event konstant bleiben (kein Lesen/Neuschreiben der Tagesdatei)
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/benchmark_detection_logger.py [anzahl_events]
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection_logger import DetectionLogger
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+TOTAL_EVENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+CHUNK_SIZE = 10000   # Auswertung in Blöcken à 10k Events
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class BenchmarkSettings:
+    """Minimaler Settings-Ersatz mit get()-Schnittstelle."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+
+def main():
+    log_dir = tempfile.mkdtemp(prefix="detection_logger_bench_")
+    settings = BenchmarkSettings({
+        'parquet_log_enabled': True,
+        'parquet_log_directory': log_dir,
+    })
+
+    logger = DetectionLogger(settings)
+    cycle_detections = {
+        'good_part': {'count': 4, 'max_confidence': 0.93, 'min_confidence': 0.71,
+                      'avg_confidence': 0.85, 'class_id': 0, 'total_detections': 4},
+    }
+
+    print(f"Schreibe {TOTAL_EVENTS} Events nach {log_dir}")
+    print(f"{'Events':>10} | {'µs/Event':>10}")
+    print("-" * 25)
+
+    chunk_costs = []
+    for chunk_start in range(0, TOTAL_EVENTS, CHUNK_SIZE):
+        start = time.perf_counter()
+        for _ in range(min(CHUNK_SIZE, TOTAL_EVENTS - chunk_start)):
+            logger.log_detection_cycle(False, cycle_detections, {'cycle_image_count': 12})
+        cost_us = (time.perf_counter() - start) / CHUNK_SIZE * 1e6
+        chunk_costs.append(cost_us)
+        print(f"{chunk_start + CHUNK_SIZE:>10} | {cost_us:>10.1f}")
+
+    start = time.perf_counter()
+    logger.close()
+    close_time = time.perf_counter() - start
+
+    print("-" * 25)
+    print(f"Erster Block: {chunk_costs[0]:.1f} µs/Event, letzter Block: {chunk_costs[-1]:.1f} µs/Event")
+    print(f"Verhältnis letzter/erster Block: {chunk_costs[-1] / chunk_costs[0]:.2f} (≈1 = konstant)")
+    print(f"close() inkl. Zusammenführen: {close_time:.2f} s")
+
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
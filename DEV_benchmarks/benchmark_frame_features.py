@@ -0,0 +1,95 @@
+"""
+Benchmark Frame-Features - gemeinsame Vorverarbeitung gegen den alten Mehrfach-Pfad
+Prüft zusätzlich, dass das Hintergrundmodell genau einmal pro Frame aktualisiert wird
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/benchmark_frame_features.py [anzahl_frames] [pyramid_level]
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_features import FrameFeatureExtractor
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+FRAMES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+PYRAMID_LEVEL = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+WIDTH, HEIGHT = 1936, 1216   # IDS-Kamera
+
+
+def make_frames(count):
+    """Synthetische Frames: Rauschen plus wanderndes Rechteck (Förderband)."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(60, 120, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        x = (i * 37) % (WIDTH - 300)
+        cv2.rectangle(frame, (x, 400), (x + 300, 800), (220, 220, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+class CountingSubtractor:
+    """Hülle um MOG2, die apply()-Aufrufe zählt."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def apply(self, image):
+        self.calls += 1
+        return self.inner.apply(image)
+
+
+def legacy_pass(frame, bg_subtractor, kernel):
+    """Alter Pfad: Helligkeit, Motion-Anzeige und zweimal detect_robust_motion."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    np.mean(gray)
+    for _ in range(3):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+        fg_mask = bg_subtractor.apply(gray)
+        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
+        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
+        cv2.countNonZero(fg_mask)
+
+
+def main():
+    frames = make_frames(FRAMES)
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+    legacy_subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False, varThreshold=32, history=200)
+    start = time.perf_counter()
+    for frame in frames:
+        legacy_pass(frame, legacy_subtractor, kernel)
+    legacy_ms = (time.perf_counter() - start) / FRAMES * 1000
+
+    extractor = FrameFeatureExtractor(pyramid_level=PYRAMID_LEVEL)
+    extractor.reset()
+    extractor.bg_subtractor = CountingSubtractor(extractor.bg_subtractor)
+    start = time.perf_counter()
+    for frame in frames:
+        extractor.compute(frame)
+    shared_ms = (time.perf_counter() - start) / FRAMES * 1000
+
+    print(f"{FRAMES} Frames {WIDTH}x{HEIGHT}, Pyramidenstufe {PYRAMID_LEVEL}")
+    print(f"Alter Pfad:            {legacy_ms:7.2f} ms/Frame")
+    print(f"Gemeinsame Features:   {shared_ms:7.2f} ms/Frame ({legacy_ms / shared_ms:.1f}x schneller)")
+    print(f"MOG2-Updates: {extractor.bg_subtractor.calls} bei {extractor.frames_processed} Frames")
+
+    assert extractor.bg_subtractor.calls == extractor.frames_processed == FRAMES, \
+        "Hintergrundmodell wurde nicht genau einmal pro Frame aktualisiert"
+    assert extractor.apply_count == FRAMES
+
+
+if __name__ == "__main__":
+    main()
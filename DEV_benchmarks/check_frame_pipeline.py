@@ -0,0 +1,81 @@
+"""
+Check Frame-Pipeline - Pipeline einige Sekunden mit Statistik-Signal und langsamer GUI laufen lassen
+Prüft, dass jede Statistik-Zeile (auch 'ui') dieselben Schlüssel hat und sich wie in
+DetectionApp.on_pipeline_stats formatieren lässt, und dass die GUI-Übergabe nicht staut
+
+Eine Ausnahme im Statistik-Slot beendet den Prozess (PyQt6 bricht ab) - genau wie in der Anwendung.
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/check_frame_pipeline.py [sekunden]
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from frame_pipeline import FramePipeline, format_pipeline_stats
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+DURATION = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+STATS_INTERVAL = 0.2
+CAPTURE_FPS = 200
+GUI_DELAY = 0.03   # Dauer des frame_ready-Slots (langsame GUI)
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    rendered = [0]
+    delivered = []
+    stats_updates = []
+
+    def render(packet):
+        rendered[0] += 1
+
+    def on_frame(packet):
+        delivered.append(packet.sequence)
+        time.sleep(GUI_DELAY)
+
+    def on_stats(stats):
+        # Wie DetectionApp.on_pipeline_stats: jede Zeile wird formatiert
+        format_pipeline_stats(stats)
+        stats_updates.append(stats)
+
+    pipeline = FramePipeline(lambda: frame, lambda packet: None, lambda packet: None, render,
+                             capture_fps=CAPTURE_FPS, stats_interval=STATS_INTERVAL)
+    pipeline.frame_ready.connect(on_frame)
+    pipeline.stats_updated.connect(on_stats)
+    pipeline.start()
+    QTimer.singleShot(int(DURATION * 1000), app.quit)
+    app.exec()
+    pipeline.stop()
+
+    final = pipeline.get_stats()
+    print("Pipeline: " + format_pipeline_stats(final))
+    print(f"{rendered[0]} gerendert, {len(delivered)} an die GUI übergeben, "
+          f"{final['ui']['dropped']} vor der GUI verworfen, {len(stats_updates)} Statistik-Signale")
+
+    assert stats_updates, "Kein stats_updated-Signal empfangen"
+    keys = set(final['capture'])
+    for name, entry in final.items():
+        assert set(entry) == keys, f"Statistik '{name}' hat andere Schlüssel: {sorted(entry)}"
+    assert all(a < b for a, b in zip(delivered, delivered[1:])), "GUI erhielt Frames nicht in Reihenfolge"
+    # Jedes gerenderte Frame wurde übergeben, verworfen oder beim Stopp verworfen (höchstens eines)
+    assert 0 <= rendered[0] - len(delivered) - final['ui']['dropped'] <= 1, "Frames in der GUI-Übergabe verloren"
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
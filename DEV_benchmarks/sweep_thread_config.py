@@ -0,0 +1,213 @@
+"""
+Thread-Konfiguration durchsuchen - Torch/OpenCV-Threads und CPU-Affinität
+Misst KI-Durchsatz, während parallel die Vorverarbeitung (FrameFeatureExtractor)
+auf Kamera-Frames läuft, und schreibt die beste Konfiguration in settings.json
+
+Jede Konfiguration läuft in einem eigenen Prozess, weil Torch Inter-Op-Threads
+nur einmal pro Prozess gesetzt werden können.
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/sweep_thread_config.py [--model modell.pt] [--backend pytorch]
+                                                 [--duration 5] [--dry-run]
+Ohne --model wird eine synthetische OpenCV-Last (Faltungen) als KI-Ersatz gemessen.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_features import FrameFeatureExtractor
+from resource_manager import ResourceManager, AFFINITY_SUPPORTED
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+WIDTH, HEIGHT = 1936, 1216   # IDS-Kamera
+PYRAMID_LEVEL = 2
+MIN_PREPROCESS_FPS = 30      # Vorverarbeitung muss mit der Aufnahmerate mithalten
+SETTING_KEYS = ('torch_threads', 'torch_interop_threads', 'opencv_threads', 'cpu_affinity')
+
+
+def make_frames(count=8):
+    """Synthetische Frames: Rauschen plus wanderndes Rechteck (Förderband)."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(60, 120, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        x = (i * 197) % (WIDTH - 300)
+        cv2.rectangle(frame, (x, 400), (x + 300, 800), (220, 220, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+def make_inference_fn(model_path, backend):
+    """KI-Last: echtes Modell über create_backend oder synthetische Faltungen."""
+    if model_path:
+        from detection_engine import create_backend
+        model = create_backend(model_path, backend)
+        params = {'conf': 0.25, 'iou': 0.7, 'max_det': 300}
+        return lambda frame: model.predict([frame], params)
+
+    kernel = np.ones((9, 9), np.float32) / 81.0
+
+    def synthetic(frame):
+        image = cv2.resize(frame, (640, 640), interpolation=cv2.INTER_AREA).astype(np.float32)
+        for _ in range(4):
+            image = cv2.filter2D(image, -1, kernel)
+        return image
+
+    return synthetic
+
+
+def run_config(config, model_path, backend, duration):
+    """Eine Konfiguration messen (läuft im Kindprozess)."""
+    resources = ResourceManager(config)
+    applied = resources.apply_global()
+    resources.pin_current_thread('inference')
+
+    frames = make_frames()
+    inference = make_inference_fn(model_path, backend)
+    inference(frames[0])  # Aufwärmen
+
+    stop = threading.Event()
+    preprocess_count = [0]
+
+    def preprocess_loop():
+        resources.pin_current_thread('preprocess')
+        extractor = FrameFeatureExtractor(pyramid_level=PYRAMID_LEVEL)
+        i = 0
+        while not stop.is_set():
+            extractor.compute(frames[i % len(frames)])
+            preprocess_count[0] += 1
+            i += 1
+
+    worker = threading.Thread(target=preprocess_loop, daemon=True)
+    worker.start()
+
+    inference_count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        inference(frames[inference_count % len(frames)])
+        inference_count += 1
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worker.join()
+
+    return {
+        'inference_fps': inference_count / elapsed,
+        'preprocess_fps': preprocess_count[0] / elapsed,
+        'applied': applied,
+    }
+
+
+def build_candidates():
+    """Thread-Anzahlen und Kernaufteilungen passend zur Maschine."""
+    cpu_count = os.cpu_count() or 1
+    thread_options = sorted({1, max(1, cpu_count // 2), max(1, cpu_count - 1), cpu_count})
+
+    affinity_options = [{'enabled': False}]
+    if AFFINITY_SUPPORTED and cpu_count >= 4:
+        for reserved in sorted({1, 2, cpu_count // 4} - {0}):
+            cores = list(range(cpu_count))
+            # Vordere Kerne für GUI/Aufnahme/Vorverarbeitung, Rest für die KI
+            affinity_options.append({
+                'enabled': True,
+                'ui': cores[:reserved],
+                'capture': cores[:reserved],
+                'preprocess': cores[:reserved],
+                'inference': cores[reserved:],
+                'render': cores[:reserved],
+            })
+
+    candidates = []
+    for affinity in affinity_options:
+        inference_cores = len(affinity.get('inference', [])) or cpu_count
+        for threads in thread_options:
+            if threads > inference_cores:
+                continue
+            for opencv_threads in (-1, 1, 2):
+                candidates.append({
+                    'torch_threads': threads,
+                    'torch_interop_threads': 1,
+                    'opencv_threads': opencv_threads,
+                    'cpu_affinity': affinity,
+                })
+    return candidates
+
+
+def score(result):
+    """KI-FPS zählt, sofern die Vorverarbeitung die Aufnahmerate hält."""
+    penalty = 1.0 if result['preprocess_fps'] >= MIN_PREPROCESS_FPS else 0.5
+    return result['inference_fps'] * penalty
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', help='Modellpfad (.pt/.onnx) - ohne: synthetische Last')
+    parser.add_argument('--backend', default='pytorch')
+    parser.add_argument('--duration', type=float, default=5.0, help='Messdauer pro Konfiguration (Sekunden)')
+    parser.add_argument('--dry-run', action='store_true', help='settings.json nicht ändern')
+    parser.add_argument('--run-config', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_config:
+        result = run_config(json.loads(args.run_config), args.model, args.backend, args.duration)
+        print(json.dumps(result))
+        return
+
+    candidates = build_candidates()
+    print(f"{len(candidates)} Konfigurationen, {os.cpu_count()} Kerne, je {args.duration:.0f} s")
+
+    results = []
+    for config in candidates:
+        command = [sys.executable, os.path.abspath(__file__), '--run-config', json.dumps(config),
+                   '--backend', args.backend, '--duration', str(args.duration)]
+        if args.model:
+            command += ['--model', args.model]
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"FEHLER {config}: {proc.stderr.strip().splitlines()[-1:]}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append((score(result), config, result))
+
+        affinity = config['cpu_affinity']
+        split = f"KI auf {len(affinity['inference'])} Kernen" if affinity.get('enabled') else "keine Affinität"
+        print(f"threads={config['torch_threads']:2d} opencv={config['opencv_threads']:2d} {split:22s} "
+              f"KI {result['inference_fps']:7.1f} FPS  Vorverarbeitung {result['preprocess_fps']:7.1f} FPS")
+
+    if not results:
+        print("Keine Konfiguration erfolgreich gemessen")
+        sys.exit(1)
+
+    best_score, best, best_result = max(results, key=lambda r: r[0])
+    print(f"\nBeste Konfiguration: {json.dumps(best)}")
+    print(f"KI {best_result['inference_fps']:.1f} FPS, Vorverarbeitung {best_result['preprocess_fps']:.1f} FPS")
+
+    if args.dry_run:
+        print("--dry-run: settings.json unverändert")
+        return
+
+    from settings import Settings
+    settings = Settings()
+    for key in SETTING_KEYS:
+        value = best[key]
+        if key == 'cpu_affinity' and not value.get('enabled'):
+            value = dict(settings.get('cpu_affinity', {}) or {}, enabled=False)
+        settings.set(key, value)
+    settings.save()
+    print("In settings.json gespeichert (wirkt beim nächsten Programmstart)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Genauigkeits-Vergleich der KI-Backends - ONNX Runtime / OpenVINO gegen PyTorch
+Jede PyTorch-Box muss im anderen Backend mit gleicher Klasse, IoU >= 0.9 und
+Konfidenz-Abweichung <= 0.05 wiedergefunden werden (und umgekehrt)
+
+Aufruf (aus dem Projektverzeichnis):
+    python DEV_benchmarks/verify_onnx_parity.py <modell.pt> <bildordner> [onnxruntime|openvino]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection_engine import create_backend
+
+# -----------------------------
+# KONFIGURATION
+# -----------------------------
+IOU_MIN = 0.9
+CONF_TOLERANCE = 0.05
+PARAMS = {'conf': 0.25, 'iou': 0.7, 'max_det': 300}
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def box_iou(a, b):
+    """IoU-Matrix zwischen zwei DETECTION_DTYPE-Arrays."""
+    ax1, ay1, ax2, ay2 = (a[k][:, None].astype(np.float64) for k in ('x1', 'y1', 'x2', 'y2'))
+    bx1, by1, bx2, by2 = (b[k][None, :].astype(np.float64) for k in ('x1', 'y1', 'x2', 'y2'))
+    inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = inter_w * inter_h
+    union = (ax2 - ax1) * (ay2 - ay1) + (bx2 - bx1) * (by2 - by1) - inter
+    return np.where(union > 0, inter / union, 0.0)
+
+
+def count_matches(reference, candidate):
+    """Anzahl Referenz-Boxen mit passender Box im Kandidaten (gleiche Klasse, IoU, Konfidenz)."""
+    if len(reference) == 0 or len(candidate) == 0:
+        return 0
+    iou = box_iou(reference, candidate)
+    same_class = reference['class_id'][:, None] == candidate['class_id'][None, :]
+    conf_close = np.abs(reference['confidence'][:, None] - candidate['confidence'][None, :]) <= CONF_TOLERANCE
+    return int(((iou >= IOU_MIN) & same_class & conf_close).any(axis=1).sum())
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+
+    model_path = sys.argv[1]
+    image_dir = Path(sys.argv[2])
+    backend_name = sys.argv[3] if len(sys.argv) > 3 else 'onnxruntime'
+
+    images = [p for p in sorted(image_dir.iterdir()) if p.suffix.lower() in IMAGE_EXTENSIONS]
+    frames = [cv2.imread(str(p)) for p in images]
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        print(f"Keine Bilder in {image_dir}")
+        sys.exit(2)
+
+    reference = create_backend(model_path, 'pytorch')
+    candidate = create_backend(model_path, backend_name)
+    if candidate is None or candidate.name != backend_name:
+        print(f"Backend '{backend_name}' nicht verfuegbar")
+        sys.exit(2)
+
+    assert candidate.class_names == reference.class_names, "class_names weichen ab"
+
+    timings = {reference.name: 0.0, candidate.name: 0.0}
+    ref_total = cand_total = ref_matched = cand_matched = 0
+
+    for frame in frames:
+        start = time.perf_counter()
+        ref = reference.predict([frame], PARAMS)[0]
+        timings[reference.name] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        cand = candidate.predict([frame], PARAMS)[0]
+        timings[candidate.name] += time.perf_counter() - start
+
+        ref_total += len(ref)
+        cand_total += len(cand)
+        ref_matched += count_matches(ref, cand)
+        cand_matched += count_matches(cand, ref)
+
+    recall = ref_matched / ref_total if ref_total else 1.0
+    precision = cand_matched / cand_total if cand_total else 1.0
+
+    print(f"{len(frames)} Bilder, {ref_total} Boxen PyTorch, {cand_total} Boxen {candidate.name}")
+    for name, total in timings.items():
+        print(f"{name:12s} {total / len(frames) * 1000:7.1f} ms/Bild")
+    print(f"Wiedergefunden: {recall:.1%} der PyTorch-Boxen, {precision:.1%} der {candidate.name}-Boxen")
+
+    if recall < 0.99 or precision < 0.99:
+        print("PARITAET NICHT ERFUELLT")
+        sys.exit(1)
+    print("Paritaet OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Kamera-Aufnahme - eigener Thread pro Quelle mit Ringpuffer
+Die Kamera wird im Sensortakt ausgelesen, unabhängig davon, wie schnell verarbeitet wird
+Jedes Frame erhält Sequenznummer und Aufnahmezeit; übersprungene und verlorene Frames werden gezählt
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+
+
+class CapturedFrame:
+    """Ein aufgenommenes Frame mit Sequenznummer und Aufnahmezeit."""
+
+    __slots__ = ('sequence', 'timestamp', 'frame', 'sensor_frame_id')
+
+    def __init__(self, sequence, timestamp, frame, sensor_frame_id=None):
+        self.sequence = sequence                # Fortlaufend ab 1 je Aufnahme-Start
+        self.timestamp = timestamp              # time.time() bei Eintreffen des Frames
+        self.frame = frame                      # numpy array (PooledFrame)
+        self.sensor_frame_id = sensor_frame_id  # Frame-Zähler der Kamera (IDS), sonst None
+
+
+class FrameRing:
+    """Ringpuffer der letzten N Frames für genau einen Verbraucher.
+
+    latest() liefert das neueste Frame ohne zu warten, wait_next() blockiert bis
+    ein noch nicht ausgeliefertes Frame vorliegt und liefert das neueste davon.
+    Frames, die dazwischen eintreffen und nie ausgeliefert werden, zählen als
+    übersprungen (skipped); Lücken im Frame-Zähler der Kamera als verloren (lost).
+    """
+
+    def __init__(self, slots=4):
+        self.slots = max(1, int(slots))
+        self._frames = deque(maxlen=self.slots)
+        self._condition = threading.Condition()
+        self._sequence = 0
+        self._delivered_sequence = 0
+        self._last_sensor_id = None
+        self.captured = 0
+        self.delivered = 0
+        self.skipped = 0
+        self.lost = 0
+
+    def push(self, frame, timestamp=None, sensor_frame_id=None):
+        """Neues Frame ablegen (Aufnahme-Thread)."""
+        with self._condition:
+            self._sequence += 1
+            self.captured += 1
+            if sensor_frame_id is not None:
+                if self._last_sensor_id is not None and sensor_frame_id > self._last_sensor_id + 1:
+                    self.lost += sensor_frame_id - self._last_sensor_id - 1
+                self._last_sensor_id = sensor_frame_id
+            captured = CapturedFrame(self._sequence, timestamp or time.time(), frame, sensor_frame_id)
+            self._frames.append(captured)
+            self._condition.notify_all()
+            return captured
+
+    def latest(self):
+        """Neuestes Frame (CapturedFrame) oder None, ohne zu warten und ohne es als ausgeliefert zu markieren."""
+        with self._condition:
+            return self._frames[-1] if self._frames else None
+
+    def wait_next(self, timeout=None):
+        """Auf ein noch nicht ausgeliefertes Frame warten.
+
+        Args:
+            timeout (float): Maximale Wartezeit in Sekunden (None = unbegrenzt)
+
+        Returns:
+            CapturedFrame oder None bei Timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._sequence > self._delivered_sequence, timeout):
+                return None
+            captured = self._frames[-1]
+            self.skipped += captured.sequence - self._delivered_sequence - 1
+            self._delivered_sequence = captured.sequence
+            self.delivered += 1
+            return captured
+
+    def reset(self):
+        """Ring leeren und Zähler zurücksetzen (neue Aufnahme)."""
+        with self._condition:
+            self._frames.clear()
+            self._sequence = 0
+            self._delivered_sequence = 0
+            self._last_sensor_id = None
+            self.captured = self.delivered = self.skipped = self.lost = 0
+
+    def get_stats(self):
+        """Zähler der Aufnahme.
+
+        Returns:
+            dict: captured, delivered, skipped, lost, dropped (= skipped + lost)
+        """
+        with self._condition:
+            return {
+                'captured': self.captured,
+                'delivered': self.delivered,
+                'skipped': self.skipped,
+                'lost': self.lost,
+                'dropped': self.skipped + self.lost,
+            }
+
+
+class AcquisitionThread(threading.Thread):
+    """Liest fortlaufend Frames über grab_fn und legt sie im FrameRing ab.
+
+    grab_fn liefert (frame, sensor_frame_id) oder None, wenn kein Frame kam.
+    min_interval begrenzt die Rate (z.B. Video-Dateien auf ihre Bildrate).
+    interrupt_fn bricht beim Stoppen ein blockierendes grab_fn ab (z.B. IDS KillWait).
+    """
+
+    def __init__(self, grab_fn, ring, min_interval=0.0, thread_init_fn=None, interrupt_fn=None,
+                 name="camera-acquisition"):
+        super().__init__(name=name, daemon=True)
+        self.grab_fn = grab_fn
+        self.ring = ring
+        self.min_interval = min_interval
+        self.thread_init_fn = thread_init_fn
+        self.interrupt_fn = interrupt_fn
+        self.errors = 0
+        self._running = threading.Event()
+
+    def start(self):
+        self._running.set()
+        super().start()
+
+    def stop(self, timeout=2.0):
+        """Aufnahme beenden und auf den Thread warten."""
+        self._running.clear()
+        if self.interrupt_fn is not None:
+            try:
+                self.interrupt_fn()
+            except Exception as e:
+                logging.debug(f"Abbruch der Aufnahme-Wartezeit fehlgeschlagen: {e}")
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self):
+        if self.thread_init_fn is not None:
+            try:
+                self.thread_init_fn('capture')
+            except Exception as e:
+                logging.warning(f"Initialisierung des Aufnahme-Threads fehlgeschlagen: {e}")
+
+        next_grab = time.perf_counter()
+        while self._running.is_set():
+            if self.min_interval > 0:
+                wait = next_grab - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                next_grab = max(next_grab + self.min_interval, time.perf_counter())
+
+            try:
+                result = self.grab_fn()
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Fehler im Aufnahme-Thread: {e}")
+                time.sleep(0.01)
+                continue
+
+            if result is None:
+                # Kein Frame - kurz warten statt Busy-Loop
+                time.sleep(0.005)
+                continue
+
+            frame, sensor_frame_id = result
+            self.ring.push(frame, time.time(), sensor_frame_id)
+
+        logging.info("Aufnahme-Thread beendet")
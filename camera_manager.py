@@ -12,6 +12,9 @@ from datetime import datetime
 from pathlib import Path
 import numpy as np
 
+from frame_buffer_pool import FrameBufferPool
+from camera_acquisition import FrameRing, AcquisitionThread
+
 try:
     import ids_peak.ids_peak as ids_peak
     IDS_AVAILABLE = True
@@ -31,7 +34,7 @@ except ImportError:
 class CameraManager:
     """Einfacher Kamera-Manager mit Zeitstempel-Support und verbesserter IDS Peak Integration."""
     
-    def __init__(self, camera_config_manager=None):
+    def __init__(self, camera_config_manager=None, thread_init_fn=None):
         self.camera = None
         self.camera_ready = False
         self.source_type = None  # 'webcam', 'ids', 'video'
@@ -44,6 +47,18 @@ class CameraManager:
         self.ids_datastream = None
         self.remote_device_nodemap = None
         self.payload_size = None
+        self._ids_converter = None
+        
+        # Frames landen in wiederverwendeten Puffern (schreibgeschützte Sichten)
+        self.frame_pool = FrameBufferPool()
+        self.normalize_frames = False  # Min/Max-Normalisierung (kostet eine Bildoperation pro Frame)
+        
+        # Aufnahme-Thread: liest im Sensortakt in den Ringpuffer
+        self.frame_ring = FrameRing()
+        self._acquisition = None
+        self._last_sensor_frame_id = None
+        self.thread_init_fn = thread_init_fn  # z.B. CPU-Affinität der Rolle 'capture'
+        self.ids_wait_timeout_ms = 500        # Wartezeit auf ein IDS-Frame im Aufnahme-Thread
         
         # Kamera-Konfigurationsmanager
         self.camera_config_manager = camera_config_manager
@@ -52,6 +67,22 @@ class CameraManager:
         self._cached_width = None
         self._cached_height = None
     
+    def configure_frames(self, pool_size=None, normalize=None, ring_slots=None):
+        """Frame-Puffer einstellen.
+        
+        Args:
+            pool_size (int): Anzahl Puffer - muss alle gleichzeitig in Pipeline,
+                             Ringpuffer und GUI befindlichen Frames abdecken
+            normalize (bool): Min/Max-Normalisierung der IDS-Frames
+            ring_slots (int): Frames im Ringpuffer des Aufnahme-Threads (wirkt beim nächsten Start)
+        """
+        if pool_size is not None and int(pool_size) != self.frame_pool.size:
+            self.frame_pool.resize(pool_size)
+        if normalize is not None:
+            self.normalize_frames = bool(normalize)
+        if ring_slots is not None and self._acquisition is None:
+            self.frame_ring = FrameRing(ring_slots)
+    
     def set_source(self, source):
         """Kamera/Video-Quelle setzen.
         
@@ -116,18 +147,110 @@ class CameraManager:
             self.start_time = time.time()
             
             if self.source_type == 'webcam':
-                return self._start_webcam()
+                started = self._start_webcam()
             elif self.source_type == 'video':
-                return self._start_video()
+                started = self._start_video()
             elif self.source_type == 'ids':
-                return self._start_ids_camera()
+                started = self._start_ids_camera()
+            else:
+                started = False
             
-            return False
+            if started:
+                self._start_acquisition()
+            return started
             
         except Exception as e:
             logging.error(f"Fehler beim Starten: {e}")
             return False
     
+    def _start_acquisition(self):
+        """Aufnahme-Thread für die aktuelle Quelle starten."""
+        self._stop_acquisition()
+        
+        # Video-Dateien in ihrer Bildrate abspielen, Kameras liefern im Sensortakt
+        min_interval = 0.0
+        if self.source_type == 'video' and self.camera:
+            fps = self.camera.get(cv2.CAP_PROP_FPS)
+            min_interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+        
+        self.frame_ring.reset()
+        self._acquisition = AcquisitionThread(
+            self._acquire_once,
+            self.frame_ring,
+            min_interval=min_interval,
+            thread_init_fn=self.thread_init_fn,
+            interrupt_fn=self._interrupt_ids_wait if self.source_type == 'ids' else None,
+            name=f"camera-{self.source_type}"
+        )
+        self._acquisition.start()
+        logging.info(f"Aufnahme-Thread gestartet ({self.source_type}, Ring {self.frame_ring.slots} Frames)")
+    
+    def _stop_acquisition(self):
+        """Aufnahme-Thread beenden (vor dem Schließen der Quelle)."""
+        if self._acquisition is None:
+            return
+        acquisition = self._acquisition
+        self._acquisition = None
+        acquisition.stop()
+        stats = self.frame_ring.get_stats()
+        logging.info(f"Aufnahme beendet: {stats['captured']} Frames, {stats['delivered']} verarbeitet, "
+                     f"{stats['skipped']} übersprungen, {stats['lost']} verloren")
+    
+    def _interrupt_ids_wait(self):
+        """Laufendes WaitForFinishedBuffer abbrechen (beim Stoppen der Aufnahme)."""
+        if self.ids_datastream is not None:
+            self.ids_datastream.KillWait()
+    
+    def _acquire_once(self):
+        """Ein Frame für den Aufnahme-Thread lesen.
+        
+        Returns:
+            tuple oder None: (Frame, Frame-Zähler der Kamera oder None)
+        """
+        if self.source_type == 'ids':
+            frame = self._get_ids_frame(self.ids_wait_timeout_ms)
+        else:
+            frame = self._get_opencv_frame()
+        if frame is None:
+            return None
+        return frame, self._last_sensor_frame_id if self.source_type == 'ids' else None
+    
+    @property
+    def acquiring(self):
+        """True solange der Aufnahme-Thread läuft."""
+        return self._acquisition is not None and self._acquisition.is_alive()
+    
+    def latest(self):
+        """Neuestes aufgenommenes Frame ohne zu warten.
+        
+        Returns:
+            CapturedFrame oder None
+        """
+        return self.frame_ring.latest()
+    
+    def wait_next(self, timeout=0.1):
+        """Auf das nächste noch nicht verarbeitete Frame warten (neuestes gewinnt).
+        
+        Returns:
+            CapturedFrame oder None bei Timeout
+        """
+        if not self.acquiring:
+            return None
+        return self.frame_ring.wait_next(timeout)
+    
+    def get_acquisition_stats(self):
+        """Zähler des Aufnahme-Threads (aufgenommen, verarbeitet, übersprungen, verloren).
+        
+        Returns:
+            dict: Zähler aus FrameRing plus Fehler, Pool-Erweiterungen und wegen
+                  vollem Pool verworfene Frames
+        """
+        stats = self.frame_ring.get_stats()
+        stats['errors'] = self._acquisition.errors if self._acquisition is not None else 0
+        stats['pool_grown'] = self.frame_pool.grown
+        stats['pool_dropped'] = self.frame_pool.dropped
+        return stats
+    
     def get_current_time(self):
         """Aktuelle Zeit seit Start.
         
@@ -216,6 +339,10 @@ class CameraManager:
                 
             self.ids_datastream = datastreams[0].OpenDataStream()
             
+            # Konverter einmal anlegen (interne Puffer werden wiederverwendet)
+            if IDS_IPL_AVAILABLE:
+                self._ids_converter = ids_ipl.ImageConverter()
+            
             # VERBESSERT: Payload-Size und Buffer-Management
             self.payload_size = self.remote_device_nodemap.FindNode("PayloadSize").Value()
             
@@ -275,9 +402,16 @@ class CameraManager:
     def get_frame(self):
         """Aktuelles Frame holen.
         
+        Läuft der Aufnahme-Thread, wird das neueste Frame aus dem Ringpuffer
+        geliefert (ohne zu warten); sonst wird direkt von der Quelle gelesen.
+        
         Returns:
             numpy.ndarray oder None: Frame als OpenCV-Array
         """
+        if self.acquiring:
+            captured = self.frame_ring.latest()
+            return captured.frame if captured is not None else None
+        
         try:
             if self.source_type in ['webcam', 'video']:
                 return self._get_opencv_frame()
@@ -293,23 +427,82 @@ class CameraManager:
         """Frame von OpenCV-Kamera/Video holen."""
         if not self.camera or not self.camera.isOpened():
             return None
+        if self.frame_pool.exhausted():
+            # Alle Puffer noch in Verwendung - nicht lesen (Video bleibt stehen, Webcam verwirft im Treiber)
+            self.frame_pool.dropped += 1
+            return None
             
-        ret, frame = self.camera.read()
-        if ret:
+        frame = self._read_opencv_into_pool()
+        if frame is not None:
             self.current_frame = frame
             return frame
             
         # Bei Video: Loop zurueck zum Anfang
         if self.source_type == 'video':
             self.camera.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.camera.read()
-            if ret:
+            frame = self._read_opencv_into_pool()
+            if frame is not None:
                 self.current_frame = frame
                 return frame
                 
         return None
     
-    def _get_ids_frame(self):
+    def _read_opencv_into_pool(self):
+        """VideoCapture direkt in den nächsten Pool-Puffer lesen."""
+        shape = self.current_frame.shape if self.current_frame is not None else None
+        if shape is None:
+            ret, frame = self.camera.read()
+            if not ret:
+                return None
+            acquired = self.frame_pool.acquire(frame.shape)
+            if acquired is None:
+                return None
+            slot, buffer = acquired
+            np.copyto(buffer, frame)
+            return self.frame_pool.publish(slot)
+        
+        acquired = self.frame_pool.acquire(shape)
+        if acquired is None:
+            return None
+        slot, buffer = acquired
+        ret, frame = self.camera.read(buffer)
+        if not ret:
+            return None
+        if frame is not buffer and not np.shares_memory(frame, buffer):
+            # Größe hat sich geändert - OpenCV hat neu alloziert (unveröffentlichter Puffer wird wiederverwendet)
+            acquired = self.frame_pool.acquire(frame.shape)
+            if acquired is None:
+                return None
+            slot, buffer = acquired
+            np.copyto(buffer, frame)
+        return self.frame_pool.publish(slot)
+    
+    def _convert_ids_frame(self, buffer):
+        """IDS-Buffer nach BGR8 in einen Pool-Puffer konvertieren.
+        
+        Der Konverter liefert BGR8 direkt (kein cvtColor); das Ergebnis wird
+        einmal in den Pool-Puffer kopiert. Normalisierung nur wenn aktiviert,
+        dann in-place.
+        
+        Returns:
+            PooledFrame oder None, wenn kein Pool-Puffer frei ist (Frame verworfen)
+        """
+        raw_image = ids_ipl_extension.BufferToImage(buffer)
+        if self._ids_converter is None:
+            self._ids_converter = ids_ipl.ImageConverter()
+        color_image = self._ids_converter.Convert(raw_image, ids_ipl.PixelFormatName_BGR8)
+        source = color_image.get_numpy_3D()
+        
+        acquired = self.frame_pool.acquire(source.shape)
+        if acquired is None:
+            return None
+        slot, frame = acquired
+        np.copyto(frame, source)
+        if self.normalize_frames:
+            cv2.normalize(frame, frame, 0, 255, cv2.NORM_MINMAX)
+        return self.frame_pool.publish(slot)
+    
+    def _get_ids_frame(self, timeout_ms=10):
         """Frame von IDS Kamera holen - VERBESSERT mit mehreren Versuchen."""
         if not self.ids_datastream:
             return None
@@ -318,25 +511,24 @@ class CameraManager:
         for attempt in range(max_attempts):
             try:
                 # Warten auf neues Bild mit Timeout
-                buffer = self.ids_datastream.WaitForFinishedBuffer(10)  # 1s timeout
+                buffer = self.ids_datastream.WaitForFinishedBuffer(timeout_ms)
+                try:
+                    self._last_sensor_frame_id = buffer.FrameID()
+                except Exception:
+                    self._last_sensor_frame_id = None
                 
                 # VERBESSERT: IDS IPL Extension für bessere Konvertierung
                 if IDS_IPL_AVAILABLE:
                     try:
-                        # Konvertierung mit IDS IPL (robuster)
-                        raw_image = ids_ipl_extension.BufferToImage(buffer)
-                        color_image = raw_image.ConvertTo(ids_ipl.PixelFormatName_RGB8)
+                        # Konvertierung mit IDS IPL direkt nach BGR8 in den Frame-Pool
+                        frame = self._convert_ids_frame(buffer)
                         
                         # Buffer wieder freigeben
                         self.ids_datastream.QueueBuffer(buffer)
                         
-                        # Zu OpenCV-Format konvertieren
-                        frame = color_image.get_numpy_3D()
-                        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                        frame_norm = cv2.normalize(frame, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
-                        
-                        self.current_frame = frame_norm.copy()
-                        return self.current_frame
+                        if frame is not None:
+                            self.current_frame = frame
+                        return frame
                         
                     except Exception as ipl_error:
                         logging.warning(f"IPL Extension Konvertierung fehlgeschlagen: {ipl_error}, verwende Fallback")
@@ -348,7 +540,12 @@ class CameraManager:
                 try:
                     image = ids_peak.BufferTo_IplImage(buffer)
                     self.ids_datastream.QueueBuffer(buffer)
-                    frame = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+                    acquired = self.frame_pool.acquire(np.shape(image))
+                    if acquired is None:
+                        return None
+                    slot, frame = acquired
+                    cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=frame)
+                    frame = self.frame_pool.publish(slot)
                     self.current_frame = frame
                     return frame
                 except Exception as fallback_error:
@@ -367,6 +564,8 @@ class CameraManager:
     def stop(self):
         """Kamera/Video stoppen - VERBESSERT für IDS."""
         try:
+            self._stop_acquisition()
+            
             if self.source_type in ['webcam', 'video'] and self.camera:
                 self.camera.release()
                 self.camera = None
@@ -410,6 +609,8 @@ class CameraManager:
             self._cached_width = None
             self._cached_height = None
             self.payload_size = None
+            self._ids_converter = None
+            self.current_frame = None
             self.start_time = None
             
             logging.info("Kamera gestoppt")
@@ -0,0 +1,159 @@
+"""
+Zyklus-Auswertung - Klassenzuteilung einmal pro Einstellungsänderung in Regel-Arrays übersetzen
+Die Regeln liegen als dichte NumPy-Arrays nach class_id vor (Art, erwartete Anzahl, Mindest-Konfidenz, Mindestanzahl)
+Die Gut/Schlecht-Entscheidung ist ein vektorisierter Vergleich über die Klassen-Aggregate des Zyklus
+Neue Struktur (class_assignments) und alte Struktur (bad_part_classes) nutzen dieselben Arrays
+"""
+
+import logging
+
+import numpy as np
+
+RULE_IGNORE = 0
+RULE_GOOD = 1
+RULE_BAD = 2
+
+ASSIGNMENT_RULES = {'ignore': RULE_IGNORE, 'good': RULE_GOOD, 'bad': RULE_BAD}
+
+# Gründe für ein Schlecht-Ergebnis je Klasse
+REASON_NONE = 0
+REASON_BAD_CLASS = 1      # Schlecht-Klasse mit ausreichender Konfidenz (und Anzahl)
+REASON_COUNT_MISMATCH = 2  # Gut-Klasse mit abweichender Anzahl pro Bild
+
+
+class CycleEvaluation:
+    """Ergebnis einer Zyklus-Auswertung."""
+
+    __slots__ = ('bad_parts_detected', 'flagged', 'method')
+
+    def __init__(self, bad_parts_detected, flagged, method):
+        self.bad_parts_detected = bad_parts_detected
+        self.flagged = flagged    # Liste (Klassenname, Grund, Details-dict)
+        self.method = method      # 'class_assignments' oder 'legacy'
+
+
+class CycleEvaluator:
+    """Vorübersetzte Regeltabelle für die Auswertung eines Erkennungszyklus.
+
+    Klassen ohne Eintrag (oder mit class_id außerhalb der Tabelle) gelten als
+    'ignore'. Bei 'bad' muss die Klasse mindestens min_total Erkennungen im
+    Zyklus haben (neue Struktur: 1, alte Struktur: red_threshold), bei 'good'
+    mit erwarteter Anzahl wird die gerundete Anzahl pro Bild verglichen.
+    """
+
+    def __init__(self, class_assignments=None, bad_part_classes=None, red_threshold=1,
+                 bad_part_min_confidence=0.5):
+        self.method = 'class_assignments' if class_assignments else 'legacy'
+        if class_assignments:
+            self._compile_assignments(class_assignments)
+        else:
+            self._compile_legacy(bad_part_classes or [], red_threshold, bad_part_min_confidence)
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Regeltabelle aus Settings (oder dict) übersetzen."""
+        return cls(
+            class_assignments=settings.get('class_assignments', {}),
+            bad_part_classes=settings.get('bad_part_classes', []),
+            red_threshold=settings.get('red_threshold', 1),
+            bad_part_min_confidence=settings.get('bad_part_min_confidence', 0.5),
+        )
+
+    def _allocate(self, size):
+        self.rule = np.full(size, RULE_IGNORE, dtype=np.int8)
+        self.expected_count = np.full(size, -1, dtype=np.int64)
+        self.min_confidence = np.full(size, 0.5, dtype=np.float64)
+        self.min_total = np.ones(size, dtype=np.int64)
+
+    def _compile_assignments(self, class_assignments):
+        entries = []
+        for class_id, assignment in class_assignments.items():
+            try:
+                class_id = int(class_id)
+            except (TypeError, ValueError):
+                logging.warning(f"Ungültige Klassen-ID in class_assignments ignoriert: {class_id!r}")
+                continue
+            if class_id >= 0:
+                entries.append((class_id, assignment or {}))
+
+        self._allocate(max((class_id for class_id, _ in entries), default=-1) + 1)
+        for class_id, assignment in entries:
+            kind = assignment.get('assignment', 'ignore')
+            if kind not in ASSIGNMENT_RULES:
+                logging.warning(f"Unbekannte Zuteilung '{kind}' für Klasse {class_id} - wird ignoriert")
+            self.rule[class_id] = ASSIGNMENT_RULES.get(kind, RULE_IGNORE)
+            self.expected_count[class_id] = assignment.get('expected_count', -1)
+            self.min_confidence[class_id] = assignment.get('min_confidence', 0.5)
+
+    def _compile_legacy(self, bad_part_classes, red_threshold, bad_part_min_confidence):
+        class_ids = [int(class_id) for class_id in bad_part_classes if int(class_id) >= 0]
+        self._allocate(max(class_ids, default=-1) + 1)
+        self.rule[class_ids] = RULE_BAD
+        self.min_confidence[class_ids] = bad_part_min_confidence
+        self.min_total[class_ids] = red_threshold
+
+    def evaluate_arrays(self, class_ids, total_detections, max_confidences, image_count):
+        """Vektorisierte Auswertung über Klassen-Aggregate.
+
+        Args:
+            class_ids: Klassen-IDs (eine Zeile pro Klasse im Zyklus)
+            total_detections: Erkennungen pro Klasse im Zyklus
+            max_confidences: Höchste Konfidenz pro Klasse
+            image_count: Anzahl ausgewerteter Bilder im Zyklus (int) oder pro Zeile
+                (Array) - so lassen sich viele aufgezeichnete Zyklen in einem Aufruf auswerten
+
+        Returns:
+            numpy.ndarray: Grund pro Zeile (REASON_*), REASON_NONE = unauffällig
+        """
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        total_detections = np.asarray(total_detections, dtype=np.int64)
+        max_confidences = np.asarray(max_confidences, dtype=np.float64)
+
+        in_table = (class_ids >= 0) & (class_ids < len(self.rule))
+        index = np.where(in_table, class_ids, 0)
+        rule = np.where(in_table, self.rule[index] if len(self.rule) else RULE_IGNORE, RULE_IGNORE)
+        if not rule.any():
+            return np.zeros(len(class_ids), dtype=np.int8)
+
+        expected = self.expected_count[index]
+        confident = max_confidences >= self.min_confidence[index]
+        # Durchschnittliche Anzahl pro Bild, gerundet wie round() (wie in der Sidebar "ANZ")
+        image_count = np.asarray(image_count, dtype=np.int64)
+        avg_count = np.where(image_count > 0, np.rint(total_detections / np.maximum(image_count, 1)), 0)
+
+        bad = (rule == RULE_BAD) & confident & (total_detections >= self.min_total[index])
+        mismatch = (rule == RULE_GOOD) & (expected != -1) & confident & (avg_count != expected)
+        return np.where(bad, REASON_BAD_CLASS, np.where(mismatch, REASON_COUNT_MISMATCH, REASON_NONE)).astype(np.int8)
+
+    def evaluate(self, cycle_statistics, image_count):
+        """Zyklus-Statistik (Klassenname -> Statistik mit class_id, total_detections, max_confidence) auswerten.
+
+        Ein CycleStatistics liefert seine Klassen-Aggregate direkt als Arrays
+        (aggregates()), andere Mappings (z.B. aus dem Zyklus-Log) werden umgewandelt.
+
+        Returns:
+            CycleEvaluation
+        """
+        if hasattr(cycle_statistics, 'aggregates'):
+            names, class_ids, totals, maxima = cycle_statistics.aggregates()
+        else:
+            names = list(cycle_statistics)
+            stats = [cycle_statistics[name] for name in names]
+            class_ids = [int(stat.get('class_id', 0)) for stat in stats]
+            totals = [stat.get('total_detections', 0) for stat in stats]
+            maxima = [stat.get('max_confidence', 0.0) for stat in stats]
+
+        reasons = self.evaluate_arrays(class_ids, totals, maxima, image_count)
+        flagged = [(names[row], int(reasons[row]),
+                    self._details(int(class_ids[row]), int(totals[row]), float(maxima[row]),
+                                  image_count, reasons[row]))
+                   for row in np.flatnonzero(reasons).tolist()]
+        return CycleEvaluation(bool(flagged), flagged, self.method)
+
+    def _details(self, class_id, total, max_confidence, image_count, reason):
+        """Details einer auffälligen Klasse (für Log-Meldungen)."""
+        details = {'class_id': class_id, 'max_confidence': max_confidence, 'total_detections': total}
+        if reason == REASON_COUNT_MISMATCH:
+            details['expected_count'] = int(self.expected_count[class_id])
+            details['avg_count'] = round(total / image_count) if image_count > 0 else 0
+        return details
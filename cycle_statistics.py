@@ -0,0 +1,183 @@
+"""
+Zyklus-Statistik - laufende Konfidenz-Statistik pro Klasse mit festem Speicherbedarf
+Pro Klasse: Anzahl, Summe, Min/Max, Mittelwert und Varianz (Welford) sowie ein Konfidenz-Histogramm für Quantile
+Einzelne Konfidenzen werden nicht gespeichert; ein Frame wird vektorisiert als Block übernommen
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+CONFIDENCE_BINS = 20   # Histogramm über [0, 1] - Quantile auf 1/CONFIDENCE_BINS genau (linear interpoliert)
+
+
+class ClassStatistics(Mapping):
+    """Laufende Statistik einer Klasse.
+
+    Verhält sich lesend wie das bisherige Statistik-Dict (stats.get('max_confidence'),
+    stats['count'], ...), damit Auswertung, UI und Bild-Speicher unverändert bleiben.
+    to_dict() liefert eine JSON-fähige Kopie für das Logging.
+    """
+
+    __slots__ = ('class_id', 'count', 'confidence_sum', 'min_confidence', 'max_confidence',
+                 '_mean', '_m2', 'histogram')
+
+    _KEYS = ('class_id', 'count', 'total_detections', 'min_confidence', 'max_confidence',
+             'avg_confidence', 'confidence_sum', 'std_confidence',
+             'p10_confidence', 'median_confidence', 'p90_confidence')
+
+    def __init__(self, class_id, bins=CONFIDENCE_BINS):
+        self.class_id = int(class_id)
+        self.count = 0
+        self.confidence_sum = 0.0
+        self.min_confidence = 1.0
+        self.max_confidence = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.histogram = np.zeros(bins, dtype=np.int64)
+
+    # --- Mapping-Schnittstelle (Kompatibilität zum Statistik-Dict) ---
+
+    def __getitem__(self, key):
+        if key == 'total_detections':
+            return self.count
+        if key == 'avg_confidence':
+            return self.avg_confidence
+        if key == 'std_confidence':
+            return self.std_confidence
+        if key == 'p10_confidence':
+            return self.quantile(0.1)
+        if key == 'median_confidence':
+            return self.quantile(0.5)
+        if key == 'p90_confidence':
+            return self.quantile(0.9)
+        if key in ('class_id', 'count', 'min_confidence', 'max_confidence', 'confidence_sum'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    # --- Aktualisierung ---
+
+    def add_batch(self, count, confidence_sum, m2, min_confidence, max_confidence, histogram):
+        """Block von Erkennungen übernehmen (parallele Welford-Zusammenführung nach Chan).
+
+        Args:
+            count (int): Anzahl im Block
+            confidence_sum (float): Summe der Konfidenzen im Block
+            m2 (float): Summe der quadrierten Abweichungen vom Block-Mittelwert
+            min_confidence, max_confidence (float): Extremwerte im Block
+            histogram: Histogramm des Blocks (gleiche Bins)
+        """
+        if count <= 0:
+            return
+        batch_mean = confidence_sum / count
+        total = self.count + count
+        delta = batch_mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.confidence_sum += confidence_sum
+        self.min_confidence = min(self.min_confidence, min_confidence)
+        self.max_confidence = max(self.max_confidence, max_confidence)
+        self.histogram += histogram
+
+    # --- Kennzahlen ---
+
+    @property
+    def avg_confidence(self):
+        return self._mean if self.count else 0.0
+
+    @property
+    def std_confidence(self):
+        """Standardabweichung der Konfidenzen (Grundgesamtheit)."""
+        return float(np.sqrt(max(self._m2, 0.0) / self.count)) if self.count else 0.0
+
+    def quantile(self, q):
+        """Quantil der Konfidenz aus dem Histogramm (linear im Bin interpoliert, auf [min, max] begrenzt)."""
+        if self.count == 0:
+            return 0.0
+        bins = len(self.histogram)
+        cumulative = np.cumsum(self.histogram)
+        target = q * self.count
+        index = min(int(np.searchsorted(cumulative, target, side='left')), bins - 1)
+        before = cumulative[index - 1] if index > 0 else 0
+        in_bin = self.histogram[index]
+        fraction = (target - before) / in_bin if in_bin else 0.0
+        value = (index + fraction) / bins
+        return float(min(max(value, self.min_confidence), self.max_confidence))
+
+    def to_dict(self):
+        """JSON-fähige Zusammenfassung (Logging, Ereignis-Details)."""
+        summary = {key: self[key] for key in self._KEYS}
+        summary['confidence_histogram'] = self.histogram.tolist()
+        return summary
+
+
+class CycleStatistics(dict):
+    """Statistik des laufenden Zyklus: Klassenname -> ClassStatistics.
+
+    Ein leeres CycleStatistics ersetzt das bisherige leere Dict beim Zyklus-Start.
+    """
+
+    def __init__(self, bins=CONFIDENCE_BINS):
+        super().__init__()
+        self.bins = bins
+
+    def add_detections(self, class_ids, confidences, class_names=None):
+        """Erkennungen eines Frames übernehmen - eine Rechnung pro Klasse, nicht pro Box.
+
+        Args:
+            class_ids: Array der Klassen-IDs (z.B. detections['class_id'])
+            confidences: Array der Konfidenzen (gleiche Länge)
+            class_names (dict): Klassen-ID -> Name; fehlende als "Class <id>"
+        """
+        if len(class_ids) == 0:
+            return
+        class_names = class_names or {}
+        confidences = np.asarray(confidences, dtype=np.float64)
+        unique_ids, inverse = np.unique(class_ids, return_inverse=True)
+        classes = len(unique_ids)
+
+        counts = np.bincount(inverse, minlength=classes)
+        sums = np.bincount(inverse, weights=confidences, minlength=classes)
+        means = sums / counts
+        deviations = confidences - means[inverse]
+        m2s = np.bincount(inverse, weights=deviations * deviations, minlength=classes)
+        minima = np.full(classes, np.inf)
+        np.minimum.at(minima, inverse, confidences)
+        maxima = np.full(classes, -np.inf)
+        np.maximum.at(maxima, inverse, confidences)
+
+        bin_index = np.clip((confidences * self.bins).astype(np.int64), 0, self.bins - 1)
+        histograms = np.bincount(inverse * self.bins + bin_index,
+                                 minlength=classes * self.bins).reshape(classes, self.bins)
+
+        for row, class_id in enumerate(unique_ids.tolist()):
+            class_name = class_names.get(class_id, f"Class {class_id}")
+            stats = self.get(class_name)
+            if stats is None:
+                stats = self[class_name] = ClassStatistics(class_id, self.bins)
+            stats.add_batch(int(counts[row]), float(sums[row]), float(m2s[row]),
+                            float(minima[row]), float(maxima[row]), histograms[row])
+
+    def aggregates(self):
+        """Klassen-Aggregate als Arrays für CycleEvaluator.evaluate_arrays().
+
+        Returns:
+            tuple: (Klassennamen, class_ids, total_detections, max_confidences)
+        """
+        names = list(self)
+        classes = [self[name] for name in names]
+        class_ids = np.fromiter((stats.class_id for stats in classes), dtype=np.int64, count=len(classes))
+        totals = np.fromiter((stats.count for stats in classes), dtype=np.int64, count=len(classes))
+        maxima = np.fromiter((stats.max_confidence for stats in classes), dtype=np.float64, count=len(classes))
+        return names, class_ids, totals, maxima
+
+    def to_dict(self):
+        """JSON-fähige Kopie aller Klassen (Logging)."""
+        return {class_name: stats.to_dict() for class_name, stats in self.items()}
@@ -184,12 +184,14 @@ class DetectionDatasetManager:
             
             # Datensatz erstellen/aktualisieren
             if file_path.exists():
-                # Bestehenden Datensatz laden für created-Datum
+                # Bestehenden Datensatz laden für created-Datum und Modell-Varianten
                 with open(file_path, 'r', encoding='utf-8') as f:
                     existing = json.load(f)
                 created_date = existing.get('dataset_info', {}).get('created', datetime.now().isoformat())
+                existing_detection = existing.get('detection_settings', {})
             else:
                 created_date = datetime.now().isoformat()
+                existing_detection = {}
             
             dataset = {
                 'dataset_info': {
@@ -207,6 +209,12 @@ class DetectionDatasetManager:
                 'application_settings': current_settings.copy()
             }
             
+            # Modell-Varianten (z.B. INT8) bleiben erhalten, solange das Quellmodell gleich ist
+            if existing_detection.get('model_path') == model_path:
+                for key in ('model_variants', 'active_variant'):
+                    if key in existing_detection:
+                        dataset['detection_settings'][key] = existing_detection[key]
+            
             # Datensatz speichern
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(dataset, f, indent=2, ensure_ascii=False)
@@ -361,6 +369,94 @@ class DetectionDatasetManager:
             logging.error(f"Fehler beim Importieren des Datensatzes: {e}")
             return False
     
+    def add_model_variant(self, dataset_name, variant_name, variant):
+        """Modell-Variante (z.B. quantisiertes INT8-Modell) im Datensatz speichern.
+        
+        Die Variante wird nur gespeichert, nicht aktiviert (siehe set_active_variant).
+        
+        Args:
+            dataset_name (str): Name des Datensatzes
+            variant_name (str): Name der Variante, z.B. 'int8'
+            variant (dict): {'path', 'backend', 'precision', 'report', ...}
+            
+        Returns:
+            bool: True wenn erfolgreich gespeichert
+        """
+        def update(detection_settings):
+            detection_settings.setdefault('model_variants', {})[variant_name] = variant
+        
+        if self._update_detection_settings(dataset_name, update):
+            logging.info(f"Modell-Variante '{variant_name}' in Datensatz '{dataset_name}' gespeichert")
+            return True
+        return False
+    
+    def set_active_variant(self, dataset_name, variant_name):
+        """Modell-Variante aktivieren (None = Originalmodell).
+        
+        Returns:
+            bool: True wenn erfolgreich
+        """
+        def update(detection_settings):
+            if variant_name is not None and variant_name not in detection_settings.get('model_variants', {}):
+                raise KeyError(f"Modell-Variante '{variant_name}' nicht vorhanden")
+            detection_settings['active_variant'] = variant_name
+        
+        if self._update_detection_settings(dataset_name, update):
+            logging.info(f"Datensatz '{dataset_name}': aktive Modell-Variante {variant_name or 'Original'}")
+            return True
+        return False
+    
+    def get_active_model(self, dataset):
+        """Zu ladendes Modell eines Datensatzes unter Berücksichtigung der aktiven Variante.
+        
+        Args:
+            dataset (dict): Geladener Datensatz
+            
+        Returns:
+            tuple: (modellpfad, backend oder None für das eingestellte Backend,
+                Name der Variante oder None für das Originalmodell)
+        """
+        detection_settings = dataset.get('detection_settings', {})
+        variant_name = detection_settings.get('active_variant')
+        variant = detection_settings.get('model_variants', {}).get(variant_name) if variant_name else None
+        
+        if variant and os.path.exists(variant.get('path', '')):
+            return variant['path'], variant.get('backend'), variant_name
+        if variant_name:
+            logging.warning(f"Modell-Variante '{variant_name}' nicht gefunden - verwende Originalmodell")
+        return detection_settings.get('model_path', ''), None, None
+    
+    def _update_detection_settings(self, dataset_name_or_file, update_fn):
+        """detection_settings eines Datensatzes ändern und speichern (mit Backup)."""
+        try:
+            if dataset_name_or_file.endswith('.json'):
+                file_path = self.datasets_directory / dataset_name_or_file
+            else:
+                safe_name = self._make_safe_filename(dataset_name_or_file)
+                file_path = self.datasets_directory / f"{safe_name}.json"
+            
+            if not file_path.exists():
+                logging.error(f"Datensatz-Datei nicht gefunden: {file_path}")
+                return False
+            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                dataset = json.load(f)
+            
+            self._create_backup(file_path)
+            update_fn(dataset.setdefault('detection_settings', {}))
+            dataset.setdefault('dataset_info', {})['modified'] = datetime.now().isoformat()
+            
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(dataset, f, indent=2, ensure_ascii=False)
+            
+            if self.current_dataset_name == dataset.get('dataset_info', {}).get('name'):
+                self.current_dataset = dataset
+            return True
+            
+        except Exception as e:
+            logging.error(f"Fehler beim Ändern des Datensatzes '{dataset_name_or_file}': {e}")
+            return False
+    
     def get_current_dataset_info(self):
         """Informationen über den aktuell geladenen Datensatz.
         
@@ -2,12 +2,18 @@
 KI-Erkennungsmodul - einfach und robust
 Verwaltet das YOLO-Modell und die Objekterkennung mit erweiterten Statistiken und Farbunterstuetzung
 ERWEITERT: Verwendung von benutzerdefinierten Farben fuer Bounding Boxes
+ERWEITERT: Austauschbare Backends (PyTorch, ONNX Runtime, OpenVINO) fuer CPU-Stationen
 """
 
 import cv2
+import json
+import time
 import torch
+import hashlib
 import numpy as np
 import logging
+import threading
+from abc import ABC, abstractmethod
 from pathlib import Path
 
 try:
@@ -17,12 +23,539 @@ except ImportError:
     YOLO_AVAILABLE = False
     logging.warning("ultralytics nicht verfuegbar - KI-Erkennung deaktiviert")
 
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    import openvino as ov
+    OPENVINO_AVAILABLE = True
+except ImportError:
+    OPENVINO_AVAILABLE = False
+
+# Verfuegbare Backends (Einstellung 'inference_backend')
+INFERENCE_BACKENDS = ('pytorch', 'onnxruntime', 'openvino')
+
+# Standard-Eingabegroesse fuer den ONNX-Export, falls das Modell keine Trainingsgroesse kennt
+DEFAULT_EXPORT_IMGSZ = 640
+
+# Intra-Op-Threads fuer ONNX Runtime / OpenVINO (0 = Standard), gesetzt vom ResourceManager
+_INFERENCE_THREADS = 0
+
+# Erkennungen eines Frames als strukturiertes Array (eine Zeile pro Box)
+DETECTION_DTYPE = np.dtype([
+    ('x1', np.int32), ('y1', np.int32), ('x2', np.int32), ('y2', np.int32),
+    ('confidence', np.float32), ('class_id', np.int32),
+])
+
+
+def empty_detections():
+    """Leeres Erkennungs-Array."""
+    return np.empty(0, dtype=DETECTION_DTYPE)
+
+
+def as_detection_array(detections):
+    """Erkennungen als DETECTION_DTYPE-Array (akzeptiert auch Listen von 6-Tupeln)."""
+    if detections is None:
+        return empty_detections()
+    if isinstance(detections, np.ndarray) and detections.dtype == DETECTION_DTYPE:
+        return detections
+    return np.array([tuple(d) for d in detections], dtype=DETECTION_DTYPE)
+
+
+def group_detections_by_class(detections):
+    """Vektorisierte Gruppierung nach Klasse.
+
+    Args:
+        detections: DETECTION_DTYPE-Array
+
+    Returns:
+        tuple: (class_ids, counts, confidence_sums, min_confidences, max_confidences) als Arrays,
+            eine Zeile pro vorkommender Klasse
+    """
+    detections = as_detection_array(detections)
+    if len(detections) == 0:
+        empty_float = np.empty(0, dtype=np.float64)
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64), empty_float, empty_float, empty_float
+
+    confidences = detections['confidence'].astype(np.float64)
+    class_ids, inverse = np.unique(detections['class_id'], return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(class_ids))
+    sums = np.bincount(inverse, weights=confidences, minlength=len(class_ids))
+
+    maxima = np.full(len(class_ids), -np.inf)
+    np.maximum.at(maxima, inverse, confidences)
+    minima = np.full(len(class_ids), np.inf)
+    np.minimum.at(minima, inverse, confidences)
+
+    return class_ids, counts, sums, minima, maxima
+
+
+def set_inference_threads(threads):
+    """Thread-Anzahl fuer Inferenz-Backends setzen (wirkt beim naechsten Laden des Modells).
+
+    Args:
+        threads (int): Intra-Op-Threads, 0 = Standard des Backends
+    """
+    global _INFERENCE_THREADS
+    _INFERENCE_THREADS = max(0, int(threads or 0))
+
+
+def _file_hash(path, chunk_size=1 << 20):
+    """Kurzer SHA-256-Hash einer Datei (Cache-Schluessel fuer exportierte Modelle)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def export_onnx_cached(model_path, imgsz=None):
+    """PyTorch-Modell einmalig nach ONNX exportieren und neben dem Modell zwischenspeichern.
+
+    Die Datei heisst <modell>.<hash>.onnx; der Hash der .pt-Datei stellt sicher, dass ein
+    neu trainiertes Modell gleichen Namens neu exportiert wird. Klassennamen und
+    Eingabegroesse liegen in <modell>.<hash>.json daneben.
+
+    Args:
+        model_path (str): Pfad zur .pt Modelldatei
+        imgsz (int): Eingabegroesse (None = Trainingsgroesse des Modells)
+
+    Returns:
+        tuple: (onnx_path, metadata) oder (None, None) bei Fehler
+    """
+    model_path = Path(model_path)
+    source_hash = _file_hash(model_path)
+    suffix = f".{source_hash}" if not imgsz else f".{source_hash}.{int(imgsz)}"
+    onnx_path = model_path.with_name(f"{model_path.stem}{suffix}.onnx")
+    meta_path = onnx_path.with_suffix('.json')
+
+    if onnx_path.exists() and meta_path.exists():
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            logging.info(f"ONNX-Export aus Cache: {onnx_path.name}")
+            return onnx_path, metadata
+        except Exception as e:
+            logging.warning(f"ONNX-Metadaten unlesbar, exportiere neu: {e}")
+
+    if not YOLO_AVAILABLE:
+        logging.error("ONNX-Export benoetigt ultralytics")
+        return None, None
+
+    try:
+        start = time.perf_counter()
+        model = YOLO(str(model_path))
+        export_imgsz = int(imgsz or model.overrides.get('imgsz') or DEFAULT_EXPORT_IMGSZ)
+        exported = Path(model.export(format='onnx', imgsz=export_imgsz, dynamic=True, verbose=False))
+        exported.replace(onnx_path)
+
+        metadata = {
+            'source': model_path.name,
+            'source_hash': source_hash,
+            'imgsz': export_imgsz,
+            'class_names': {str(class_id): name for class_id, name in model.names.items()},
+        }
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+        logging.info(f"ONNX-Export erstellt: {onnx_path.name} ({time.perf_counter() - start:.1f}s)")
+        return onnx_path, metadata
+
+    except Exception as e:
+        logging.error(f"Fehler beim ONNX-Export: {e}")
+        return None, None
+
+
+def fused_model_cached(model_path):
+    """Conv+BN-fusioniertes PyTorch-Modell einmalig erzeugen und neben dem Modell speichern.
+
+    ultralytics fusioniert beim ersten predict()-Aufruf; mit dem Cache
+    <modell>.<hash>.fused.pt entfaellt dieser Schritt bei jedem Neustart
+    (BaseModel.fuse() erkennt das bereits fusionierte Modell und ueberspringt ihn).
+
+    Returns:
+        Path: Pfad des fusionierten Modells oder None (dann Originalmodell verwenden)
+    """
+    model_path = Path(model_path)
+    try:
+        cache_path = model_path.with_name(f"{model_path.stem}.{_file_hash(model_path)}.fused.pt")
+        if cache_path.exists():
+            logging.info(f"Fusioniertes Modell aus Cache: {cache_path.name}")
+            return cache_path
+
+        start = time.perf_counter()
+        checkpoint = torch.load(str(model_path), map_location='cpu', weights_only=False)
+        model = (checkpoint.get('ema') or checkpoint['model']).float().eval()
+        model.fuse(verbose=False)
+
+        fused_checkpoint = {key: value for key, value in checkpoint.items()
+                            if key not in ('ema', 'optimizer', 'updates')}
+        fused_checkpoint['model'] = model
+
+        temp_path = cache_path.with_suffix('.tmp')
+        torch.save(fused_checkpoint, str(temp_path))
+        temp_path.replace(cache_path)
+        logging.info(f"Fusioniertes Modell gespeichert: {cache_path.name} ({time.perf_counter() - start:.1f}s)")
+        return cache_path
+
+    except Exception as e:
+        logging.warning(f"Fusions-Cache nicht moeglich, verwende Originalmodell: {e}")
+        return None
+
+
+def letterbox(frame, size, pad_value=114):
+    """Frame seitenverhaeltnistreu auf size x size skalieren und auffuellen (wie ultralytics).
+
+    Returns:
+        tuple: (bild, skalierung, (pad_x, pad_y))
+    """
+    height, width = frame.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = int(round(width * ratio)), int(round(height * ratio))
+    if (new_width, new_height) != (width, height):
+        frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (size - new_width) / 2
+    pad_y = (size - new_height) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    frame = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT,
+                               value=(pad_value, pad_value, pad_value))
+    return frame, ratio, (left, top)
+
+
+def decode_yolo_output(output, ratio, pad, frame_shape, conf, iou, classes=None, max_det=300):
+    """Rohausgabe eines YOLOv8-Kopfes (4 + Klassen, Kandidaten) in Erkennungen umwandeln.
+
+    Schwellwert und Klassenfilter werden vor dem NMS angewendet, das NMS laeuft
+    klassenweise ueber cv2.dnn.NMSBoxesBatched.
+
+    Args:
+        output: Array (4 + anzahl_klassen, kandidaten) fuer ein Bild
+        ratio, pad: Rueckgabe von letterbox()
+        frame_shape: Form des Originalframes
+        conf, iou, classes, max_det: wie beim ultralytics-Aufruf
+
+    Returns:
+        numpy.ndarray: DETECTION_DTYPE-Array in Originalkoordinaten
+    """
+    predictions = output.T
+    scores_all = predictions[:, 4:]
+    class_ids = scores_all.argmax(axis=1)
+    scores = scores_all[np.arange(len(class_ids)), class_ids]
+
+    mask = scores >= conf
+    if classes is not None:
+        mask &= np.isin(class_ids, classes)
+    if not mask.any():
+        return empty_detections()
+
+    boxes = predictions[mask, :4]
+    scores = scores[mask]
+    class_ids = class_ids[mask]
+
+    # cx, cy, w, h -> x, y, w, h (Letterbox-Koordinaten)
+    boxes_xywh = boxes.copy()
+    boxes_xywh[:, 0] -= boxes[:, 2] / 2
+    boxes_xywh[:, 1] -= boxes[:, 3] / 2
+
+    keep = cv2.dnn.NMSBoxesBatched(boxes_xywh.tolist(), scores.tolist(), class_ids.tolist(),
+                                   float(conf), float(iou))
+    keep = np.asarray(keep, dtype=np.int64).reshape(-1)
+    if len(keep) == 0:
+        return empty_detections()
+    keep = keep[np.argsort(-scores[keep], kind='stable')][:max_det]
+
+    boxes_xywh = boxes_xywh[keep]
+    height, width = frame_shape[:2]
+    x1 = np.clip((boxes_xywh[:, 0] - pad[0]) / ratio, 0, width)
+    y1 = np.clip((boxes_xywh[:, 1] - pad[1]) / ratio, 0, height)
+    x2 = np.clip((boxes_xywh[:, 0] + boxes_xywh[:, 2] - pad[0]) / ratio, 0, width)
+    y2 = np.clip((boxes_xywh[:, 1] + boxes_xywh[:, 3] - pad[1]) / ratio, 0, height)
+
+    detections = np.empty(len(keep), dtype=DETECTION_DTYPE)
+    detections['x1'] = x1
+    detections['y1'] = y1
+    detections['x2'] = x2
+    detections['y2'] = y2
+    detections['confidence'] = scores[keep]
+    detections['class_id'] = class_ids[keep]
+    return detections
+
+
+class InferenceBackend(ABC):
+    """Schnittstelle eines KI-Backends.
+
+    predict() erhaelt eine Liste von BGR-Frames und die Parameter des Modellaufrufs
+    (conf, iou, classes, max_det, imgsz) und liefert pro Frame ein DETECTION_DTYPE-Array.
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self.class_names = {}
+
+    @abstractmethod
+    def predict(self, frames, params):
+        """Erkennungen pro Frame liefern (Liste von DETECTION_DTYPE-Arrays)."""
+
+
+class UltralyticsBackend(InferenceBackend):
+    """PyTorch-Backend ueber ultralytics.YOLO (Referenz, GPU-faehig)."""
+
+    name = 'pytorch'
+
+    def __init__(self, model_path):
+        super().__init__()
+        self.model = YOLO(model_path)
+        if hasattr(self.model, 'names'):
+            self.class_names = self.model.names
+        else:
+            # Fallback fuer aeltere Versionen
+            self.class_names = {i: f"class_{i}" for i in range(80)}
+
+    def predict(self, frames, params):
+        results = self.model(list(frames), verbose=False, **params)
+        return [self._extract_detections(result, params.get('conf', 0.0)) for result in results]
+
+    @staticmethod
+    def _extract_detections(result, confidence_threshold):
+        """Erkennungen eines einzelnen Ergebnis-Objekts extrahieren (Schwellwert als Maske)."""
+        boxes = getattr(result, 'boxes', None)
+        if boxes is None or len(boxes) == 0:
+            return empty_detections()
+
+        confidences = boxes.conf.cpu().numpy()
+        mask = confidences >= confidence_threshold
+
+        detections = np.empty(int(mask.sum()), dtype=DETECTION_DTYPE)
+        if len(detections) == 0:
+            return detections
+
+        coords = boxes.xyxy.cpu().numpy()[mask]
+        detections['x1'] = coords[:, 0]
+        detections['y1'] = coords[:, 1]
+        detections['x2'] = coords[:, 2]
+        detections['y2'] = coords[:, 3]
+        detections['confidence'] = confidences[mask]
+        detections['class_id'] = boxes.cls.cpu().numpy()[mask]
+        return detections
+
+
+class ExportedModelBackend(InferenceBackend):
+    """Gemeinsame Vor- und Nachverarbeitung fuer exportierte ONNX-Modelle.
+
+    Die Eingabegroesse ist durch den Export festgelegt; ein abweichendes imgsz
+    in den Parametern erfordert einen neuen Export (siehe export_onnx_cached).
+    """
+
+    def __init__(self, metadata):
+        super().__init__()
+        self.imgsz = int(metadata.get('imgsz', DEFAULT_EXPORT_IMGSZ))
+        self.class_names = {int(class_id): name for class_id, name in metadata.get('class_names', {}).items()}
+        self.dynamic_batch = True
+
+    @abstractmethod
+    def _run(self, blob):
+        """Modell auf einem NCHW-Blob ausfuehren - liefert (N, 4 + Klassen, Kandidaten)."""
+
+    def predict(self, frames, params):
+        letterboxed = [letterbox(frame, self.imgsz) for frame in frames]
+        blob = cv2.dnn.blobFromImages([image for image, _, _ in letterboxed], scalefactor=1 / 255.0,
+                                      swapRB=True, crop=False)
+        if self.dynamic_batch or len(frames) == 1:
+            outputs = self._run(blob)
+        else:
+            outputs = np.concatenate([self._run(blob[i:i + 1]) for i in range(len(frames))])
+
+        conf = params.get('conf', 0.25)
+        iou = params.get('iou', 0.7)
+        classes = params.get('classes')
+        max_det = params.get('max_det', 300)
+        return [
+            decode_yolo_output(output, ratio, pad, frame.shape, conf, iou, classes, max_det)
+            for output, frame, (_, ratio, pad) in zip(outputs, frames, letterboxed)
+        ]
+
+
+class OnnxRuntimeBackend(ExportedModelBackend):
+    """CPU-Backend ueber ONNX Runtime."""
+
+    name = 'onnxruntime'
+
+    def __init__(self, onnx_path, metadata, providers=None):
+        super().__init__(metadata)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if _INFERENCE_THREADS > 0:
+            options.intra_op_num_threads = _INFERENCE_THREADS
+        self.session = ort.InferenceSession(str(onnx_path), sess_options=options,
+                                            providers=providers or ['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+
+    def _run(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVinoBackend(ExportedModelBackend):
+    """CPU-Backend ueber OpenVINO (liest das exportierte ONNX-Modell direkt)."""
+
+    name = 'openvino'
+
+    def __init__(self, onnx_path, metadata, device='CPU'):
+        super().__init__(metadata)
+        core = ov.Core()
+        # Kompiliertes Modell zwischenspeichern - Neustarts ueberspringen die Kompilierung
+        core.set_property({'CACHE_DIR': str(Path(onnx_path).parent / 'openvino_cache')})
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if _INFERENCE_THREADS > 0:
+            config['INFERENCE_NUM_THREADS'] = _INFERENCE_THREADS
+        self.compiled_model = core.compile_model(str(onnx_path), device, config)
+        self.output = self.compiled_model.output(0)
+        self.dynamic_batch = self.compiled_model.input(0).get_partial_shape()[0].is_dynamic
+
+    def _run(self, blob):
+        return self.compiled_model(blob)[self.output]
+
+
+def load_onnx_metadata(onnx_path):
+    """Metadaten (Klassennamen, imgsz) eines exportierten Modells aus der .json daneben lesen."""
+    meta_path = Path(onnx_path).with_suffix('.json')
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logging.error(f"Metadaten zu {Path(onnx_path).name} nicht lesbar: {e}")
+        return None
+
+
+def create_exported_backend(onnx_path, backend='onnxruntime'):
+    """Backend fuer ein bereits exportiertes ONNX-Modell (z.B. INT8-Variante) erstellen.
+
+    Returns:
+        InferenceBackend oder None
+    """
+    metadata = load_onnx_metadata(onnx_path)
+    if metadata is None:
+        return None
+
+    if backend == 'openvino' and OPENVINO_AVAILABLE:
+        return OpenVinoBackend(onnx_path, metadata)
+    if ONNXRUNTIME_AVAILABLE:
+        return OnnxRuntimeBackend(onnx_path, metadata)
+    if OPENVINO_AVAILABLE:
+        return OpenVinoBackend(onnx_path, metadata)
+
+    logging.error("Fuer .onnx-Modelle wird onnxruntime oder openvino benoetigt")
+    return None
+
+
+def create_backend(model_path, backend='pytorch', imgsz=None):
+    """Backend fuer ein .pt-Modell erstellen, bei Bedarf ueber den ONNX-Cache.
+
+    .onnx-Dateien (z.B. quantisierte Varianten) werden direkt geladen.
+    Ist das gewuenschte Backend nicht installiert oder schlaegt der Export fehl,
+    wird auf PyTorch zurueckgefallen.
+
+    Returns:
+        InferenceBackend oder None
+    """
+    if Path(model_path).suffix.lower() == '.onnx':
+        return create_exported_backend(model_path, backend)
+
+    if backend == 'onnxruntime' and not ONNXRUNTIME_AVAILABLE:
+        logging.warning("onnxruntime nicht verfuegbar - verwende PyTorch-Backend")
+        backend = 'pytorch'
+    elif backend == 'openvino' and not OPENVINO_AVAILABLE:
+        logging.warning("openvino nicht verfuegbar - verwende PyTorch-Backend")
+        backend = 'pytorch'
+
+    if backend in ('onnxruntime', 'openvino'):
+        onnx_path, metadata = export_onnx_cached(model_path, imgsz)
+        if onnx_path is not None:
+            try:
+                if backend == 'onnxruntime':
+                    return OnnxRuntimeBackend(onnx_path, metadata)
+                return OpenVinoBackend(onnx_path, metadata)
+            except Exception as e:
+                logging.error(f"Backend '{backend}' konnte nicht geladen werden: {e}")
+        logging.warning("Verwende PyTorch-Backend")
+
+    if not YOLO_AVAILABLE:
+        logging.error("ultralytics nicht verfuegbar")
+        return None
+    return UltralyticsBackend(str(fused_model_cached(model_path) or model_path))
+
+
+class AdaptiveBatchSizer:
+    """Wählt die Batch-Größe für die KI-Erkennung anhand der gemessenen Latenz.
+
+    Die Latenz pro Bild wird als gleitender Mittelwert über alle Batches geschätzt.
+    Da größere Batches pro Bild günstiger sind, ist die Schätzung aus kleineren
+    Batches konservativ. Die Batch-Größe wächst höchstens um Faktor 2 pro Schritt,
+    damit jede Vergrößerung erst gemessen wird.
+    """
+
+    def __init__(self, max_batch_size=8, budget_fraction=0.5, smoothing=0.3):
+        """
+        Args:
+            max_batch_size (int): Obergrenze der Batch-Größe (1 = kein Batching)
+            budget_fraction (float): Anteil der verbleibenden Erkennungszeit, den ein Batch belegen darf
+            smoothing (float): Gewicht neuer Messungen im gleitenden Mittelwert
+        """
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.budget_fraction = budget_fraction
+        self.smoothing = smoothing
+        self.per_image_latency = None   # Sekunden pro Bild (gleitender Mittelwert)
+        self.last_batch_size = 1
+        self._lock = threading.Lock()
+
+    def record(self, batch_size, duration):
+        """Gemessene Dauer eines Batches erfassen."""
+        if batch_size <= 0:
+            return
+        per_image = duration / batch_size
+        with self._lock:
+            if self.per_image_latency is None:
+                self.per_image_latency = per_image
+            else:
+                self.per_image_latency += self.smoothing * (per_image - self.per_image_latency)
+
+    def suggest(self, remaining_time):
+        """Batch-Größe, die innerhalb der verbleibenden Erkennungszeit fertig wird.
+
+        Args:
+            remaining_time (float): Verbleibende Zeit der Erkennungsphase in Sekunden
+
+        Returns:
+            int: Batch-Größe zwischen 1 und max_batch_size
+        """
+        with self._lock:
+            per_image = self.per_image_latency
+
+        if per_image is None or per_image <= 0:
+            size = 1
+        else:
+            budget = max(0.0, remaining_time) * self.budget_fraction
+            size = int(budget / per_image)
+
+        size = max(1, min(size, self.max_batch_size, self.last_batch_size * 2))
+        self.last_batch_size = size
+        return size
+
+
 class DetectionEngine:
     """Einfache KI-Erkennungsengine mit erweiterten Statistiken und benutzerdefinierten Farben."""
     
     def __init__(self):
-        self.model = None
+        self.backend = None
         self.model_loaded = False
+        self.load_timings = {}
         self.class_names = {}
         self.confidence_threshold = 0.5
         
@@ -40,37 +573,63 @@ class DetectionEngine:
         
         # Benutzerdefinierte Farben (werden aus Settings geladen)
         self.custom_colors = {}
+        
+        # Adaptive Batch-Größe für detect_batch()
+        self.batch_sizer = AdaptiveBatchSizer()
+        
+        # Parameter fuer den Modellaufruf (conf, iou, classes, max_det, imgsz) - wirken bereits im NMS
+        self.inference_params = {'conf': self.confidence_threshold}
     
-    def load_model(self, model_path):
-        """YOLO-Modell laden.
+    def load_model(self, model_path, backend='pytorch', imgsz=None,
+                   warmup_runs=0, warmup_shape=None, progress_fn=None):
+        """YOLO-Modell laden und optional aufwaermen.
+        
+        Das neue Modell wird erst nach dem Aufwaermen aktiv, ein laufendes Modell
+        bleibt bis dahin in Betrieb. Kann in einem Hintergrund-Thread laufen.
         
         Args:
-            model_path (str): Pfad zur .pt Modelldatei
+            model_path (str): Pfad zur .pt Modelldatei (oder exportierte/quantisierte .onnx mit .json)
+            backend (str): 'pytorch', 'onnxruntime' oder 'openvino' (ONNX-Export wird zwischengespeichert)
+            imgsz (int): Eingabegroesse fuer den ONNX-Export (None = Trainingsgroesse)
+            warmup_runs (int): Anzahl Dummy-Inferenzen nach dem Laden
+            warmup_shape (tuple): (hoehe, breite) der Dummy-Frames, z.B. Kamera-Aufloesung
+            progress_fn: Optionaler Callback fuer Statusmeldungen (str)
             
         Returns:
             bool: True wenn erfolgreich geladen
         """
+        def report(message):
+            if progress_fn:
+                progress_fn(message)
+        
         try:
-            if not YOLO_AVAILABLE:
-                logging.error("ultralytics nicht verfuegbar")
-                return False
-                
             if not Path(model_path).exists():
                 logging.error(f"Modelldatei nicht gefunden: {model_path}")
                 return False
             
             # Modell laden
-            self.model = YOLO(model_path)
+            report(f"Lade Modell {Path(model_path).name} ...")
+            start = time.perf_counter()
+            inference_backend = create_backend(model_path, backend, imgsz)
+            if inference_backend is None:
+                return False
+            load_time = time.perf_counter() - start
             
-            # Klassen extrahieren
-            if hasattr(self.model, 'names'):
-                self.class_names = self.model.names
-            else:
-                # Fallback fuer aeltere Versionen
-                self.class_names = {i: f"class_{i}" for i in range(80)}
+            warmup_times = self._warmup(inference_backend, warmup_runs, warmup_shape, report)
+            
+            self.backend = inference_backend
+            self.class_names = inference_backend.class_names
+            self.load_timings = {
+                'backend': inference_backend.name,
+                'load_s': round(load_time, 3),
+                'warmup_s': round(sum(warmup_times), 3),
+                'warmup_first_ms': round(warmup_times[0] * 1000, 1) if warmup_times else None,
+                'warmup_last_ms': round(warmup_times[-1] * 1000, 1) if warmup_times else None,
+            }
             
             self.model_loaded = True
-            logging.info(f"KI-Modell geladen: {model_path}")
+            logging.info(f"KI-Modell geladen: {model_path} (Backend: {inference_backend.name}, "
+                         f"Laden {load_time:.2f}s, Aufwaermen {sum(warmup_times):.2f}s)")
             logging.info(f"Klassen im KI-Modell: {list(self.class_names.values())}")
             
             return True
@@ -79,6 +638,31 @@ class DetectionEngine:
             logging.error(f"Fehler beim Laden des Modells: {e}")
             return False
     
+    def _warmup(self, inference_backend, runs, shape, report):
+        """Dummy-Inferenzen ausfuehren (Graph-Aufbau, Speicher-Allokation, Fusion).
+        
+        Der letzte Durchlauf nutzt die maximale Batch-Groesse, damit auch dieser
+        Pfad vor dem ersten Zyklus initialisiert ist.
+        
+        Returns:
+            list: Dauer jedes Durchlaufs in Sekunden
+        """
+        if runs <= 0:
+            return []
+        
+        height, width = shape or (640, 640)
+        frame = np.full((height, width, 3), 114, dtype=np.uint8)
+        params = dict(self.inference_params)
+        
+        timings = []
+        for i in range(runs):
+            batch_size = self.batch_sizer.max_batch_size if i == runs - 1 and runs > 1 else 1
+            report(f"Modell wird aufgewaermt ({i + 1}/{runs}) ...")
+            start = time.perf_counter()
+            inference_backend.predict([frame] * batch_size, params)
+            timings.append(time.perf_counter() - start)
+        return timings
+    
     def set_class_colors(self, class_colors_dict):
         """Setze benutzerdefinierte Farben fuer Objekt-Klassen.
         
@@ -155,85 +739,127 @@ class DetectionEngine:
             frame: OpenCV-Frame (numpy array)
             
         Returns:
-            list: Liste der Erkennungen [(x1, y1, x2, y2, confidence, class_id), ...]
+            numpy.ndarray: DETECTION_DTYPE-Array (x1, y1, x2, y2, confidence, class_id) pro Box
         """
         if not self.model_loaded or frame is None:
-            return []
+            return empty_detections()
         
         try:
             # Erkennung durchfuehren
-            results = self.model(frame,
-                                 verbose=False)
+            return self.backend.predict([frame], self.inference_params)[0]
             
-            detections = []
-            for result in results:
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    boxes = result.boxes
-                    
-                    # Boxen extrahieren
-                    if len(boxes) > 0:
-                        # Koordinaten
-                        coords = boxes.xyxy.cpu().numpy()
-                        # Konfidenz
-                        confidences = boxes.conf.cpu().numpy()
-                        # Klassen
-                        classes = boxes.cls.cpu().numpy().astype(int)
-                        
-                        for i in range(len(coords)):
-                            conf = confidences[i]
-                            if conf >= self.confidence_threshold:
-                                x1, y1, x2, y2 = coords[i]
-                                class_id = classes[i]
-                                
-                                detections.append((
-                                    int(x1), int(y1), int(x2), int(y2),
-                                    float(conf), int(class_id)
-                                ))
+        except Exception as e:
+            logging.error(f"Fehler bei der Erkennung: {e}")
+            return empty_detections()
+    
+    def detect_batch(self, frames):
+        """Objekterkennung fuer mehrere Frames in einem Modellaufruf.
+        
+        Der Modell-Overhead pro Aufruf faellt nur einmal pro Batch an. Die gemessene
+        Dauer fliesst in batch_sizer ein.
+        
+        Args:
+            frames (list): OpenCV-Frames (numpy arrays)
             
+        Returns:
+            list: DETECTION_DTYPE-Array pro Frame in Eingabereihenfolge
+        """
+        if not self.model_loaded or not frames:
+            return [empty_detections() for _ in frames]
+        
+        try:
+            start = time.perf_counter()
+            detections = self.backend.predict(list(frames), self.inference_params)
+            self.batch_sizer.record(len(frames), time.perf_counter() - start)
+            
+            if len(detections) != len(frames):
+                logging.error(f"Batch-Erkennung: {len(detections)} Ergebnisse fuer {len(frames)} Frames")
+                return [empty_detections() for _ in frames]
             return detections
             
         except Exception as e:
-            logging.error(f"Fehler bei der Erkennung: {e}")
-            return []
+            logging.error(f"Fehler bei der Batch-Erkennung: {e}")
+            return [empty_detections() for _ in frames]
     
     def draw_detections(self, frame, detections):
         """Erkennungen auf Frame zeichnen mit benutzerdefinierten Farben.
         
         Args:
             frame: Original-Frame
-            detections: Liste der Erkennungen
+            detections: DETECTION_DTYPE-Array (oder None)
             
         Returns:
             numpy.ndarray: Frame mit Erkennungen
         """
-        if not detections:
+        if detections is None or len(detections) == 0:
             return frame
         
         # Kopie erstellen
         annotated = frame.copy()
+        self.draw_detections_into(annotated, detections)
+        return annotated
+    
+    def draw_detections_into(self, image, detections, scale=1.0, font_scale=0.6):
+        """Erkennungen direkt in ein (ggf. verkleinertes) Bild zeichnen.
+        
+        Args:
+            image: Zielbild (wird veraendert)
+            detections: DETECTION_DTYPE-Array in Frame-Koordinaten (oder None)
+            scale (float): Faktor Frame -> Bildkoordinaten (Anzeige-Groesse / Frame-Groesse)
+            font_scale (float): Schriftgroesse in Bildpixeln (unabhaengig von scale)
+        """
+        if detections is None or len(detections) == 0:
+            return
         
-        for detection in detections:
-            x1, y1, x2, y2, confidence, class_id = detection
+        thickness = 2 if scale >= 0.5 else 1
+        # tolist() liefert Python-Tupel in einem Schritt (kein Zugriff pro Feld und Box)
+        for x1, y1, x2, y2, confidence, class_id in as_detection_array(detections).tolist():
+            x1, y1, x2, y2 = int(x1 * scale), int(y1 * scale), int(x2 * scale), int(y2 * scale)
             
             # Benutzerdefinierte oder Standard-Farbe waehlen
             color = self.get_color_for_class(class_id)
             
             # Bounding Box zeichnen
-            cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 2)
+            cv2.rectangle(image, (x1, y1), (x2, y2), color, thickness)
             
             # Label erstellen
             class_name = self.class_names.get(class_id, f"Class {class_id}")
             label = f"{class_name}: {confidence:.2f}"
             
             # Label-Hintergrund
-            (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)
-            cv2.rectangle(annotated, (x1, y1 - label_h - 10), (x1 + label_w, y1), color, -1)
+            (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)
+            cv2.rectangle(image, (x1, y1 - label_h - 10), (x1 + label_w, y1), color, -1)
             
             # Label-Text
-            cv2.putText(annotated, label, (x1, y1 - 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            cv2.putText(image, label, (x1, y1 - 5), 
+                       cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), 1)
+    
+    def set_inference_params(self, conf=None, iou=None, classes=None, max_det=None, imgsz=None):
+        """Parameter fuer den Modellaufruf setzen.
         
-        return annotated
+        Schwellwert und Klassenfilter werden so schon im NMS angewendet, statt
+        alle Kandidaten erst nachtraeglich in Python zu verwerfen.
+        
+        Args:
+            conf (float): Konfidenz-Schwelle (None = confidence_threshold)
+            iou (float): IoU-Schwelle fuer NMS (None = Modell-Standard)
+            classes (list): Erlaubte Klassen-IDs (None = alle)
+            max_det (int): Maximale Anzahl Boxen pro Bild (None = Modell-Standard)
+            imgsz (int): Eingabegroesse (None = Trainingsgroesse des Modells)
+        """
+        params = {'conf': self.confidence_threshold if conf is None else float(conf)}
+        if iou is not None:
+            params['iou'] = float(iou)
+        if classes is not None:
+            params['classes'] = [int(class_id) for class_id in classes]
+        if max_det is not None:
+            params['max_det'] = int(max_det)
+        if imgsz:
+            params['imgsz'] = int(imgsz)
+        
+        if params != self.inference_params:
+            self.inference_params = params
+            logging.info(f"Modell-Parameter gesetzt: {params}")
     
     def get_class_names(self):
         """Klassennamen zurueckgeben.
@@ -256,35 +882,23 @@ class DetectionEngine:
         """Zusammenfassung der Erkennungen erstellen (wie komplexe App).
         
         Args:
-            detections: Liste der Erkennungen
+            detections: DETECTION_DTYPE-Array
             
         Returns:
             dict: Zusammenfassung mit Klassenanzahl und Statistiken
         """
+        class_ids, counts, sums, minima, maxima = group_detections_by_class(detections)
+        
         summary = {}
-        for detection in detections:
-            _, _, _, _, confidence, class_id = detection
+        for class_id, count, conf_sum, max_conf in zip(class_ids.tolist(), counts.tolist(),
+                                                       sums.tolist(), maxima.tolist()):
             class_name = self.class_names.get(class_id, f"Class {class_id}")
-            
-            if class_name not in summary:
-                summary[class_name] = {
-                    'count': 0,
-                    'max_confidence': 0.0,
-                    'avg_confidence': 0.0,
-                    'confidences': [],
-                    'class_id': class_id
-                }
-            
-            summary[class_name]['count'] += 1
-            summary[class_name]['confidences'].append(confidence)
-            summary[class_name]['max_confidence'] = max(
-                summary[class_name]['max_confidence'], confidence
-            )
-        
-        # Durchschnittliche Konfidenz berechnen
-        for class_name in summary:
-            confidences = summary[class_name]['confidences']
-            summary[class_name]['avg_confidence'] = sum(confidences) / len(confidences)
+            summary[class_name] = {
+                'count': count,
+                'max_confidence': max_conf,
+                'avg_confidence': conf_sum / count,
+                'class_id': class_id
+            }
         
         return summary
     
@@ -292,12 +906,13 @@ class DetectionEngine:
         """Qualitaetsanalyse der Erkennungen (erweiterte Funktion).
         
         Args:
-            detections: Liste der Erkennungen
+            detections: DETECTION_DTYPE-Array
             
         Returns:
             dict: Qualitaetsmetriken
         """
-        if not detections:
+        detections = as_detection_array(detections)
+        if len(detections) == 0:
             return {
                 'total_detections': 0,
                 'avg_confidence': 0.0,
@@ -305,10 +920,10 @@ class DetectionEngine:
                 'quality_score': 0.0
             }
         
-        confidences = [detection[4] for detection in detections]
+        confidences = detections['confidence']
         total_detections = len(detections)
-        avg_confidence = sum(confidences) / total_detections
-        high_confidence_count = len([c for c in confidences if c > 0.8])
+        avg_confidence = float(confidences.mean())
+        high_confidence_count = int(np.count_nonzero(confidences > 0.8))
         
         # Qualitaets-Score basierend auf Konfidenz und Anzahl
         quality_score = (avg_confidence * 0.7) + (high_confidence_count / total_detections * 0.3)
@@ -318,4 +933,4 @@ class DetectionEngine:
             'avg_confidence': avg_confidence,
             'high_confidence_count': high_confidence_count,
             'quality_score': quality_score
-        }
\ No newline at end of file
+        }
@@ -1,57 +1,432 @@
-""" 
+"""
 Detection Event Logger - Tagebasierte Parquet-Dateien Speichert alle Ereignisse eines Tages in einer gemeinsamen Parquet-Datei Neue Datei wird automatisch um Mitternacht erstellt
+STREAMING: Events werden gebatcht als Row-Groups an offene Teil-Dateien angehängt (konstante Kosten pro Event),
+beim Tageswechsel und beim Schließen werden die Teil-Dateien zur Tagesdatei zusammengeführt
+NICHT-BLOCKIEREND: log_*-Methoden reihen Events nur in eine begrenzte Queue ein, ein eigener Writer-Thread
+übernimmt JSON-Serialisierung und Parquet-I/O
+TYPISIERT: Zyklus-Ergebnisse zusätzlich in eigener Tagesdatei mit festen Spalten und Klassen-Statistiken
+ABFRAGEN: create_log_scanner behandelt das ganze Log-Verzeichnis als ein Dataset (Filter-Pushdown auf Row-Groups)
 """
 
 import os
+import json
+import time
+import shutil
 import logging
+from collections import deque
 from datetime import datetime, date
 from pathlib import Path
-import pandas as pd
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, Optional
 
 try:
     import pyarrow as pa
+    import pyarrow.dataset as ds
     import pyarrow.parquet as pq
     PYARROW_AVAILABLE = True
 except ImportError:
     PYARROW_AVAILABLE = False
     logging.warning("pyarrow nicht verfügbar - Parquet-Logging deaktiviert")
 
+EVENTS_PREFIX = 'detection_events'
+CYCLES_PREFIX = 'detection_cycles'
+
+
+class _ParquetDayStream:
+    """
+    Tagebasierter, gebatchter Parquet-Strom.
+
+    Während des Tages werden Records in Teil-Dateien geschrieben:
+    <prefix>_YYYY-MM-DD/part-00000.parquet, part-00001.parquet, ...
+    Die aktuell offene Teil-Datei heißt _part-NNNNN.parquet (wird von pyarrow-Readern
+    ignoriert) und wird nach part_interval Sekunden abgeschlossen und damit für
+    Reader sichtbar. Beim Tageswechsel und beim Schließen werden die Teile zu
+    <prefix>_YYYY-MM-DD.parquet zusammengeführt.
+
+    Nicht thread-sicher - wird nur unter dem Lock des DetectionLoggers benutzt.
+    """
+
+    def __init__(self, log_directory, prefix, schema, batch_size, flush_interval,
+                 part_interval, part_max_rows):
+        self.log_directory = log_directory
+        self.prefix = prefix
+        self.schema = schema
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.part_interval = part_interval
+        self.part_max_rows = part_max_rows
+
+        self.current_date = None
+        self.current_file_path = None
+        self.current_part_directory = None
+        self.buffer = []
+        self.records_written = 0
+
+        # Offene Teil-Datei
+        self._writer = None
+        self._writer_path = None
+        self._part_index = 0
+        self._part_rows = 0
+        self._part_started = 0.0
+        self._last_flush = time.monotonic()
+
+    @property
+    def open_part_rows(self):
+        return self._part_rows if self._writer is not None else 0
+
+    def get_day_file(self, day):
+        """Pfad der zusammengeführten Tagesdatei."""
+        return os.path.join(self.log_directory, f"{self.prefix}_{day.strftime('%Y-%m-%d')}.parquet")
+
+    def get_part_directory(self, day):
+        """Verzeichnis mit den Teil-Dateien eines Tages."""
+        return os.path.join(self.log_directory, f"{self.prefix}_{day.strftime('%Y-%m-%d')}")
+
+    def set_day(self, today):
+        """Auf neuen Tag umschalten - Teile des Vortags abschließen und zusammenführen.
+
+        Returns:
+            bool: True wenn ein Tageswechsel stattgefunden hat
+        """
+        if self.current_date == today:
+            return False
+
+        previous_date = self.current_date
+        if previous_date is not None:
+            self.flush()
+            self.close_part()
+            self.compact_day(previous_date)
+
+        self.current_date = today
+        self.current_file_path = self.get_day_file(today)
+        self.current_part_directory = self.get_part_directory(today)
+        self._part_index = self._next_part_index(self.current_part_directory)
+        return True
+
+    def append(self, record):
+        """Record puffern (Schreiben erfolgt gebatcht)."""
+        self.buffer.append(record)
+
+    def flush_due(self):
+        """Prüfen ob Batch-Größe oder Flush-Intervall erreicht ist."""
+        return (len(self.buffer) >= self.batch_size or
+                time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self):
+        """Gepufferte Records als Row-Group an die offene Teil-Datei anhängen."""
+        self._last_flush = time.monotonic()
+
+        if not self.buffer:
+            return
+
+        try:
+            table = pa.Table.from_pylist(self.buffer, schema=self.schema)
+
+            if self._writer is None:
+                self._open_part()
+
+            self._writer.write_table(table)
+            self._part_rows += table.num_rows
+            self.records_written += table.num_rows
+            self.buffer = []
+
+            # Teil-Datei abschließen, damit Reader die Daten sehen
+            if self._part_rows >= self.part_max_rows:
+                self.close_part()
+
+            logging.debug(f"{table.num_rows} Records in {self.prefix} gespeichert")
+
+        except Exception as e:
+            logging.error(f"Fehler beim Schreiben der Parquet-Datei ({self.prefix}): {e}")
+
+    def close_part_if_due(self):
+        """Offene Teil-Datei nach Ablauf von part_interval abschließen."""
+        if self._writer is not None and time.monotonic() - self._part_started >= self.part_interval:
+            self.close_part()
+
+    def _next_part_index(self, part_directory):
+        """Nächsten freien Teil-Index im Tagesverzeichnis ermitteln."""
+        if not os.path.isdir(part_directory):
+            return 0
+
+        indices = []
+        for name in os.listdir(part_directory):
+            stem = name.lstrip('_')
+            if stem.startswith('part-') and stem.endswith('.parquet'):
+                try:
+                    indices.append(int(stem[5:-8]))
+                except ValueError:
+                    continue
+        return max(indices) + 1 if indices else 0
+
+    def _open_part(self):
+        """Neue Teil-Datei mit offenem ParquetWriter anlegen."""
+        Path(self.current_part_directory).mkdir(parents=True, exist_ok=True)
+
+        # Unterstrich-Präfix: unvollständige Datei wird von Readern ignoriert
+        self._writer_path = os.path.join(self.current_part_directory, f"_part-{self._part_index:05d}.parquet")
+        self._writer = pq.ParquetWriter(self._writer_path, self.schema, compression='snappy')
+        self._part_rows = 0
+        self._part_started = time.monotonic()
+
+    def close_part(self):
+        """Offene Teil-Datei abschließen und für Reader sichtbar machen."""
+        if self._writer is None:
+            return
+
+        try:
+            self._writer.close()
+            final_path = os.path.join(os.path.dirname(self._writer_path), os.path.basename(self._writer_path)[1:])
+            os.replace(self._writer_path, final_path)
+            logging.debug(f"Log-Teil abgeschlossen: {final_path} ({self._part_rows} Records)")
+        except Exception as e:
+            logging.error(f"Fehler beim Abschließen der Log-Teil-Datei: {e}")
+        finally:
+            self._writer = None
+            self._writer_path = None
+            self._part_index += 1
+
+    def compact_day(self, day):
+        """Teil-Dateien eines Tages zur Tagesdatei zusammenführen."""
+        part_directory = self.get_part_directory(day)
+        if not os.path.isdir(part_directory):
+            return
+
+        try:
+            part_files = sorted(Path(part_directory).glob('part-*.parquet'))
+            if not part_files:
+                return
+
+            day_file = self.get_day_file(day)
+            tables = []
+
+            # Bereits bestehende Tagesdatei (z.B. von früherem Neustart) zuerst übernehmen
+            if os.path.exists(day_file):
+                existing = pq.read_table(day_file)
+                tables.append(existing.select(self.schema.names).cast(self.schema))
+
+            for part_file in part_files:
+                tables.append(pq.read_table(part_file).cast(self.schema))
+
+            combined = pa.concat_tables(tables)
+            temp_file = day_file + '.tmp'
+            pq.write_table(combined, temp_file, compression='snappy', row_group_size=self.part_max_rows)
+            os.replace(temp_file, day_file)
+
+            for part_file in part_files:
+                part_file.unlink()
+
+            # Unvollständige Teile (Absturz) bleiben erhalten, sonst Verzeichnis entfernen
+            if not os.listdir(part_directory):
+                os.rmdir(part_directory)
+
+            logging.info(f"Log-Teile zusammengeführt: {os.path.basename(day_file)} ({combined.num_rows} Records)")
+
+        except Exception as e:
+            logging.error(f"Fehler beim Zusammenführen der Log-Teile {part_directory}: {e}")
+
+    def compact_stale(self, today):
+        """Teil-Verzeichnisse vergangener Tage (z.B. nach Absturz) zusammenführen."""
+        for path in Path(self.log_directory).glob(f'{self.prefix}_*'):
+            if not path.is_dir():
+                continue
+            try:
+                day = datetime.strptime(path.name[len(self.prefix) + 1:], '%Y-%m-%d').date()
+            except ValueError:
+                continue
+            if day != today:
+                self.compact_day(day)
+
+
+def _day_from_log_name(name, prefix):
+    """Datum aus '<prefix>_YYYY-MM-DD[.parquet]' lesen oder None."""
+    stem = name[len(prefix) + 1:]
+    if stem.endswith('.parquet'):
+        stem = stem[:-8]
+    try:
+        return datetime.strptime(stem, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def find_log_files(log_directory, prefix=EVENTS_PREFIX, start_date=None, end_date=None):
+    """Abgeschlossene Parquet-Dateien eines Logs im Datumsbereich finden.
+
+    Berücksichtigt Tagesdateien und abgeschlossene Teil-Dateien des laufenden Tages.
+    Offene Teil-Dateien (_part-*) und Temp-Dateien werden ignoriert. Tage außerhalb
+    von start_date..end_date werden allein anhand des Dateinamens ausgeschlossen.
+
+    Returns:
+        list: Dateipfade (str), aufsteigend nach Datum
+    """
+    files = []
+    for path in sorted(Path(log_directory).glob(f'{prefix}_*')):
+        day = _day_from_log_name(path.name, prefix)
+        if day is None:
+            continue
+        if (start_date and day < start_date) or (end_date and day > end_date):
+            continue
+
+        if path.is_dir():
+            files.extend(str(part) for part in sorted(path.glob('part-*.parquet')))
+        elif path.suffix == '.parquet':
+            files.append(str(path))
+    return files
+
+
+def build_log_filter(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     event_types: Optional[Iterable[str]] = None,
+                     sub_types: Optional[Iterable[str]] = None,
+                     statuses: Optional[Iterable[str]] = None):
+    """Dataset-Filterausdruck für Zeitbereich und Event-Felder erstellen.
+
+    Returns:
+        pyarrow.dataset.Expression oder None wenn kein Filter gesetzt ist
+    """
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field('timestamp') >= pa.scalar(start, type=pa.timestamp('ns')))
+    if end is not None:
+        conditions.append(ds.field('timestamp') < pa.scalar(end, type=pa.timestamp('ns')))
+
+    for column, values in (('event_type', event_types), ('sub_type', sub_types), ('status', statuses)):
+        if values:
+            values = list(values)
+            if len(values) == 1:
+                conditions.append(ds.field(column) == values[0])
+            else:
+                conditions.append(ds.field(column).isin(values))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def create_log_scanner(log_directory, prefix=EVENTS_PREFIX, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None, event_types: Optional[Iterable[str]] = None,
+                       sub_types: Optional[Iterable[str]] = None, statuses: Optional[Iterable[str]] = None,
+                       columns=None, schema=None, batch_size=65536):
+    """Mehrtägige Abfrage über das Log-Verzeichnis als ein pyarrow-Dataset.
+
+    Tage werden über den Dateinamen vorselektiert, die übrigen Filter werden als
+    Dataset-Ausdruck an den Parquet-Scanner übergeben und gegen die Row-Group-
+    Statistiken geprüft - nicht passende Row-Groups werden nicht gelesen.
+    Noch gepufferte Events und die offene Teil-Datei sind nicht enthalten.
+
+    Args:
+        log_directory (str): parquet_log_directory
+        prefix (str): 'detection_events' oder 'detection_cycles'
+        start, end (datetime): Zeitbereich [start, end)
+        event_types, sub_types, statuses: Erlaubte Werte (None = alle); für das
+            Zyklus-Log ist nur statuses sinnvoll
+        columns (list): Zu lesende Spalten (None = alle)
+        schema (pa.Schema): Ziel-Schema (None = aus den Dateien ableiten)
+        batch_size (int): Maximale Zeilen pro RecordBatch
+
+    Returns:
+        pyarrow.dataset.Scanner oder None wenn keine Dateien im Bereich liegen
+    """
+    files = find_log_files(log_directory, prefix,
+                           start.date() if start else None,
+                           end.date() if end else None)
+    if not files:
+        return None
+
+    dataset = ds.dataset(files, schema=schema, format='parquet')
+    return dataset.scanner(columns=columns,
+                           filter=build_log_filter(start, end, event_types, sub_types, statuses),
+                           batch_size=batch_size)
+
+
 class DetectionLogger:
     """
     Tagebasierter Detection Event Logger.
 
     Speichert alle Events eines Tages in einer gemeinsamen Parquet-Datei.
     Format: detection_events_YYYY-MM-DD.parquet
+
+    Zyklus-Ergebnisse (DETECTION/CYCLE_RESULT) werden zusätzlich typisiert in
+    detection_cycles_YYYY-MM-DD.parquet abgelegt (siehe _define_cycle_schema), damit
+    Auswertungen ohne JSON-Parsing mit Spalten-Pruning und Predicate-Pushdown arbeiten.
+
+    Während des Tages werden Events in Teil-Dateien geschrieben (siehe _ParquetDayStream).
+
+    Alle log_*-Methoden kehren sofort zurück: Events landen in einer begrenzten
+    Queue (parquet_log_queue_size), die ein Writer-Thread leert. Bei voller Queue
+    gilt parquet_log_overflow_policy:
+        'drop_oldest' - ältestes wartendes Event verwerfen (Standard)
+        'block'       - Aufrufer wartet, bis wieder Platz ist
+        'spill'       - Event in ein lokales JSONL-Journal schreiben, der
+                        Writer-Thread übernimmt es später ins Parquet-Log
+    Die details-Dicts werden erst im Writer-Thread serialisiert und dürfen nach
+    dem Aufruf nicht mehr verändert werden.
     """
 
+    OVERFLOW_POLICIES = ('drop_oldest', 'block', 'spill')
+
     def __init__(self, settings):
         self.settings = settings
         self.enabled = settings.get('parquet_log_enabled', True) and PYARROW_AVAILABLE
-        
+
         if not self.enabled:
             logging.info("Parquet-Logging deaktiviert")
             return
-        
+
         # Konfiguration
         self.log_directory = settings.get('parquet_log_directory', 'logs/detection_events')
         self.max_files = settings.get('parquet_log_max_files', 1000000)
-        
-        # Thread-Sicherheit
+        self.batch_size = settings.get('parquet_log_batch_size', 256)
+        self.flush_interval = settings.get('parquet_log_flush_interval', 5.0)
+        self.part_interval = settings.get('parquet_log_part_interval', 60.0)
+        self.part_max_rows = settings.get('parquet_log_part_max_rows', 100000)
+        self.queue_size = max(1, settings.get('parquet_log_queue_size', 10000))
+        self.overflow_policy = settings.get('parquet_log_overflow_policy', 'drop_oldest')
+        if self.overflow_policy not in self.OVERFLOW_POLICIES:
+            logging.warning(f"Unbekannte Overflow-Policy '{self.overflow_policy}' - verwende 'drop_oldest'")
+            self.overflow_policy = 'drop_oldest'
+        self.spill_path = os.path.join(self.log_directory, 'spill_journal.jsonl')
+
+        # Thread-Sicherheit: _lock schützt Puffer und Teil-Dateien (Writer-Thread + close)
         self._lock = threading.Lock()
-        
-        # Aktueller Tag und Datei-Status
+        self._spill_lock = threading.Lock()
+
+        # Event-Queue zwischen Aufrufern und Writer-Thread
+        self._queue = deque()
+        self._queue_condition = threading.Condition()
+        self._accepting = True
+
+        # Zähler
+        self.events_enqueued = 0
+        self.events_dropped = 0
+        self.events_spilled = 0
+
+        # Aktueller Tag
         self.current_date = None
-        self.current_file_path = None
-        self.events_buffer = []
-        
+
         # Verzeichnis erstellen
         self._ensure_log_directory()
-        
-        # Schema für Parquet-Dateien definieren
+
+        # Schemata für Parquet-Dateien definieren
         self._define_schema()
-        
+        self._define_cycle_schema()
+
+        # Event-Log und typisiertes Zyklus-Log
+        self._streams = {
+            EVENTS_PREFIX: self._create_stream(EVENTS_PREFIX, self.schema),
+            CYCLES_PREFIX: self._create_stream(CYCLES_PREFIX, self.cycle_schema),
+        }
+
+        # Teil-Verzeichnisse vergangener Tage (z.B. nach Absturz) zusammenführen
+        if self.enabled:
+            for stream in self._streams.values():
+                stream.compact_stale(date.today())
+
+        # Writer-Thread: serialisiert und schreibt alle Events
+        self._writer_thread_running = True
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="detection-logger-writer", daemon=True)
+        self._writer_thread.start()
+
         logging.info(f"DetectionLogger initialisiert - Verzeichnis: {self.log_directory}")
 
     def _ensure_log_directory(self):
@@ -74,34 +449,62 @@ class DetectionLogger:
             ('details_json', pa.string()),  # JSON-String für komplexe Details
         ])
 
-    def _get_current_file_path(self):
-        """Aktuellen Dateipfad für heutiges Datum ermitteln."""
-        today = date.today()
-        filename = f"detection_events_{today.strftime('%Y-%m-%d')}.parquet"
-        return os.path.join(self.log_directory, filename)
+    def _define_cycle_schema(self):
+        """Typisiertes Parquet-Schema für DETECTION/CYCLE_RESULT-Events definieren."""
+        class_stats = pa.struct([
+            ('class_id', pa.int32()),
+            ('class_name', pa.dictionary(pa.int32(), pa.string())),
+            ('count', pa.int32()),
+            ('total_detections', pa.int32()),
+            ('min_confidence', pa.float32()),
+            ('max_confidence', pa.float32()),
+            ('avg_confidence', pa.float32()),
+        ])
+        self.cycle_schema = pa.schema([
+            ('timestamp', pa.timestamp('ns')),
+            ('status', pa.dictionary(pa.int8(), pa.string())),
+            ('bad_parts_detected', pa.bool_()),
+            ('evaluation_method', pa.dictionary(pa.int8(), pa.string())),
+            ('cycle_duration', pa.float32()),    # Sekunden
+            ('image_count', pa.int32()),
+            ('total_detections', pa.int32()),
+            ('classes', pa.list_(class_stats)),
+        ])
+
+    def _create_stream(self, prefix, schema):
+        """Tagebasierten Parquet-Strom mit den Logger-Einstellungen anlegen."""
+        return _ParquetDayStream(self.log_directory, prefix, schema, self.batch_size,
+                                 self.flush_interval, self.part_interval, self.part_max_rows)
+
+    @property
+    def current_file_path(self):
+        return self._streams[EVENTS_PREFIX].current_file_path
+
+    @property
+    def events_buffer(self):
+        return self._streams[EVENTS_PREFIX].buffer
+
+    @property
+    def events_written(self):
+        return self._streams[EVENTS_PREFIX].records_written
 
     def _check_day_change(self):
         """Prüfen ob ein neuer Tag begonnen hat."""
         today = date.today()
         if self.current_date != today:
-            # Neuer Tag - alte Events noch schreiben falls vorhanden
-            if self.events_buffer:
-                self._flush_events()
-            
-            # Neue Datei für heute
+            # Neuer Tag - alte Events noch schreiben und Teil-Dateien zusammenführen
+            for stream in self._streams.values():
+                stream.set_day(today)
+
             self.current_date = today
-            self.current_file_path = self._get_current_file_path()
-            self.events_buffer = []
-            
             logging.info(f"Neuer Tag erkannt - Log-Datei: {os.path.basename(self.current_file_path)}")
 
-    def _create_event_record(self, event_type: str, sub_type: str, status: str, 
-                        message: str, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _create_event_record(self, event_type: str, sub_type: str, status: str,
+                        message: str, details: Optional[Dict[str, Any]] = None,
+                        timestamp: Optional[datetime] = None) -> Dict[str, Any]:
         """Event-Record für Parquet erstellen."""
-        import json
-        
         return {
-            'timestamp': datetime.now(),
+            'timestamp': timestamp or datetime.now(),
             'event_type': event_type,
             'sub_type': sub_type,
             'status': status,
@@ -109,95 +512,196 @@ class DetectionLogger:
             'details_json': json.dumps(details) if details else '{}'
         }
 
-    def _append_to_file(self, events_data):
-        """Events zu Parquet-Datei hinzufügen."""
-        try:
-            # DataFrame aus Events erstellen
-            df = pd.DataFrame(events_data)
-            
-            # KORRIGIERT: Explizite Timestamp-Konvertierung zu pandas-Standard
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # VERBESSERT: Schema automatisch aus DataFrame ableiten anstatt erzwingen
-            # Das verhindert Casting-Probleme zwischen ns und ms
-            table = pa.Table.from_pandas(df, preserve_index=False)
-            
-            # An bestehende Datei anhängen oder neue erstellen
-            if os.path.exists(self.current_file_path):
-                # Bestehende Datei lesen
-                existing_table = pq.read_table(self.current_file_path)
-                # Neue Daten anhängen
-                combined_table = pa.concat_tables([existing_table, table])
-                # Zurückschreiben mit Snappy-Kompression
-                pq.write_table(combined_table, self.current_file_path, compression='snappy')
-            else:
-                # Neue Datei erstellen mit Snappy-Kompression
-                pq.write_table(table, self.current_file_path, compression='snappy')
-            
-            logging.debug(f"Events in Parquet-Datei gespeichert: {len(events_data)} Events")
-            
-        except Exception as e:
-            logging.error(f"Fehler beim Schreiben der Parquet-Datei: {e}")
+    def _create_cycle_record(self, timestamp: datetime, status: str,
+                             details: Dict[str, Any]) -> Dict[str, Any]:
+        """Typisierten Zyklus-Record für detection_cycles erstellen."""
+        classes = []
+        for class_name, stats in (details.get('cycle_detections') or {}).items():
+            classes.append({
+                'class_id': int(stats.get('class_id', -1)),
+                'class_name': class_name,
+                'count': int(stats.get('count', 0)),
+                'total_detections': int(stats.get('total_detections', 0)),
+                'min_confidence': float(stats.get('min_confidence', 0.0)),
+                'max_confidence': float(stats.get('max_confidence', 0.0)),
+                'avg_confidence': float(stats.get('avg_confidence', 0.0)),
+            })
+
+        return {
+            'timestamp': timestamp,
+            'status': status,
+            'bad_parts_detected': bool(details.get('bad_parts_detected', False)),
+            'evaluation_method': details.get('evaluation_method'),
+            'cycle_duration': details.get('cycle_duration'),
+            'image_count': int(details.get('cycle_image_count', 0)),
+            'total_detections': int(details.get('total_detections', 0)),
+            'classes': classes,
+        }
 
-    def _flush_events(self):
+    def _process_event(self, timestamp, event_type, sub_type, status, message, details):
+        """Event in die Parquet-Ströme übernehmen (Writer-Thread, unter _lock)."""
+        if event_type == 'DETECTION' and sub_type == 'CYCLE_RESULT' and details:
+            self._streams[CYCLES_PREFIX].append(self._create_cycle_record(timestamp, status, details))
+
+        self._streams[EVENTS_PREFIX].append(
+            self._create_event_record(event_type, sub_type, status, message, details, timestamp)
+        )
+
+    def _flush_events(self, force=False):
         """Gepufferte Events in Datei schreiben."""
-        if not self.events_buffer or not self.enabled:
+        if not self.enabled:
             return
-        
+
+        for stream in self._streams.values():
+            try:
+                if stream.buffer and (force or stream.flush_due()):
+                    stream.flush()
+            except Exception as e:
+                logging.error(f"Fehler beim Flushen der Events: {e}")
+
+    def _enqueue(self, item):
+        """Event in die Queue einreihen - Overflow gemäß Policy behandeln."""
+        spill = False
+
+        with self._queue_condition:
+            if len(self._queue) >= self.queue_size:
+                if self.overflow_policy == 'block':
+                    while len(self._queue) >= self.queue_size and self._writer_thread_running:
+                        self._queue_condition.wait(0.1)
+                elif self.overflow_policy == 'spill':
+                    spill = True
+                else:
+                    self._queue.popleft()
+                    self.events_dropped += 1
+
+            if not spill:
+                self._queue.append(item)
+                self.events_enqueued += 1
+                self._queue_condition.notify()
+
+        if spill:
+            self._spill_event(item)
+
+    def _spill_event(self, item):
+        """Event bei voller Queue in das JSONL-Journal schreiben."""
+        timestamp, event_type, sub_type, status, message, details = item
+        try:
+            line = json.dumps({
+                'timestamp': timestamp.isoformat(),
+                'event_type': event_type,
+                'sub_type': sub_type,
+                'status': status,
+                'message': message,
+                'details_json': json.dumps(details) if details else '{}'
+            })
+            with self._spill_lock:
+                with open(self.spill_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                self.events_spilled += 1
+        except Exception as e:
+            self.events_dropped += 1
+            logging.error(f"Fehler beim Schreiben ins Spill-Journal: {e}")
+
+    def _replay_spill_journal(self):
+        """Events aus dem Spill-Journal in die Schreib-Puffer übernehmen."""
+        replay_path = self.spill_path + '.replay'
+
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return
+            os.replace(self.spill_path, replay_path)
+
+        replayed = 0
         try:
-            self._append_to_file(self.events_buffer)
-            self.events_buffer = []
+            with open(replay_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._process_event(
+                            datetime.fromisoformat(record['timestamp']),
+                            record['event_type'], record['sub_type'], record['status'],
+                            record['message'], json.loads(record['details_json'])
+                        )
+                        replayed += 1
+                    except (ValueError, KeyError):
+                        continue
+            os.remove(replay_path)
+            logging.info(f"Spill-Journal übernommen: {replayed} Events")
         except Exception as e:
-            logging.error(f"Fehler beim Flushen der Events: {e}")
+            logging.error(f"Fehler beim Übernehmen des Spill-Journals: {e}")
+
+    def _writer_loop(self):
+        """Writer-Thread: Queue leeren, serialisieren, gebatcht schreiben."""
+        while True:
+            with self._queue_condition:
+                if not self._queue and self._writer_thread_running:
+                    self._queue_condition.wait(timeout=min(1.0, self.flush_interval))
+                items = list(self._queue)
+                self._queue.clear()
+                self._queue_condition.notify_all()
+                finished = not self._writer_thread_running and not items
 
-    def _log_event(self, event_type: str, sub_type: str, status: str, 
+            with self._lock:
+                try:
+                    self._check_day_change()
+
+                    for item in items:
+                        self._process_event(*item)
+
+                    # Leerlauf nutzen, um übergelaufene Events nachzutragen
+                    if not items and self.overflow_policy == 'spill':
+                        self._replay_spill_journal()
+
+                    self._flush_events()
+
+                    for stream in self._streams.values():
+                        stream.close_part_if_due()
+                except Exception as e:
+                    logging.error(f"Fehler im Log-Writer-Thread: {e}")
+
+            if finished:
+                break
+
+    def _log_event(self, event_type: str, sub_type: str, status: str,
                 message: str, details: Optional[Dict[str, Any]] = None):
-        """Basis-Methode für Event-Logging."""
-        if not self.enabled:
+        """Basis-Methode für Event-Logging - reiht nur ein, blockiert nicht."""
+        if not self.enabled or not self._accepting:
             return
-        
-        with self._lock:
-            try:
-                # Tag-Wechsel prüfen
-                self._check_day_change()
-                
-                # Event-Record erstellen
-                event_record = self._create_event_record(event_type, sub_type, status, message, details)
-                
-                # Zu Buffer hinzufügen
-                self.events_buffer.append(event_record)
-                
-                # Sofort schreiben (für Echtzeit-Verfügbarkeit)
-                self._flush_events()
-                
-            except Exception as e:
-                logging.error(f"Fehler beim Event-Logging: {e}")
+
+        try:
+            self._enqueue((datetime.now(), event_type, sub_type, status, message, details))
+        except Exception as e:
+            logging.error(f"Fehler beim Event-Logging: {e}")
 
     # Spezifische Logging-Methoden
 
-    def log_detection_cycle(self, bad_parts_detected: bool, cycle_detections: Dict[str, Any], 
+    def log_detection_cycle(self, bad_parts_detected: bool, cycle_detections: Dict[str, Any],
                         cycle_stats: Optional[Dict[str, Any]] = None):
-        """Detection-Zyklus-Ergebnis loggen."""
+        """Detection-Zyklus-Ergebnis loggen.
+
+        cycle_stats kann cycle_image_count, cycle_duration (Sekunden) und
+        evaluation_method enthalten - diese landen als feste Spalten im Zyklus-Log.
+        """
         status = 'ERROR' if bad_parts_detected else 'SUCCESS'
         message = 'Schlechte Teile erkannt' if bad_parts_detected else 'Keine schlechten Teile'
-        
+
         # Erkannte Klassen extrahieren
         detected_classes = list(cycle_detections.keys()) if cycle_detections else []
         total_detections = sum(stats.get('total_detections', 0) for stats in cycle_detections.values())
-        
+
         details = {
             'bad_parts_detected': bad_parts_detected,
             'cycle_detections': cycle_detections,
             'detected_classes': detected_classes,
             'total_detections': total_detections
         }
-        
+
         if cycle_stats:
             details.update(cycle_stats)
-        
+
         self._log_event('DETECTION', 'CYCLE_RESULT', status, message, details)
 
-    def log_modbus_event(self, sub_type: str, status: str, message: str, 
+    def log_modbus_event(self, sub_type: str, status: str, message: str,
                         details: Optional[Dict[str, Any]] = None):
         """Modbus-Event loggen."""
         self._log_event('MODBUS', sub_type, status, message, details)
@@ -208,18 +712,18 @@ class DetectionLogger:
         sub_type = 'AUTO_STOP' if auto_stop_triggered else 'MONITORING'
         status = 'ERROR' if auto_stop_triggered else 'INFO'
         message = f"Helligkeits-Auto-Stopp: {brightness_value:.1f}" if auto_stop_triggered else f"Helligkeit: {brightness_value:.1f}"
-        
+
         details = {
             'auto_stop_triggered': auto_stop_triggered,
             'brightness_value': brightness_value
         }
-        
+
         if threshold_info:
             details.update(threshold_info)
-        
+
         self._log_event('BRIGHTNESS', sub_type, status, message, details)
 
-    def log_system_event(self, sub_type: str, status: str, message: str, 
+    def log_system_event(self, sub_type: str, status: str, message: str,
                         details: Optional[Dict[str, Any]] = None):
         """System-Event loggen."""
         self._log_event('SYSTEM', sub_type, status, message, details)
@@ -230,30 +734,35 @@ class DetectionLogger:
         sub_type = 'DETECTED' if motion_detected else 'CLEARED'
         status = 'INFO'
         message = f"Bewegung {'erkannt' if motion_detected else 'gestoppt'}: {motion_value:.1f}"
-        
+
         event_details = {
             'motion_detected': motion_detected,
             'motion_value': motion_value,
             'workflow_status': workflow_status
         }
-        
+
         if details:
             event_details.update(details)
-        
+
         self._log_event('MOTION', sub_type, status, message, event_details)
 
     def get_current_file_info(self):
         """Info über aktuelle Log-Datei."""
         if not self.enabled:
             return {'enabled': False}
-        
+
+        events_stream = self._streams[EVENTS_PREFIX]
         file_info = {
             'enabled': True,
             'current_file': self.current_file_path,
+            'current_cycle_file': self._streams[CYCLES_PREFIX].current_file_path,
             'current_date': str(self.current_date),
-            'buffered_events': len(self.events_buffer)
+            'current_part_directory': events_stream.current_part_directory,
+            'open_part_rows': events_stream.open_part_rows,
+            'buffered_events': len(events_stream.buffer)
         }
-        
+        file_info.update(self.get_stats())
+
         if self.current_file_path and os.path.exists(self.current_file_path):
             try:
                 stat = os.stat(self.current_file_path)
@@ -261,58 +770,117 @@ class DetectionLogger:
                 file_info['last_modified'] = datetime.fromtimestamp(stat.st_mtime).isoformat()
             except Exception:
                 pass
-        
+
         return file_info
 
-    def get_available_log_files(self):
-        """Liste verfügbarer Log-Dateien."""
+    def get_stats(self):
+        """Zähler der Event-Queue und des Writer-Threads."""
+        if not self.enabled:
+            return {'enabled': False}
+
+        return {
+            'queue_depth': len(self._queue),
+            'queue_size': self.queue_size,
+            'overflow_policy': self.overflow_policy,
+            'events_enqueued': self.events_enqueued,
+            'events_written': self.events_written,
+            'cycles_written': self._streams[CYCLES_PREFIX].records_written,
+            'events_dropped': self.events_dropped,
+            'events_spilled': self.events_spilled
+        }
+
+    def get_available_log_files(self, prefix=EVENTS_PREFIX):
+        """Liste verfügbarer Log-Dateien.
+
+        Args:
+            prefix (str): 'detection_events' (Event-Log) oder 'detection_cycles' (typisiertes Zyklus-Log)
+        """
         if not self.enabled:
             return []
-        
+
         try:
             log_files = []
             log_dir = Path(self.log_directory)
-            
-            for file_path in log_dir.glob('detection_events_*.parquet'):
+
+            # Tagesdateien und Teil-Verzeichnisse des laufenden Tages
+            for file_path in log_dir.glob(f'{prefix}_*'):
                 try:
+                    if file_path.is_dir():
+                        parts = list(file_path.glob('part-*.parquet'))
+                        size = sum(part.stat().st_size for part in parts)
+                    elif file_path.suffix == '.parquet':
+                        size = file_path.stat().st_size
+                    else:
+                        continue
+
                     stat = file_path.stat()
                     log_files.append({
                         'filename': file_path.name,
                         'path': str(file_path),
-                        'size_mb': stat.st_size / (1024 * 1024),
+                        'size_mb': size / (1024 * 1024),
                         'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
                     })
                 except Exception:
                     continue
-            
+
             # Nach Datum sortieren (neueste zuerst)
             log_files.sort(key=lambda x: x['modified'], reverse=True)
             return log_files
-            
+
         except Exception as e:
             logging.error(f"Fehler beim Auflisten der Log-Dateien: {e}")
             return []
 
+    def query_events(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     event_types: Optional[Iterable[str]] = None, sub_types: Optional[Iterable[str]] = None,
+                     statuses: Optional[Iterable[str]] = None, columns=None,
+                     prefix=EVENTS_PREFIX) -> Iterator['pa.RecordBatch']:
+        """Events aller Tage im Zeitbereich abfragen (siehe create_log_scanner).
+
+        Beispiel - alle Fehler der letzten 30 Tage:
+            logger.query_events(start=datetime.now() - timedelta(days=30), statuses=['ERROR'])
+
+        Returns:
+            Iterator über pyarrow.RecordBatch
+        """
+        if not self.enabled:
+            return iter(())
+
+        schema = self.cycle_schema if prefix == CYCLES_PREFIX else self.schema
+        try:
+            scanner = create_log_scanner(self.log_directory, prefix, start, end, event_types,
+                                         sub_types, statuses, columns, schema)
+            if scanner is None:
+                return iter(())
+            return scanner.to_batches()
+        except Exception as e:
+            logging.error(f"Fehler bei der Log-Abfrage: {e}")
+            return iter(())
+
     def cleanup_old_files(self):
         """Alte Log-Dateien aufräumen wenn Limit erreicht."""
         try:
-            log_files = self.get_available_log_files()
-            
-            if len(log_files) > self.max_files:
-                # Älteste Dateien löschen
-                files_to_delete = log_files[self.max_files:]
-                deleted_count = 0
-                
-                for file_info in files_to_delete:
-                    try:
-                        os.remove(file_info['path'])
-                        deleted_count += 1
-                    except Exception as e:
-                        logging.warning(f"Fehler beim Löschen der Log-Datei {file_info['filename']}: {e}")
-                
-                if deleted_count > 0:
-                    logging.info(f"Log-Cleanup: {deleted_count} alte Dateien gelöscht")
-            
+            for prefix in (EVENTS_PREFIX, CYCLES_PREFIX):
+                log_files = self.get_available_log_files(prefix)
+
+                if len(log_files) > self.max_files:
+                    # Älteste Dateien löschen
+                    files_to_delete = log_files[self.max_files:]
+                    deleted_count = 0
+
+                    for file_info in files_to_delete:
+                        try:
+                            if os.path.isdir(file_info['path']):
+                                shutil.rmtree(file_info['path'])
+                            else:
+                                os.remove(file_info['path'])
+                            deleted_count += 1
+                        except Exception as e:
+                            logging.warning(f"Fehler beim Löschen der Log-Datei {file_info['filename']}: {e}")
+
+                    if deleted_count > 0:
+                        logging.info(f"Log-Cleanup: {deleted_count} alte Dateien gelöscht ({prefix})")
+
         except Exception as e:
             logging.error(f"Fehler beim Log-Cleanup: {e}")
 
@@ -320,17 +888,33 @@ class DetectionLogger:
         """Logger schließen und letzte Events schreiben."""
         if not self.enabled:
             return
-        
+
+        # Keine neuen Events mehr annehmen, Writer-Thread Queue leeren lassen
+        self._accepting = False
+        with self._queue_condition:
+            self._writer_thread_running = False
+            self._queue_condition.notify_all()
+        self._writer_thread.join(timeout=30.0)
+        if self._writer_thread.is_alive():
+            logging.warning("Log-Writer-Thread hat die Queue nicht rechtzeitig geleert")
+
         with self._lock:
             try:
-                # Letzte Events flushen
-                if self.events_buffer:
-                    self._flush_events()
-                
+                # Übergelaufene und letzte Events flushen
+                self._replay_spill_journal()
+                self._flush_events(force=True)
+
+                # Offene Teil-Dateien abschließen und Tagesdateien zusammenführen
+                for stream in self._streams.values():
+                    stream.close_part()
+                    if stream.current_date is not None:
+                        stream.compact_day(stream.current_date)
+
                 # Cleanup durchführen
                 self.cleanup_old_files()
-                
-                logging.info("DetectionLogger geschlossen")
-                
+
+                logging.info(f"DetectionLogger geschlossen - {self.events_written} Events geschrieben, "
+                             f"{self.events_dropped} verworfen, {self.events_spilled} ins Journal ausgelagert")
+
             except Exception as e:
-                logging.error(f"Fehler beim Schließen des DetectionLoggers: {e}")
\ No newline at end of file
+                logging.error(f"Fehler beim Schließen des DetectionLoggers: {e}")
@@ -0,0 +1,122 @@
+"""
+Anzeige-Renderer - Frames für die Live-Anzeige in der Render-Stufe aufbereiten
+Verkleinert zuerst auf die Größe des Video-Labels (INTER_AREA) und zeichnet die Boxen in Anzeige-Koordinaten
+Der GUI-Thread erhält ein fertiges BGR-Bild in Label-Größe (QImage Format_BGR888, kein Skalieren)
+Die Anzeigerate ist unabhängig von der Prüfrate begrenzbar
+"""
+
+import time
+import threading
+
+import cv2
+import numpy as np
+
+from frame_buffer_pool import FrameBufferPool
+
+
+def fit_size(frame_width, frame_height, target_width, target_height):
+    """Größe bei erhaltenem Seitenverhältnis, die in das Ziel passt (wie KeepAspectRatio).
+
+    Returns:
+        tuple: (breite, höhe, faktor)
+    """
+    scale = min(target_width / frame_width, target_height / frame_height)
+    width = max(1, int(round(frame_width * scale)))
+    height = max(1, int(round(frame_height * scale)))
+    return width, height, scale
+
+
+class DisplayRenderer:
+    """Erzeugt Anzeige-Bilder in Label-Größe aus Kamera-Frames.
+
+    set_target_size() wird aus dem GUI-Thread aufgerufen (Label-Größe),
+    render() aus der Render-Stufe der Pipeline. Die Anzeige-Bilder liegen in
+    einem eigenen Puffer-Pool und werden wiederverwendet, sobald die GUI sie
+    nicht mehr referenziert.
+    """
+
+    def __init__(self, detection_engine, max_fps=15, pool_size=4, font_scale=0.5):
+        self.detection_engine = detection_engine
+        self.font_scale = font_scale
+        self._target_size = None
+        self._min_interval = 0.0
+        self._last_render = 0.0
+        self._lock = threading.Lock()
+        self._pool = FrameBufferPool(pool_size, max_size=pool_size)
+        self._reduced = None   # Zwischenpuffer der ganzzahligen Verkleinerung (nur Render-Thread)
+        self.set_max_fps(max_fps)
+
+    def set_target_size(self, width, height):
+        """Größe des Anzeige-Bereichs setzen (GUI-Thread)."""
+        with self._lock:
+            self._target_size = (int(width), int(height)) if width > 0 and height > 0 else None
+
+    def set_max_fps(self, max_fps):
+        """Anzeigerate begrenzen (0 = jedes Frame anzeigen)."""
+        with self._lock:
+            self._min_interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+
+    def due(self):
+        """True wenn gemäß Anzeigerate ein neues Bild fällig ist."""
+        return time.perf_counter() - self._last_render >= self._min_interval
+
+    def render(self, frame, detections=None, force=False):
+        """Anzeige-Bild erzeugen.
+
+        Args:
+            frame: Kamera-Frame (BGR)
+            detections: DETECTION_DTYPE-Array in Frame-Koordinaten (oder None)
+            force (bool): Anzeigerate ignorieren
+
+        Returns:
+            numpy.ndarray oder None: BGR-Bild in Anzeige-Größe, None wenn nicht fällig
+                oder alle Anzeige-Puffer noch belegt sind
+        """
+        if frame is None or (not force and not self.due()):
+            return None
+        self._last_render = time.perf_counter()
+
+        with self._lock:
+            target_size = self._target_size
+        frame_height, frame_width = frame.shape[:2]
+        if target_size is None:
+            target_size = (frame_width, frame_height)
+        width, height, scale = fit_size(frame_width, frame_height, *target_size)
+
+        acquired = self._pool.acquire((height, width, 3))
+        if acquired is None:
+            # GUI hält noch alle Anzeige-Bilder - dieses Bild auslassen
+            return None
+        slot, image = acquired
+        self._resize_into(frame, image, scale)
+
+        self.detection_engine.draw_detections_into(image, detections, scale=scale, font_scale=self.font_scale)
+        return self._pool.publish(slot)
+
+    def _resize_into(self, frame, image, scale):
+        """Frame in den Anzeige-Puffer skalieren.
+
+        INTER_AREA ist nur bei ganzzahligem Faktor schnell (Blockmittelwert);
+        daher erst um den ganzzahligen Anteil mit INTER_AREA verkleinern, den
+        Rest (Faktor > 0.5) mit INTER_LINEAR.
+        """
+        height, width = image.shape[:2]
+        frame_height, frame_width = frame.shape[:2]
+        if (width, height) == (frame_width, frame_height):
+            np.copyto(image, frame)
+            return
+
+        factor = int(1.0 / scale) if scale < 1.0 else 1
+        if factor >= 2:
+            # Auf ein Vielfaches des Faktors beschneiden (höchstens factor-1 Randpixel)
+            frame = frame[:frame_height - frame_height % factor, :frame_width - frame_width % factor]
+            reduced_shape = (frame.shape[0] // factor, frame.shape[1] // factor, 3)
+            if reduced_shape[:2] == (height, width):
+                cv2.resize(frame, (width, height), dst=image, interpolation=cv2.INTER_AREA)
+                return
+            if self._reduced is None or self._reduced.shape != reduced_shape:
+                self._reduced = np.empty(reduced_shape, np.uint8)
+            cv2.resize(frame, (reduced_shape[1], reduced_shape[0]), dst=self._reduced, interpolation=cv2.INTER_AREA)
+            frame = self._reduced
+
+        cv2.resize(frame, (width, height), dst=image, interpolation=cv2.INTER_LINEAR)
@@ -0,0 +1,190 @@
+"""
+Frame-Puffer-Pool - vorab allozierte Kamera-Puffer ohne Kopien pro Frame
+Die Kamera konvertiert direkt in einen Pool-Puffer; Verbraucher erhalten schreibgeschützte Sichten
+Ein Puffer wird nie überschrieben, solange noch eine Sicht auf ihn existiert (Freigabe per weakref-Finalizer)
+Ist der Pool erschöpft, wächst er bis max_size; darüber liefert acquire() None und das Frame wird verworfen
+"""
+
+import logging
+import threading
+import weakref
+from collections import deque
+
+import numpy as np
+
+
+class _BufferLease:
+    """Leihgabe eines Pool-Puffers an die veröffentlichten Sichten.
+
+    Alle Sichten (auch Ausschnitte, np.asarray, reshape) verweisen über ihre
+    base-Kette auf dieses Objekt; erst wenn die letzte verschwindet, gibt der
+    Finalizer den Puffer an den Pool zurück.
+    """
+
+    __slots__ = ('__array_interface__', 'buffer', '__weakref__')
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.__array_interface__ = buffer.__array_interface__
+
+
+class PooledFrame(np.ndarray):
+    """Schreibgeschützte Sicht auf einen Pool-Puffer.
+
+    Solange die Sicht (oder ein Ausschnitt davon) existiert, bleibt der Puffer
+    reserviert und wird nicht überschrieben. Wer ein Frame dauerhaft aufbewahrt
+    (z.B. für asynchrones Speichern), sollte trotzdem detach() aufrufen, damit
+    der Puffer schnell wieder frei wird.
+    """
+
+    def __array_finalize__(self, obj):
+        # Nur Sichten (Ausschnitte) teilen den Pool-Puffer, Kopien nicht
+        shared = self.base is not None and isinstance(obj, PooledFrame)
+        self.pool = obj.pool if shared else None
+        self.slot = obj.slot if shared else -1
+        self.generation = obj.generation if shared else -1
+
+    def is_valid(self):
+        """True solange der Puffer noch dieses Frame enthält (bei lebender Sicht immer)."""
+        return self.pool is None or self.pool.generation_of(self.slot) == self.generation
+
+    def detach(self):
+        """Eigene, beschreibbare Kopie als normales numpy-Array."""
+        return np.array(self, copy=True, subok=False)
+
+
+class FrameBufferPool:
+    """Ring aus wiederverwendeten Frame-Puffern.
+
+    acquire() liefert einen freien Puffer zum Beschreiben, publish() die
+    schreibgeschützte Sicht darauf. Beide nur aus genau einem Erzeuger-Thread
+    aufrufen (Aufnahme- bzw. Render-Thread); ein Puffer, der nach acquire() nicht
+    veröffentlicht wurde (Fehler beim Konvertieren), wird beim nächsten acquire()
+    wiederverwendet.
+
+    Frei wird ein Puffer, wenn die letzte Sicht auf ihn verschwindet (Finalizer,
+    kann in jedem Thread laufen). Puffer werden erst bei Bedarf angelegt; ändert
+    sich die Frame-Größe, werden freie Puffer neu angelegt, belegte erst nach
+    ihrer Freigabe.
+    """
+
+    def __init__(self, size=8, max_size=None):
+        self._lock = threading.RLock()   # Finalizer können im selben Thread auslösen
+        self._buffers = []
+        self._generations = []
+        self._free = deque()
+        self._writing = None
+        self._shape = None
+        self._dtype = None
+        self.size = 0
+        self.max_size = 0
+        self.allocations = 0   # Anzahl angelegter Puffer (Diagnose / Benchmark)
+        self.grown = 0         # Puffer über die eingestellte Größe hinaus angelegt (Pool zu klein)
+        self.dropped = 0       # acquire() ohne freien Puffer bei max_size (Frame verworfen)
+        self.frames = 0
+        self.resize(size, max_size)
+
+    def resize(self, size, max_size=None):
+        """Pool-Größe ändern (max_size: Obergrenze beim Wachsen, Standard 2 x size).
+
+        Belegte Puffer bleiben gültig und werden nach ihrer Freigabe übernommen.
+        """
+        with self._lock:
+            self.size = max(2, int(size))
+            self.max_size = max(self.size, int(max_size) if max_size else 2 * self.size)
+            while len(self._buffers) < self.size:
+                self._add_slot()
+            self._trim()
+        logging.info(f"Frame-Puffer-Pool: {self.size} Puffer (höchstens {self.max_size})")
+
+    def _add_slot(self):
+        """Neuen (noch nicht allozierten) Slot anlegen und als frei markieren."""
+        self._buffers.append(None)
+        self._generations.append(0)
+        self._free.append(len(self._buffers) - 1)
+
+    def _trim(self):
+        """Freie Slots über max_size hinaus verwerfen (nur am Ende der Liste)."""
+        while len(self._buffers) > self.max_size and (len(self._buffers) - 1) in self._free:
+            slot = len(self._buffers) - 1
+            self._free.remove(slot)
+            self._buffers.pop()
+            self._generations.pop()
+
+    def generation_of(self, slot):
+        return self._generations[slot]
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Freien Puffer zum Beschreiben holen.
+
+        Returns:
+            tuple: (slot, beschreibbares numpy-Array der Form shape) oder
+                None, wenn alle Puffer belegt sind und max_size erreicht ist
+        """
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        with self._lock:
+            if shape != self._shape or dtype != self._dtype:
+                self._shape = shape
+                self._dtype = dtype
+
+            if self._writing is not None:
+                # Vorheriger acquire() ohne publish() - Puffer ist von niemandem referenziert
+                slot = self._writing
+            elif self._free:
+                slot = self._free.popleft()
+            elif len(self._buffers) < self.max_size:
+                self._add_slot()
+                slot = self._free.pop()
+                self.grown += 1
+                if self.grown == 1 or self.grown % 10 == 0:
+                    logging.warning(f"Frame-Puffer-Pool erschöpft - auf {len(self._buffers)} Puffer erweitert")
+            else:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 100 == 0:
+                    logging.warning(f"Frame-Puffer-Pool erschöpft ({len(self._buffers)} Puffer belegt) - "
+                                    f"{self.dropped} Frames verworfen")
+                return None
+
+            buffer = self._buffers[slot]
+            if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+                buffer = self._buffers[slot] = np.empty(shape, dtype)
+                self.allocations += 1
+            self._writing = slot
+            self._generations[slot] += 1
+            return slot, buffer
+
+    def exhausted(self):
+        """True wenn acquire() gerade kein Frame liefern könnte."""
+        with self._lock:
+            return self._writing is None and not self._free and len(self._buffers) >= self.max_size
+
+    def in_use(self):
+        """Anzahl aktuell belegter Puffer."""
+        with self._lock:
+            return len(self._buffers) - len(self._free)
+
+    def publish(self, slot):
+        """Schreibgeschützte Sicht auf einen beschriebenen Puffer."""
+        with self._lock:
+            lease = _BufferLease(self._buffers[slot])
+            finalizer = weakref.finalize(lease, self._release, slot, self._generations[slot])
+            finalizer.atexit = False
+            frame = np.asarray(lease).view(PooledFrame)
+            frame.pool = self
+            frame.slot = slot
+            frame.generation = self._generations[slot]
+            if self._writing == slot:
+                self._writing = None
+            self.frames += 1
+        frame.flags.writeable = False
+        return frame
+
+    def _release(self, slot, generation):
+        """Finalizer: letzte Sicht auf den Puffer ist verschwunden."""
+        with self._lock:
+            if slot >= len(self._buffers) or self._generations[slot] != generation:
+                return
+            # Vorne einreihen: zuletzt benutzte (bereits angelegte, cache-warme) Puffer zuerst wiederverwenden
+            self._free.appendleft(slot)
+            self._trim()
@@ -0,0 +1,166 @@
+"""
+Frame-Features - gemeinsame Vorverarbeitung pro Frame
+Graustufen, verkleinertes Graubild, Helligkeit und Vordergrund-Maske werden genau einmal berechnet
+Alle Verbraucher (Helligkeitsüberwachung, Motion-Anzeige, Workflow) lesen aus demselben FrameFeatures-Objekt
+Bewegungserkennung läuft auf einer Pyramidenstufe und nur im konfigurierten ROI (z.B. Förderband)
+"""
+
+import logging
+import threading
+
+import cv2
+
+
+class FrameFeatures:
+    """Pro Frame einmal berechnete Merkmale."""
+
+    __slots__ = ('gray', 'small_gray', 'roi_rect', 'scale', 'brightness', 'fg_mask', 'motion_pixels')
+
+    def __init__(self, gray, small_gray, roi_rect, scale, brightness, fg_mask, motion_pixels):
+        self.gray = gray                    # Graubild in voller Auflösung
+        self.small_gray = small_gray        # Geglättetes Graubild des ROI auf der Motion-Ebene
+        self.roi_rect = roi_rect            # (x, y, w, h) des ROI in voller Auflösung
+        self.scale = scale                  # Flächenfaktor small_gray -> volle Auflösung
+        self.brightness = brightness        # Mittlere Helligkeit (0-255)
+        self.fg_mask = fg_mask              # Vordergrund-Maske (None ohne Hintergrundmodell)
+        self.motion_pixels = motion_pixels  # Vordergrund-Pixel, auf volle Auflösung hochgerechnet
+
+
+class FrameFeatureExtractor:
+    """Berechnet FrameFeatures und führt das MOG2-Hintergrundmodell.
+
+    compute() wird nur von der Vorverarbeitungs-Stufe der Pipeline aufgerufen;
+    das Hintergrundmodell wird dabei genau einmal pro Frame aktualisiert
+    (apply_count == frames_processed, solange das Modell aktiv ist).
+
+    Die Bewegungsanalyse (Weichzeichnen, MOG2, Morphologie) läuft nur auf dem ROI
+    und auf der gewählten Pyramidenstufe. motion_pixels wird auf volle Auflösung
+    hochgerechnet, damit motion_threshold unabhängig von Stufe und ROI gilt.
+    """
+
+    def __init__(self, pyramid_level=0, roi=None):
+        """
+        Args:
+            pyramid_level (int): Verkleinerungsstufe für small_gray (0 = volle Auflösung,
+                jede Stufe halbiert Breite und Höhe per cv2.pyrDown)
+            roi (dict): {'enabled', 'x', 'y', 'width', 'height'} in Prozent des Bildes
+        """
+        self.pyramid_level = max(0, int(pyramid_level))
+        self.roi = roi or {}
+        self.bg_subtractor = None
+        self._kernel = self._make_kernel(self.pyramid_level)
+        self._config_lock = threading.Lock()
+        self._pending_config = None
+
+        # Zähler (u.a. zur Prüfung: ein Hintergrund-Update pro Frame)
+        self.frames_processed = 0
+        self.apply_count = 0
+
+    @property
+    def active(self):
+        """True wenn ein Hintergrundmodell existiert."""
+        return self.bg_subtractor is not None
+
+    @staticmethod
+    def _make_kernel(pyramid_level):
+        """Morphologie-Kern passend zur Stufe (5x5 bei voller Auflösung, sonst 3x3)."""
+        size = 5 if pyramid_level == 0 else 3
+        return cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
+
+    def configure(self, pyramid_level=None, roi=None):
+        """Pyramidenstufe und/oder ROI ändern (thread-sicher, greift ab dem nächsten Frame).
+
+        Das Hintergrundmodell wird dabei neu angelernt, da sich die Bildgröße ändert.
+        """
+        with self._config_lock:
+            pending = dict(self._pending_config or {})
+            if pyramid_level is not None:
+                pending['pyramid_level'] = max(0, int(pyramid_level))
+            if roi is not None:
+                pending['roi'] = roi
+            self._pending_config = pending
+
+    def _apply_pending_config(self):
+        with self._config_lock:
+            pending, self._pending_config = self._pending_config, None
+        if not pending:
+            return
+
+        changed = False
+        if 'pyramid_level' in pending and pending['pyramid_level'] != self.pyramid_level:
+            self.pyramid_level = pending['pyramid_level']
+            self._kernel = self._make_kernel(self.pyramid_level)
+            changed = True
+        if 'roi' in pending and pending['roi'] != self.roi:
+            self.roi = pending['roi']
+            changed = True
+
+        if changed and self.bg_subtractor is not None:
+            self.reset()
+            logging.info(f"Bewegungserkennung neu konfiguriert: Stufe {self.pyramid_level}, ROI {self.roi}")
+
+    def get_roi_rect(self, width, height):
+        """ROI in Pixeln (x, y, w, h) - ganzes Bild wenn kein gültiger ROI aktiv ist."""
+        roi = self.roi
+        if not roi or not roi.get('enabled', False):
+            return 0, 0, width, height
+
+        x0 = int(round(min(max(roi.get('x', 0), 0), 100) / 100.0 * width))
+        y0 = int(round(min(max(roi.get('y', 0), 0), 100) / 100.0 * height))
+        x1 = int(round(min(max(roi.get('x', 0) + roi.get('width', 100), 0), 100) / 100.0 * width))
+        y1 = int(round(min(max(roi.get('y', 0) + roi.get('height', 100), 0), 100) / 100.0 * height))
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            return 0, 0, width, height
+        return x0, y0, x1 - x0, y1 - y0
+
+    def reset(self):
+        """Neues Hintergrundmodell anlegen (z.B. beim Start der Erkennung)."""
+        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
+            detectShadows=False, # Deaktiviert für bessere Performance
+            varThreshold=32, # Varianz-Schwelle für bessere Erkennung
+            history=200 # History für stabilere Bewegungserkennung
+        )
+        self.frames_processed = 0
+        self.apply_count = 0
+        logging.debug("Hintergrundmodell zurückgesetzt")
+
+    def compute(self, frame):
+        """Alle Merkmale eines BGR-Frames in einem Durchlauf berechnen.
+
+        Returns:
+            FrameFeatures
+        """
+        if frame.ndim == 3:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = frame
+
+        self._apply_pending_config()
+
+        brightness = float(cv2.mean(gray)[0])
+
+        # ROI ausschneiden (View, keine Kopie) und verkleinern - pyrDown glättet bereits
+        roi_rect = self.get_roi_rect(gray.shape[1], gray.shape[0])
+        x, y, w, h = roi_rect
+        small_gray = gray[y:y + h, x:x + w]
+        for _ in range(self.pyramid_level):
+            small_gray = cv2.pyrDown(small_gray)
+        if self.pyramid_level == 0:
+            small_gray = cv2.GaussianBlur(small_gray, (5, 5), 0)
+        scale = (w * h) / float(small_gray.shape[0] * small_gray.shape[1])
+
+        fg_mask = None
+        motion_pixels = 0
+        bg_subtractor = self.bg_subtractor
+        if bg_subtractor is not None:
+            fg_mask = bg_subtractor.apply(small_gray)
+            self.apply_count += 1
+
+            fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self._kernel)
+            fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, self._kernel)
+
+            # Auf volle Auflösung hochrechnen, damit motion_threshold unabhängig von der Ebene gilt
+            motion_pixels = int(cv2.countNonZero(fg_mask) * scale)
+
+        self.frames_processed += 1
+        return FrameFeatures(gray, small_gray, roi_rect, scale, brightness, fg_mask, motion_pixels)
@@ -0,0 +1,468 @@
+"""
+Frame-Pipeline - Aufnahme, Vorverarbeitung, KI-Erkennung und Darstellung in eigenen Threads
+Ersetzt die QTimer-Schleife im GUI-Thread: Kamera-Takt und Modell-Latenz sind entkoppelt
+Stufen sind ueber begrenzte Queues verbunden (neuestes Frame gewinnt, aeltere werden verworfen)
+Die KI-Stufe kann mehrere Frames sammeln und als Batch verarbeiten
+Auch die Uebergabe an den GUI-Thread ist auf ein wartendes Frame begrenzt (neuestes gewinnt)
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from camera_acquisition import CapturedFrame
+
+
+class FramePacket:
+    """Ein Kamera-Frame mit allen Zwischenergebnissen auf dem Weg durch die Pipeline."""
+
+    __slots__ = ('sequence', 'timestamp', 'frame', 'camera_sequence', 'features', 'brightness',
+                 'motion_pixels', 'detections', 'display')
+
+    def __init__(self, sequence, frame, timestamp=None, camera_sequence=None):
+        self.sequence = sequence
+        self.timestamp = timestamp or time.time()  # Aufnahmezeit (vom Aufnahme-Thread, falls vorhanden)
+        self.frame = frame
+        self.camera_sequence = camera_sequence      # Sequenznummer im Ringpuffer der Kamera
+        self.features = None    # FrameFeatures aus der Vorverarbeitung
+        self.brightness = None
+        self.motion_pixels = 0
+        self.detections = None  # None = keine KI-Erkennung fuer dieses Frame
+        self.display = None     # Anzeige-Bild in Label-Groesse (None = nicht anzeigen)
+
+
+class LatestFrameQueue:
+    """Begrenzte Queue mit Drop-Policy 'neuestes Frame gewinnt'.
+
+    Ist die Queue voll, wird das aelteste Element verworfen und gezaehlt.
+    """
+
+    def __init__(self, maxsize=1):
+        self._items = deque()
+        self._maxsize = max(1, int(maxsize))
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        """Element einreihen, bei voller Queue das aelteste verwerfen."""
+        with self._condition:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """Naechstes Element holen.
+
+        Returns:
+            Element oder None bei Timeout
+        """
+        with self._condition:
+            if not self._items:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def set_maxsize(self, maxsize):
+        """Queue-Tiefe aendern (ueberzaehlige aelteste Elemente werden verworfen)."""
+        with self._condition:
+            self._maxsize = max(1, int(maxsize))
+            while len(self._items) > self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+
+    def qsize(self):
+        """Aktuelle Queue-Tiefe."""
+        with self._condition:
+            return len(self._items)
+
+    def clear(self):
+        """Alle wartenden Elemente verwerfen."""
+        with self._condition:
+            self._items.clear()
+
+
+class StageStats:
+    """Durchsatz-Statistik einer Pipeline-Stufe (FPS ueber gleitendes Fenster)."""
+
+    def __init__(self, window=30):
+        self._timestamps = deque(maxlen=window)
+        self.processed = 0
+        self.errors = 0
+        self.last_duration_ms = 0.0
+        self.last_batch_size = 1
+
+    def record(self, duration, count=1):
+        """Verarbeitete Elemente erfassen.
+
+        Args:
+            duration (float): Verarbeitungsdauer in Sekunden
+            count (int): Anzahl Elemente (Batch-Groesse)
+        """
+        now = time.perf_counter()
+        for _ in range(count):
+            self._timestamps.append(now)
+        self.processed += count
+        self.last_batch_size = count
+        self.last_duration_ms = duration * 1000.0
+
+    def fps(self):
+        """Aktuelle Verarbeitungsrate in Frames pro Sekunde."""
+        if len(self._timestamps) < 2:
+            return 0.0
+        span = self._timestamps[-1] - self._timestamps[0]
+        if span <= 0:
+            return 0.0
+        return (len(self._timestamps) - 1) / span
+
+
+class PipelineStage(threading.Thread):
+    """Eine Pipeline-Stufe als eigener Thread.
+
+    Holt Elemente aus der Eingangs-Queue (oder erzeugt sie selbst, falls keine
+    Eingangs-Queue existiert), verarbeitet sie mit process_fn und reicht das
+    Ergebnis an die Ausgangs-Queue weiter. Gibt process_fn None zurueck, wird
+    nichts weitergereicht.
+
+    Mit batch_size_fn sammelt die Stufe bis zu batch_size_fn() Elemente, hoechstens
+    jedoch batch_window Sekunden lang, und uebergibt sie als Liste an process_fn.
+    Die zurueckgegebene Liste wird elementweise weitergereicht.
+
+    thread_init_fn(name) wird einmal im Stufen-Thread aufgerufen, bevor die
+    Verarbeitung beginnt (z.B. fuer CPU-Affinitaet).
+    """
+
+    def __init__(self, name, process_fn, input_queue=None, output_queue=None, min_interval=0.0,
+                 batch_size_fn=None, batch_window=0.0, thread_init_fn=None):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage_name = name
+        self.process_fn = process_fn
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.min_interval = min_interval  # Mindestabstand zwischen zwei Durchlaeufen (Sekunden)
+        self.batch_size_fn = batch_size_fn
+        self.batch_window = batch_window
+        self.thread_init_fn = thread_init_fn
+        self.stats = StageStats()
+        self._running = threading.Event()
+
+    def start(self):
+        self._running.set()
+        super().start()
+
+    def stop(self):
+        """Stufe zum Beenden auffordern (join erfolgt durch die Pipeline)."""
+        self._running.clear()
+
+    def _collect_batch(self, first):
+        """Weitere Elemente zum Batch sammeln (bis Batch-Groesse oder Zeitfenster erreicht)."""
+        batch = [first]
+        batch_size = max(1, int(self.batch_size_fn()))
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < batch_size and self._running.is_set():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            item = self.input_queue.get(timeout=remaining)
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    def run(self):
+        if self.thread_init_fn is not None:
+            try:
+                self.thread_init_fn(self.stage_name)
+            except Exception as e:
+                logging.warning(f"Initialisierung der Stufe {self.stage_name} fehlgeschlagen: {e}")
+
+        last_run = 0.0
+        while self._running.is_set():
+            if self.input_queue is not None:
+                item = self.input_queue.get(timeout=0.1)
+                if item is None:
+                    continue
+                if self.batch_size_fn is not None:
+                    item = self._collect_batch(item)
+            else:
+                item = None
+                if self.min_interval > 0:
+                    wait = self.min_interval - (time.perf_counter() - last_run)
+                    if wait > 0:
+                        time.sleep(wait)
+                last_run = time.perf_counter()
+
+            start = time.perf_counter()
+            try:
+                result = self.process_fn(item)
+            except Exception as e:
+                self.stats.errors += 1
+                logging.error(f"Fehler in Pipeline-Stufe '{self.stage_name}': {e}")
+                continue
+
+            if result is None:
+                if self.input_queue is None:
+                    # Quelle lieferte kein Frame - kurz warten statt Busy-Loop
+                    time.sleep(0.005)
+                continue
+
+            results = result if self.batch_size_fn is not None else (result,)
+            self.stats.record(time.perf_counter() - start, len(results))
+            if self.output_queue is not None and self._running.is_set():
+                for result in results:
+                    self.output_queue.put(result)
+
+    def get_stats(self):
+        """Statistik dieser Stufe.
+
+        Returns:
+            dict: fps, Queue-Tiefe, verworfene Frames, Dauer der letzten Verarbeitung
+        """
+        return {
+            'fps': self.stats.fps(),
+            'processed': self.stats.processed,
+            'errors': self.stats.errors,
+            'last_duration_ms': self.stats.last_duration_ms,
+            'batch_size': self.stats.last_batch_size,
+            'queue_depth': self.input_queue.qsize() if self.input_queue is not None else 0,
+            'dropped': self.input_queue.dropped if self.input_queue is not None else 0,
+        }
+
+
+class FramePipeline(QObject):
+    """Vierstufige Frame-Pipeline: Capture -> Vorverarbeitung -> KI-Erkennung -> Render.
+
+    Die fertigen FramePackets werden ueber das Signal frame_ready an den GUI-Thread
+    uebergeben. Die Render-Stufe legt jedes Frame in einen einzigen Wartplatz und
+    weckt den GUI-Thread nur, wenn er das vorherige Frame bereits abgeholt hat -
+    die Qt-Event-Queue waechst bei einer haengenden GUI also nicht, aeltere
+    wartende Frames werden verworfen (Statistik 'ui').
+
+    Arbeit, die fuer jedes Frame erledigt werden muss (z.B. Zyklus-Statistik),
+    gehoert deshalb in render_fn und nicht in den Slot von frame_ready.
+    """
+
+    frame_ready = pyqtSignal(object)    # FramePacket (wird im GUI-Thread ausgeloest)
+    stats_updated = pyqtSignal(dict)    # {stufe: {fps, queue_depth, dropped, ...}}
+    _ui_wakeup = pyqtSignal()           # Render-Thread -> GUI-Thread: wartendes Frame abholen
+
+    STAGE_NAMES = ('capture', 'preprocess', 'inference', 'render')
+    UI_FRAMES = 2   # Wartplatz plus das gerade im GUI-Thread verarbeitete Frame
+
+    def __init__(self, capture_fn, preprocess_fn, inference_fn, render_fn,
+                 queue_size=1, capture_fps=30, stats_interval=1.0,
+                 batch_size_fn=None, max_batch_size=1, batch_window=0.1, thread_init_fn=None):
+        """
+        Args:
+            capture_fn: Liefert ein Frame (numpy array oder CapturedFrame) oder None
+            preprocess_fn: Verarbeitet ein FramePacket (Helligkeit, Bewegung)
+            inference_fn: Fuehrt die KI-Erkennung auf einem FramePacket aus
+                (mit batch_size_fn: auf einer Liste von FramePackets)
+            render_fn: Zeichnet die Erkennungen in ein FramePacket (laeuft fuer jedes Frame,
+                auch wenn es die GUI nicht mehr erreicht)
+            queue_size (int): Tiefe der Queues zwischen den Stufen
+            capture_fps (float): Maximale Aufnahmerate (0 = unbegrenzt)
+            stats_interval (float): Intervall fuer stats_updated in Sekunden
+            batch_size_fn: Liefert die gewuenschte Batch-Groesse der KI-Stufe (None = kein Batching)
+            max_batch_size (int): Obergrenze der Batch-Groesse (bestimmt die Queue-Tiefe um die KI-Stufe)
+            batch_window (float): Maximale Sammelzeit eines Batches in Sekunden
+            thread_init_fn: Wird mit dem Stufennamen im jeweiligen Stufen-Thread aufgerufen
+        """
+        super().__init__()
+        self.capture_fn = capture_fn
+        self.preprocess_fn = preprocess_fn
+        self.inference_fn = inference_fn
+        self.render_fn = render_fn
+        self.queue_size = queue_size
+        self.capture_fps = capture_fps
+        self.stats_interval = stats_interval
+        self.batch_size_fn = batch_size_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.batch_window = batch_window
+        self.thread_init_fn = thread_init_fn
+
+        self.stages = []
+        self._sequence = 0
+        self._last_stats_emit = 0.0
+        self.running = False
+
+        # Uebergabe an den GUI-Thread: ein Wartplatz, hoechstens ein ausstehendes Wecksignal
+        self._ui_lock = threading.Lock()
+        self._ui_pending = None
+        self._ui_signalled = False
+        self._ui_stats = StageStats()   # Abholungen durch den GUI-Thread (Dauer = Slot von frame_ready)
+        self._ui_dropped = 0
+        self._ui_wakeup.connect(self._deliver_pending)
+
+    def _capture(self, _):
+        frame = self.capture_fn()
+        if frame is None:
+            return None
+        self._sequence += 1
+        if isinstance(frame, CapturedFrame):
+            return FramePacket(self._sequence, frame.frame, frame.timestamp, frame.sequence)
+        return FramePacket(self._sequence, frame)
+
+    def _preprocess(self, packet):
+        self.preprocess_fn(packet)
+        return packet
+
+    def _inference(self, packet):
+        self.inference_fn(packet)
+        return packet
+
+    def _inference_batch(self, packets):
+        self.inference_fn(packets)
+        return packets
+
+    def _batch_queue_size(self):
+        """Queue-Tiefe um die KI-Stufe: ein voller Batch darf nicht verworfen werden."""
+        if self.batch_size_fn is None:
+            return self.queue_size
+        return max(self.queue_size, self.max_batch_size)
+
+    def max_frames_in_flight(self):
+        """Obergrenze gleichzeitig in der Pipeline befindlicher Frames (Queues, Stufen und GUI-Uebergabe)."""
+        batch = self.max_batch_size if self.batch_size_fn is not None else 1
+        return (self.queue_size + 2 * self._batch_queue_size() + batch + len(self.STAGE_NAMES) - 1
+                + self.UI_FRAMES)
+
+    def set_max_batch_size(self, max_batch_size):
+        """Obergrenze der Batch-Groesse aendern (passt die Queues um die KI-Stufe an)."""
+        self.max_batch_size = max(1, int(max_batch_size))
+        if self.running:
+            for stage in self.stages:
+                if stage.stage_name in ('inference', 'render'):
+                    stage.input_queue.set_maxsize(self._batch_queue_size())
+
+    def _render(self, packet):
+        self.render_fn(packet)
+        if self.running:
+            self._offer_to_ui(packet)
+
+        now = time.perf_counter()
+        if now - self._last_stats_emit >= self.stats_interval:
+            self._last_stats_emit = now
+            self.stats_updated.emit(self.get_stats())
+        return packet
+
+    def _offer_to_ui(self, packet):
+        """Frame in den Wartplatz legen (Render-Thread); GUI nur wecken, wenn sie nicht schon geweckt ist."""
+        with self._ui_lock:
+            if self._ui_pending is not None:
+                self._ui_dropped += 1
+            self._ui_pending = packet
+            if self._ui_signalled:
+                return
+            self._ui_signalled = True
+        self._ui_wakeup.emit()
+
+    def _deliver_pending(self):
+        """Wartendes Frame abholen und frame_ready ausloesen (GUI-Thread)."""
+        with self._ui_lock:
+            packet = self._ui_pending
+            self._ui_pending = None
+            # Vor der Verarbeitung zuruecksetzen: ein neues Frame waehrend des Slots weckt erneut
+            self._ui_signalled = False
+        if packet is not None and self.running:
+            start = time.perf_counter()
+            self.frame_ready.emit(packet)
+            with self._ui_lock:
+                self._ui_stats.record(time.perf_counter() - start)
+
+    def _clear_pending(self):
+        with self._ui_lock:
+            self._ui_pending = None
+
+    def start(self):
+        """Alle Stufen starten."""
+        if self.running:
+            return
+
+        queues = [
+            LatestFrameQueue(self.queue_size),
+            LatestFrameQueue(self._batch_queue_size()),
+            LatestFrameQueue(self._batch_queue_size()),
+        ]
+        min_interval = 1.0 / self.capture_fps if self.capture_fps else 0.0
+
+        if self.batch_size_fn is not None:
+            inference_stage = PipelineStage('inference', self._inference_batch, queues[1], queues[2],
+                                            batch_size_fn=self.batch_size_fn, batch_window=self.batch_window,
+                                            thread_init_fn=self.thread_init_fn)
+        else:
+            inference_stage = PipelineStage('inference', self._inference, queues[1], queues[2],
+                                            thread_init_fn=self.thread_init_fn)
+
+        self.stages = [
+            PipelineStage('capture', self._capture, None, queues[0], min_interval=min_interval,
+                          thread_init_fn=self.thread_init_fn),
+            PipelineStage('preprocess', self._preprocess, queues[0], queues[1],
+                          thread_init_fn=self.thread_init_fn),
+            inference_stage,
+            PipelineStage('render', self._render, queues[2], None,
+                          thread_init_fn=self.thread_init_fn),
+        ]
+
+        self._sequence = 0
+        self.running = True
+        for stage in self.stages:
+            stage.start()
+
+        logging.info(f"Frame-Pipeline gestartet ({len(self.stages)} Stufen, Queue-Tiefe {self.queue_size})")
+
+    def stop(self, timeout=2.0):
+        """Alle Stufen stoppen und auf deren Ende warten."""
+        if not self.running:
+            return
+
+        self.running = False
+        for stage in self.stages:
+            stage.stop()
+
+        current = threading.current_thread()
+        for stage in self.stages:
+            if stage is not current and stage.is_alive():
+                stage.join(timeout=timeout)
+                if stage.is_alive():
+                    logging.warning(f"Pipeline-Stufe '{stage.stage_name}' reagiert nicht auf Stopp")
+
+        for stage in self.stages:
+            if stage.input_queue is not None:
+                stage.input_queue.clear()
+        self._clear_pending()
+
+        logging.info("Frame-Pipeline gestoppt")
+
+    def get_stats(self):
+        """Statistiken aller Stufen.
+
+        Returns:
+            dict: {stufenname: {fps, queue_depth, dropped, processed, errors, last_duration_ms, batch_size}},
+                dazu 'ui' mit denselben Schluesseln fuer die Uebergabe an den GUI-Thread
+        """
+        stats = {stage.stage_name: stage.get_stats() for stage in self.stages}
+        with self._ui_lock:
+            stats['ui'] = {
+                'fps': self._ui_stats.fps(),
+                'processed': self._ui_stats.processed,
+                'errors': 0,
+                'last_duration_ms': self._ui_stats.last_duration_ms,
+                'batch_size': 1,
+                'queue_depth': 1 if self._ui_pending is not None else 0,
+                'dropped': self._ui_dropped,
+            }
+        return stats
+
+
+def format_pipeline_stats(stats):
+    """Einzeilige Zusammenfassung von FramePipeline.get_stats() fuer das Log."""
+    return ", ".join(
+        f"{name} {s['fps']:.1f} FPS (Queue {s['queue_depth']}, verworfen {s['dropped']})"
+        for name, s in stats.items()
+    )
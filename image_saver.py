@@ -1,168 +1,777 @@
 """
 Bild-Speicher-Manager - einfach und zuverlaessig
 Speichert Gut- und Schlechtbilder mit Zeitstempel und Dateilimit
+Dateianzahl und Groesse pro Verzeichnis werden in einem In-Memory-Index gefuehrt (kein Verzeichnis-Scan pro Bild)
+Kodierung und Schreiben laufen in einem Writer-Pool (save_* gibt sofort ein Future zurueck)
+Ablage optional in Datums-/Stunden-Shards (z.B. bad_images/2026/10/16/14/) mit Indexdatei pro Shard
 """
 
 import os
 import cv2
+import json
+import time
+import queue
 import logging
-from datetime import datetime
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta
 from pathlib import Path
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp')
+RETENTION_MODES = ('refuse', 'fifo')
+STORAGE_LAYOUTS = ('flat', 'daily', 'hourly')
+IMAGE_FORMATS = {'jpg': '.jpg', 'png': '.png', 'webp': '.webp', 'tiff': '.tiff'}
+WRITE_OVERFLOW_POLICIES = ('drop', 'block')
+
+# TIFF-Kompression LZW (verlustfrei) - Konstante erst ab neueren OpenCV-Versionen vorhanden
+TIFF_COMPRESSION_LZW = 5
+
+
+def get_imwrite_params(image_format, quality=95, png_compression=3):
+    """cv2.imwrite-Parameter fuer ein Bildformat.
+
+    Args:
+        image_format (str): 'jpg', 'png', 'webp' oder 'tiff'
+        quality (int): JPEG/WebP-Qualitaet (0-100)
+        png_compression (int): PNG-Kompressionsstufe (0-9)
+
+    Returns:
+        list: Parameter fuer cv2.imwrite
+    """
+    if image_format == 'jpg':
+        return [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+    if image_format == 'png':
+        return [cv2.IMWRITE_PNG_COMPRESSION, int(png_compression)]
+    if image_format == 'webp':
+        return [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+    if image_format == 'tiff':
+        return [getattr(cv2, 'IMWRITE_TIFF_COMPRESSION', 259), TIFF_COMPRESSION_LZW]
+    return []
+
+
+class ImageWritePool:
+    """Thread-Pool fuer Bildkodierung und Schreiben hinter einer begrenzten Queue.
+
+    OpenCV gibt beim Kodieren den GIL frei, daher genuegen Threads. Jeder Auftrag
+    liefert ein concurrent.futures.Future. Bei voller Queue gilt overflow_policy:
+        'drop'  - Auftrag verwerfen (submit gibt None zurueck)
+        'block' - Aufrufer wartet, bis wieder Platz ist
+    """
+
+    def __init__(self, workers=2, queue_size=16, overflow_policy='drop'):
+        self.overflow_policy = overflow_policy if overflow_policy in WRITE_OVERFLOW_POLICIES else 'drop'
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._stats_lock = threading.Lock()
+
+        # Backpressure-Metriken
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_queue_depth = 0
+        self.last_write_ms = 0.0
+        self._total_write_time = 0.0
+
+        self._workers = []
+        for i in range(max(1, int(workers))):
+            worker = threading.Thread(target=self._worker_loop, name=f"image-writer-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, fn, *args):
+        """Auftrag einreihen.
+
+        Returns:
+            Future oder None wenn die Queue voll war (Policy 'drop')
+        """
+        future = Future()
+        try:
+            if self.overflow_policy == 'block':
+                self._queue.put((future, fn, args))
+            else:
+                self._queue.put_nowait((future, fn, args))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return None
+
+        with self._stats_lock:
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            start = time.perf_counter()
+            try:
+                result = fn(*args)
+            except Exception as e:
+                with self._stats_lock:
+                    self.failed += 1
+                future.set_exception(e)
+                continue
+
+            duration = time.perf_counter() - start
+            with self._stats_lock:
+                self.completed += 1
+                self.last_write_ms = duration * 1000.0
+                self._total_write_time += duration
+            future.set_result(result)
+
+    def get_stats(self):
+        """Backpressure-Metriken des Pools."""
+        with self._stats_lock:
+            return {
+                'workers': len(self._workers),
+                'queue_depth': self._queue.qsize(),
+                'queue_size': self._queue.maxsize,
+                'max_queue_depth': self.max_queue_depth,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'last_write_ms': self.last_write_ms,
+                'avg_write_ms': self._total_write_time / self.completed * 1000.0 if self.completed else 0.0
+            }
+
+    def shutdown(self, timeout=10.0):
+        """Wartende Auftraege abarbeiten und Worker beenden."""
+        for _ in self._workers:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                logging.warning(f"{worker.name} hat wartende Bilder nicht rechtzeitig geschrieben")
+
+
+def get_shard_key(timestamp, layout):
+    """Relativer Shard-Pfad fuer einen Aufnahmezeitpunkt ('' = flaches Verzeichnis)."""
+    if layout == 'hourly':
+        return timestamp.strftime('%Y/%m/%d/%H')
+    if layout == 'daily':
+        return timestamp.strftime('%Y/%m/%d')
+    return ''
+
+
+def _shard_start(shard_key):
+    """Beginn des Zeitraums eines Shards oder None (flaches Verzeichnis/unbekannt)."""
+    parts = shard_key.split('/') if shard_key else []
+    try:
+        values = [int(part) for part in parts]
+        if len(values) == 4:
+            return datetime(values[0], values[1], values[2], values[3])
+        if len(values) == 3:
+            return datetime(values[0], values[1], values[2])
+    except ValueError:
+        pass
+    return None
+
+
+class ImageShard:
+    """Ein Shard (Datums-/Stunden-Verzeichnis) mit seinen Bildern in Schreibreihenfolge."""
+
+    __slots__ = ('key', 'files', 'total_bytes')
+
+    def __init__(self, key):
+        self.key = key
+        self.files = deque()    # (dateipfad, bytes) - aelteste zuerst
+        self.total_bytes = 0
+
+
+class ImageDirectoryIndex:
+    """In-Memory-Index eines Bildverzeichnisses: Anzahl, Bytes und Dateien in Schreibreihenfolge.
+
+    Die Bilder liegen flach oder in Shards (YYYY/MM/DD[/HH], siehe image_storage_layout).
+    Jeder Shard fuehrt zusaetzlich eine Indexdatei (SHARD_INDEX_FILE, JSON Lines) mit
+    Dateiname, Zeitstempel, Zyklus-ID und Klassen-Zusammenfassung je Bild.
+
+    Wird beim Start einmal per os.scandir aufgebaut, bei jedem Speichern/Loeschen
+    fortgeschrieben und periodisch im Hintergrund mit dem Dateisystem abgeglichen
+    (extern geloeschte oder hinzugefuegte Dateien).
+    """
+
+    SHARD_INDEX_FILE = 'index.jsonl'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.count = 0
+        self.total_bytes = 0
+        self.pending = 0        # Reservierte Plaetze fuer Bilder in der Writer-Queue
+        self._shards = {}       # Shard-Key -> ImageShard, aelteste zuerst
+        self._lock = threading.Lock()
+        self._index_file_lock = threading.Lock()
+
+        # Waehrend eines Abgleichs geaenderte Dateien (Scan laeuft ausserhalb des Locks)
+        self._reconciling = False
+        self._added_during_scan = []
+        self._removed_during_scan = set()
+
+    @property
+    def shard_count(self):
+        return len(self._shards)
+
+    def shard_key_for_path(self, path):
+        """Shard-Key aus dem Dateipfad ableiten."""
+        relative = os.path.relpath(os.path.dirname(path), self.directory)
+        return '' if relative == '.' else relative.replace(os.sep, '/')
+
+    def _scan_directory(self, path, entries):
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+
+    def _scan(self):
+        """Verzeichnis inkl. aller Shards einlesen.
+
+        Returns:
+            dict: Shard-Key -> ImageShard (Shards und Dateien chronologisch sortiert)
+        """
+        shards = {}
+        if not os.path.isdir(self.directory):
+            return shards
+
+        # Flache Dateien und Shard-Verzeichnisse (nur numerische Ebenen YYYY/MM/DD/HH)
+        pending_dirs = [self.directory]
+        while pending_dirs:
+            current = pending_dirs.pop()
+            entries = []
+            self._scan_directory(current, entries)
+            if entries:
+                entries.sort()
+                shard = ImageShard(self.shard_key_for_path(os.path.join(current, 'x')))
+                for _, path, size in entries:
+                    shard.files.append((path, size))
+                    shard.total_bytes += size
+                shards[shard.key] = shard
+
+            with os.scandir(current) as iterator:
+                for entry in iterator:
+                    if entry.is_dir() and entry.name.isdigit():
+                        pending_dirs.append(entry.path)
+
+        return {key: shards[key] for key in sorted(shards)}
+
+    def _set_shards(self, shards):
+        self._shards = shards
+        self.count = sum(len(shard.files) for shard in shards.values())
+        self.total_bytes = sum(shard.total_bytes for shard in shards.values())
+
+    def seed(self):
+        """Index einmalig aus dem Verzeichnis aufbauen."""
+        try:
+            shards = self._scan()
+        except Exception as e:
+            logging.error(f"Fehler beim Einlesen von {self.directory}: {e}")
+            shards = {}
+
+        with self._lock:
+            self._set_shards(shards)
+
+    def reconcile(self):
+        """Index mit dem Dateisystem abgleichen (Hintergrund-Thread)."""
+        with self._lock:
+            self._reconciling = True
+            self._added_during_scan = []
+            self._removed_during_scan = set()
+
+        try:
+            shards = self._scan()
+        except Exception as e:
+            logging.error(f"Fehler beim Abgleich von {self.directory}: {e}")
+            with self._lock:
+                self._reconciling = False
+            return
+
+        with self._lock:
+            # Waehrend des Scans geloeschte Dateien entfernen, neu geschriebene ergaenzen
+            for shard in shards.values():
+                if self._removed_during_scan:
+                    kept = [entry for entry in shard.files if entry[0] not in self._removed_during_scan]
+                    shard.files = deque(kept)
+                    shard.total_bytes = sum(size for _, size in kept)
+            known = {path for shard in shards.values() for path, _ in shard.files}
+            for path, size in self._added_during_scan:
+                if path not in known:
+                    key = self.shard_key_for_path(path)
+                    shard = shards.setdefault(key, ImageShard(key))
+                    shard.files.append((path, size))
+                    shard.total_bytes += size
+            shards = {key: shards[key] for key in sorted(shards) if shards[key].files}
+
+            old_count = self.count
+            self._set_shards(shards)
+            self._reconciling = False
+
+        if old_count != self.count:
+            logging.info(f"Bild-Index abgeglichen: {self.directory} {old_count} -> {self.count} Dateien")
+
+    def reserve(self):
+        """Platz fuer ein noch zu schreibendes Bild reservieren."""
+        with self._lock:
+            self.pending += 1
+
+    def release(self):
+        """Reservierung ohne geschriebenes Bild aufheben."""
+        with self._lock:
+            self.pending = max(0, self.pending - 1)
+
+    def add(self, path, size, reserved=False):
+        """Neu gespeicherte Datei eintragen (reserved: Reservierung einloesen)."""
+        key = self.shard_key_for_path(path)
+        with self._lock:
+            if reserved:
+                self.pending = max(0, self.pending - 1)
+            shard = self._shards.get(key)
+            if shard is None:
+                shard = self._shards[key] = ImageShard(key)
+            shard.files.append((path, size))
+            shard.total_bytes += size
+            self.count += 1
+            self.total_bytes += size
+            if self._reconciling:
+                self._added_during_scan.append((path, size))
+
+    def pop_oldest(self):
+        """Aelteste Datei austragen.
+
+        Returns:
+            tuple: (dateipfad, bytes, leerer_shard_key oder None) oder None wenn leer
+        """
+        with self._lock:
+            while self._shards:
+                key = next(iter(self._shards))
+                shard = self._shards[key]
+                if not shard.files:
+                    del self._shards[key]
+                    continue
+
+                path, size = shard.files.popleft()
+                shard.total_bytes -= size
+                self.count -= 1
+                self.total_bytes -= size
+                if self._reconciling:
+                    self._removed_during_scan.add(path)
+
+                emptied = None
+                if not shard.files:
+                    del self._shards[key]
+                    emptied = key
+                return path, size, emptied
+            return None
+
+    def append_shard_record(self, path, record):
+        """Eintrag in die Indexdatei des Shards einer Datei anhaengen."""
+        index_path = os.path.join(os.path.dirname(path), self.SHARD_INDEX_FILE)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._index_file_lock:
+            with open(index_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def remove_shard(self, key):
+        """Leeren Shard samt Indexdatei und leeren Eltern-Verzeichnissen entfernen."""
+        if not key:
+            return
+        shard_path = os.path.join(self.directory, *key.split('/'))
+        with self._index_file_lock:
+            try:
+                index_path = os.path.join(shard_path, self.SHARD_INDEX_FILE)
+                if os.path.exists(index_path):
+                    os.remove(index_path)
+                current = shard_path
+                while os.path.abspath(current) != os.path.abspath(self.directory) and not os.listdir(current):
+                    os.rmdir(current)
+                    current = os.path.dirname(current)
+            except OSError as e:
+                logging.debug(f"Shard {shard_path} nicht entfernt: {e}")
+
+    def iter_records(self, start=None, end=None):
+        """Eintraege der Shard-Indexdateien im Zeitraum [start, end) liefern.
+
+        Shards ausserhalb des Zeitraums werden anhand ihres Pfads uebersprungen.
+        """
+        with self._lock:
+            keys = [key for key in self._shards if key]
+
+        for key in keys:
+            shard_start = _shard_start(key)
+            if shard_start is not None:
+                shard_end = shard_start + (timedelta(hours=1) if key.count('/') == 3 else timedelta(days=1))
+                if (start and shard_end <= start) or (end and shard_start >= end):
+                    continue
+
+            shard_path = os.path.join(self.directory, *key.split('/'))
+            index_path = os.path.join(shard_path, self.SHARD_INDEX_FILE)
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        timestamp = datetime.fromisoformat(record['timestamp'])
+                        if (start and timestamp < start) or (end and timestamp >= end):
+                            continue
+                        record['path'] = os.path.join(shard_path, record['filename'])
+                        yield record
+            except FileNotFoundError:
+                continue
+
+
 class ImageSaver:
     """Einfacher Image-Saver fuer Gut- und Schlechtbilder."""
-    
+
+    # Einstellungen, die update_settings() auswertet (Abonnement der Einstellungs-Ueberwachung)
+    SETTINGS_KEYS = (
+        'bad_images_directory', 'good_images_directory', 'save_bad_images', 'save_good_images',
+        'max_image_files', 'image_retention_mode', 'image_index_reconcile_interval',
+        'image_storage_layout', 'image_format', 'image_quality', 'image_png_compression',
+    )
+
     def __init__(self, settings):
         self.settings = settings
-        
+
         # Verzeichnisse aus Settings
         self.bad_images_dir = self.settings.get('bad_images_directory', 'bad_images')
         self.good_images_dir = self.settings.get('good_images_directory', 'good_images')
-        
+
         # Speicher-Optionen
         self.save_bad_images = self.settings.get('save_bad_images', False)
         self.save_good_images = self.settings.get('save_good_images', False)
         self.max_images_per_dir = self.settings.get('max_image_files', 100000)
-        
-        # Verzeichnisse erstellen
+        self.retention_mode = self._validate_retention_mode(self.settings.get('image_retention_mode', 'refuse'))
+        self.reconcile_interval = self.settings.get('image_index_reconcile_interval', 300.0)
+        self.storage_layout = self._validate_storage_layout(self.settings.get('image_storage_layout', 'hourly'))
+        self._load_codec_settings(self.settings)
+
+        # Writer-Pool fuer Kodierung und Schreiben (Groesse wird beim Start festgelegt)
+        self.write_pool = ImageWritePool(
+            workers=self.settings.get('image_write_workers', 2),
+            queue_size=self.settings.get('image_write_queue_size', 16),
+            overflow_policy=self.settings.get('image_write_overflow_policy', 'drop')
+        )
+
+        # Eindeutige Dateinamen bei mehreren Bildern pro Millisekunde
+        self._last_filename_key = None
+        self._filename_sequence = 0
+
+        # Verzeichnis-Indizes (Pfad -> ImageDirectoryIndex)
+        self._indices = {}
+        self._indices_lock = threading.Lock()
+
+        # Verzeichnisse erstellen und Indizes aufbauen
         self._ensure_directories()
-        
-        logging.info(f"ImageSaver initialisiert - Bad: {self.save_bad_images}, Good: {self.save_good_images}")
-    
+
+        # Periodischer Abgleich der Indizes mit dem Dateisystem
+        self._reconcile_stop = threading.Event()
+        self._reconcile_thread = threading.Thread(target=self._reconcile_loop, name="image-index-reconcile", daemon=True)
+        self._reconcile_thread.start()
+
+        logging.info(f"ImageSaver initialisiert - Bad: {self.save_bad_images}, Good: {self.save_good_images}, "
+                     f"Retention: {self.retention_mode}")
+
+    def _load_codec_settings(self, settings):
+        """Bildformat und Qualitaet aus Settings uebernehmen."""
+        image_format = settings.get('image_format', getattr(self, 'image_format', 'jpg'))
+        if image_format not in IMAGE_FORMATS:
+            logging.warning(f"Unbekanntes Bildformat '{image_format}' - verwende 'jpg'")
+            image_format = 'jpg'
+        self.image_format = image_format
+        self.image_quality = settings.get('image_quality', getattr(self, 'image_quality', 95))
+        self.image_png_compression = settings.get('image_png_compression', getattr(self, 'image_png_compression', 3))
+
+    def _validate_storage_layout(self, layout):
+        if layout not in STORAGE_LAYOUTS:
+            logging.warning(f"Unbekanntes Ablage-Layout '{layout}' - verwende 'hourly'")
+            return 'hourly'
+        return layout
+
+    def _validate_retention_mode(self, mode):
+        if mode not in RETENTION_MODES:
+            logging.warning(f"Unbekannter Retention-Modus '{mode}' - verwende 'refuse'")
+            return 'refuse'
+        return mode
+
     def _ensure_directories(self):
         """Stelle sicher, dass die Verzeichnisse existieren."""
         try:
             if self.save_bad_images and self.bad_images_dir:
                 Path(self.bad_images_dir).mkdir(parents=True, exist_ok=True)
+                self._get_index(self.bad_images_dir)
                 logging.info(f"Schlechtbild-Verzeichnis: {self.bad_images_dir}")
-            
+
             if self.save_good_images and self.good_images_dir:
                 Path(self.good_images_dir).mkdir(parents=True, exist_ok=True)
+                self._get_index(self.good_images_dir)
                 logging.info(f"Gutbild-Verzeichnis: {self.good_images_dir}")
-                
+
         except Exception as e:
             logging.error(f"Fehler beim Erstellen der Verzeichnisse: {e}")
-    
+
+    def _get_index(self, directory):
+        """Index eines Verzeichnisses holen (beim ersten Zugriff einmalig aufbauen)."""
+        with self._indices_lock:
+            index = self._indices.get(directory)
+            if index is None:
+                index = ImageDirectoryIndex(directory)
+                index.seed()
+                self._indices[directory] = index
+                logging.info(f"Bild-Index aufgebaut: {directory} ({index.count} Dateien, "
+                             f"{index.total_bytes / (1024 * 1024):.1f} MB)")
+            return index
+
+    def _reconcile_loop(self):
+        """Hintergrund-Thread: Indizes periodisch mit dem Dateisystem abgleichen."""
+        while not self._reconcile_stop.wait(max(1.0, self.reconcile_interval)):
+            with self._indices_lock:
+                indices = list(self._indices.values())
+            for index in indices:
+                index.reconcile()
+
     def _count_images_in_directory(self, directory):
-        """Zaehle Bilder in Verzeichnis."""
+        """Zaehle Bilder in Verzeichnis (aus dem Index, ohne Verzeichnis-Scan)."""
         try:
             if not os.path.exists(directory):
                 return 0
-            
-            # Zaehle nur Bilddateien
-            image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
-            count = 0
-            
-            for file in os.listdir(directory):
-                if any(file.lower().endswith(ext) for ext in image_extensions):
-                    count += 1
-            
-            return count
-            
+            return self._get_index(directory).count
+
         except Exception as e:
             logging.error(f"Fehler beim Zaehlen der Bilder in {directory}: {e}")
             return 0
-    
-    def _generate_timestamp_filename(self, prefix, extension='.jpg'):
-        """Erzeuge Dateiname mit Zeitstempel."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Millisekunden
+
+    def _make_room(self, index):
+        """FIFO-Retention: aelteste Bilder loeschen bis wieder Platz ist.
+
+        Returns:
+            bool: True wenn Platz fuer ein weiteres Bild ist
+        """
+        while index.count + index.pending >= self.max_images_per_dir:
+            oldest = index.pop_oldest()
+            if oldest is None:
+                return False
+            path, _, emptied_shard = oldest
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Fehler beim Loeschen von {path}: {e}")
+            if emptied_shard:
+                index.remove_shard(emptied_shard)
+        return True
+
+    def _generate_timestamp_filename(self, prefix, extension='.jpg', now=None):
+        """Erzeuge Dateiname mit Zeitstempel (eindeutig auch innerhalb derselben Millisekunde)."""
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Millisekunden
+        key = (prefix, timestamp)
+        if key == self._last_filename_key:
+            self._filename_sequence += 1
+            return f"{prefix}_{timestamp}_{self._filename_sequence}{extension}"
+        self._last_filename_key = key
+        self._filename_sequence = 0
         return f"{prefix}_{timestamp}{extension}"
-    
-    def save_bad_image(self, frame, detection_summary=None):
-        """Speichere Schlechtbild (ohne Bounding Boxes)."""
-        if not self.save_bad_images or not self.bad_images_dir or frame is None:
-            return None
-        
+
+    def _completed_future(self, result):
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def _summarize_detections(self, detection_summary):
+        """Klassen-Zusammenfassung fuer den Shard-Index (ohne Confidence-Listen)."""
+        if not detection_summary:
+            return {}
+        return {
+            class_name: {
+                'class_id': stats.get('class_id'),
+                'count': stats.get('count', 0),
+                'max_confidence': stats.get('max_confidence'),
+            }
+            for class_name, stats in detection_summary.items()
+        }
+
+    def _save_image(self, frame, directory, prefix, label, detection_summary=None, cycle_id=None):
+        """Bild zum Schreiben einreihen - Dateilimit ueber den Index pruefen.
+
+        Das Frame wird nicht kopiert und darf nach dem Aufruf nicht mehr veraendert werden.
+        Schreibgeschuetzte Kamera-Frames (Puffer-Pool) werden kopiert, da die Kamera
+        ihren Puffer wiederverwendet, bevor der Writer-Thread schreibt.
+
+        Args:
+            label (str): 'Schlechtbild' oder 'Gutbild' (fuer Log-Meldungen)
+
+        Returns:
+            Future: Ergebnis ist der Dateipfad, "DIRECTORY_FULL", "QUEUE_FULL" oder None bei Fehler
+        """
         try:
-            # Pruefe Dateilimit
-            current_count = self._count_images_in_directory(self.bad_images_dir)
-            if current_count >= self.max_images_per_dir:
-                logging.warning(f"Schlechtbild-Verzeichnis voll ({current_count} Dateien) - speichere nicht")
-                return "DIRECTORY_FULL"
-            
-            # Dateiname mit Zeitstempel generieren
-            filename = self._generate_timestamp_filename("bad_part")
-            filepath = os.path.join(self.bad_images_dir, filename)
-            
-            # Bild speichern (ohne Bounding Boxes)
-            success = cv2.imwrite(filepath, frame)
-            
-            if success:
-                logging.info(f"Schlechtbild gespeichert: {filename}")
-                return filepath
-            else:
-                logging.error(f"Fehler beim Speichern des Schlechtbilds: {filename}")
-                return None
-                
+            # Pruefe Dateilimit (inkl. noch nicht geschriebener Bilder)
+            index = self._get_index(directory)
+            if index.count + index.pending >= self.max_images_per_dir:
+                if self.retention_mode != 'fifo' or not self._make_room(index):
+                    logging.warning(f"{label}-Verzeichnis voll ({index.count} Dateien) - speichere nicht")
+                    return self._completed_future("DIRECTORY_FULL")
+
+            # Dateiname und Shard mit Zeitstempel der Aufnahme generieren
+            now = datetime.now()
+            filename = self._generate_timestamp_filename(prefix, IMAGE_FORMATS[self.image_format], now)
+            shard_key = get_shard_key(now, self.storage_layout)
+            filepath = os.path.join(directory, *shard_key.split('/'), filename) if shard_key else os.path.join(directory, filename)
+            params = get_imwrite_params(self.image_format, self.image_quality, self.image_png_compression)
+
+            record = {
+                'filename': filename,
+                'timestamp': now.isoformat(),
+                'cycle_id': cycle_id,
+                'detections': self._summarize_detections(detection_summary),
+            }
+
+            if not frame.flags.writeable:
+                frame = frame.copy()
+
+            index.reserve()
+            future = self.write_pool.submit(self._write_image, frame, filepath, params, index, label, record)
+            if future is None:
+                index.release()
+                logging.warning(f"Bild-Writer ausgelastet - {label} verworfen: {filename}")
+                return self._completed_future("QUEUE_FULL")
+            return future
+
         except Exception as e:
-            logging.error(f"Fehler beim Speichern des Schlechtbilds: {e}")
-            return None
-    
-    def save_good_image(self, frame, detection_summary=None):
-        """Speichere Gutbild (ohne Bounding Boxes)."""
-        if not self.save_good_images or not self.good_images_dir or frame is None:
-            return None
-        
+            logging.error(f"Fehler beim Speichern des {label}s: {e}")
+            return self._completed_future(None)
+
+    def _write_image(self, frame, filepath, params, index, label, record):
+        """Bild kodieren und schreiben, Shard-Index fortschreiben (Writer-Thread)."""
+        filename = os.path.basename(filepath)
         try:
-            # Pruefe Dateilimit
-            current_count = self._count_images_in_directory(self.good_images_dir)
-            if current_count >= self.max_images_per_dir:
-                logging.warning(f"Gutbild-Verzeichnis voll ({current_count} Dateien) - speichere nicht")
-                return "DIRECTORY_FULL"
-            
-            # Dateiname mit Zeitstempel generieren
-            filename = self._generate_timestamp_filename("good_part")
-            filepath = os.path.join(self.good_images_dir, filename)
-            
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
             # Bild speichern (ohne Bounding Boxes)
-            success = cv2.imwrite(filepath, frame)
-            
+            success = cv2.imwrite(filepath, frame, params)
+
             if success:
-                logging.info(f"Gutbild gespeichert: {filename}")
+                size = os.path.getsize(filepath)
+                index.add(filepath, size, reserved=True)
+                if self.storage_layout != 'flat':
+                    record['size'] = size
+                    index.append_shard_record(filepath, record)
+                logging.info(f"{label} gespeichert: {filename}")
                 return filepath
             else:
-                logging.error(f"Fehler beim Speichern des Gutbilds: {filename}")
+                index.release()
+                logging.error(f"Fehler beim Speichern des {label}s: {filename}")
                 return None
-                
+
         except Exception as e:
-            logging.error(f"Fehler beim Speichern des Gutbilds: {e}")
+            index.release()
+            logging.error(f"Fehler beim Speichern des {label}s: {e}")
             return None
-    
+
+    def save_bad_image(self, frame, detection_summary=None, cycle_id=None):
+        """Speichere Schlechtbild (ohne Bounding Boxes) - asynchron.
+
+        Returns:
+            Future mit Dateipfad (siehe _save_image) oder None wenn Speichern deaktiviert
+        """
+        if not self.save_bad_images or not self.bad_images_dir or frame is None:
+            return None
+
+        return self._save_image(frame, self.bad_images_dir, "bad_part", "Schlechtbild", detection_summary, cycle_id)
+
+    def save_good_image(self, frame, detection_summary=None, cycle_id=None):
+        """Speichere Gutbild (ohne Bounding Boxes) - asynchron.
+
+        Returns:
+            Future mit Dateipfad (siehe _save_image) oder None wenn Speichern deaktiviert
+        """
+        if not self.save_good_images or not self.good_images_dir or frame is None:
+            return None
+
+        return self._save_image(frame, self.good_images_dir, "good_part", "Gutbild", detection_summary, cycle_id)
+
     def update_settings(self, new_settings):
         """Einstellungen aktualisieren."""
         old_bad_dir = self.bad_images_dir
         old_good_dir = self.good_images_dir
-        
+        old_save_flags = (self.save_bad_images, self.save_good_images)
+
         # Neue Einstellungen laden
         self.bad_images_dir = new_settings.get('bad_images_directory', self.bad_images_dir)
         self.good_images_dir = new_settings.get('good_images_directory', self.good_images_dir)
         self.save_bad_images = new_settings.get('save_bad_images', self.save_bad_images)
         self.save_good_images = new_settings.get('save_good_images', self.save_good_images)
         self.max_images_per_dir = new_settings.get('max_image_files', self.max_images_per_dir)
-        
+        self.retention_mode = self._validate_retention_mode(
+            new_settings.get('image_retention_mode', self.retention_mode))
+        self.reconcile_interval = new_settings.get('image_index_reconcile_interval', self.reconcile_interval)
+        self.storage_layout = self._validate_storage_layout(
+            new_settings.get('image_storage_layout', self.storage_layout))
+        self._load_codec_settings(new_settings)
+
         # Verzeichnisse neu erstellen wenn geaendert
         if (old_bad_dir != self.bad_images_dir or old_good_dir != self.good_images_dir):
             self._ensure_directories()
             logging.info("Bild-Verzeichnisse aktualisiert")
-    
+        elif old_save_flags != (self.save_bad_images, self.save_good_images):
+            self._ensure_directories()
+
     def get_directory_stats(self):
         """Statistiken der Verzeichnisse."""
         stats = {}
-        
-        if self.save_bad_images and self.bad_images_dir:
-            stats['bad_images'] = {
-                'directory': self.bad_images_dir,
-                'count': self._count_images_in_directory(self.bad_images_dir),
-                'max': self.max_images_per_dir,
-                'enabled': self.save_bad_images
-            }
-        
-        if self.save_good_images and self.good_images_dir:
-            stats['good_images'] = {
-                'directory': self.good_images_dir,
-                'count': self._count_images_in_directory(self.good_images_dir),
-                'max': self.max_images_per_dir,
-                'enabled': self.save_good_images
-            }
-        
-        return stats
\ No newline at end of file
+
+        for key, directory, enabled in (('bad_images', self.bad_images_dir, self.save_bad_images),
+                                        ('good_images', self.good_images_dir, self.save_good_images)):
+            if enabled and directory:
+                index = self._get_index(directory)
+                stats[key] = {
+                    'directory': directory,
+                    'count': index.count,
+                    'pending': index.pending,
+                    'shards': index.shard_count,
+                    'layout': self.storage_layout,
+                    'size_mb': index.total_bytes / (1024 * 1024),
+                    'max': self.max_images_per_dir,
+                    'retention_mode': self.retention_mode,
+                    'enabled': enabled
+                }
+
+        return stats
+
+    def find_images(self, bad=True, start=None, end=None):
+        """Gespeicherte Bilder im Zeitraum ueber die Shard-Indexdateien suchen.
+
+        Args:
+            bad (bool): Schlechtbilder (True) oder Gutbilder (False)
+            start, end (datetime): Zeitraum [start, end), None = offen
+
+        Returns:
+            list: Eintraege (filename, timestamp, cycle_id, detections, size, path)
+        """
+        directory = self.bad_images_dir if bad else self.good_images_dir
+        if not directory or not os.path.isdir(directory):
+            return []
+
+        # Per FIFO geloeschte Bilder stehen weiterhin in der Indexdatei ihres Shards
+        return [record for record in self._get_index(directory).iter_records(start, end)
+                if os.path.exists(record['path'])]
+
+    def get_write_stats(self):
+        """Backpressure-Metriken des Writer-Pools."""
+        stats = self.write_pool.get_stats()
+        stats['image_format'] = self.image_format
+        return stats
+
+    def close(self, timeout=10.0):
+        """Wartende Bilder schreiben, Writer-Pool und Hintergrund-Abgleich beenden."""
+        self.write_pool.shutdown(timeout)
+        self._reconcile_stop.set()
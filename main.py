@@ -5,6 +5,7 @@ import sys
 import os
 import logging
 import time
+import threading
 import cv2
 import numpy as np
 from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QMessageBox
@@ -12,7 +13,7 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 
 # Eigene Module
-from detection_engine import DetectionEngine
+from detection_engine import DetectionEngine, as_detection_array
 from camera_manager import CameraManager
 
 from camera_config_manager import CameraConfigManager
@@ -22,6 +23,15 @@ from user_manager import UserManager
 from modbus_manager import ModbusManager
 from image_saver import ImageSaver
 from detection_logger import DetectionLogger
+from frame_pipeline import FramePipeline, format_pipeline_stats
+from frame_features import FrameFeatureExtractor
+from model_loader import ModelLoader
+from resource_manager import ResourceManager
+from display_renderer import DisplayRenderer
+from cycle_statistics import CycleStatistics
+from settings_watcher import SettingsWatcher
+from cycle_evaluator import CycleEvaluator, REASON_COUNT_MISMATCH
+from detection_dataset_manager import DetectionDatasetManager
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -41,6 +51,8 @@ class DetectionApp(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        self.startup_time = time.time()   # Kaltstart-Messung bis zur ersten Erkennung
+        self.first_detection_logged = False
         self.setWindowTitle("KI-Objekterkennung - VEREINFACHT")
         self.setWindowState(Qt.WindowState.WindowFullScreen)
         
@@ -48,11 +60,34 @@ class DetectionApp(QMainWindow):
         self.settings = Settings()
         self.user_manager = UserManager()
         
+        # Thread-Pools begrenzen und GUI-Thread auf seine Kerne legen (vor Modell und Pipeline)
+        self.resource_manager = ResourceManager(self.settings)
+        self.resource_manager.apply_global()
+        self.resource_manager.pin_current_thread('ui')
+        
         # Kamera und KI
         self.camera_config_manager = CameraConfigManager()
-        self.camera_manager = CameraManager(self.camera_config_manager)
+        self.camera_manager = CameraManager(self.camera_config_manager,
+                                            thread_init_fn=self.resource_manager.pin_current_thread)
         self.detection_engine = DetectionEngine()
         
+        # Live-Anzeige: Verkleinern und Boxen zeichnen in der Render-Stufe, eigene Anzeigerate
+        self.display_renderer = DisplayRenderer(
+            self.detection_engine,
+            max_fps=self.settings.get('display_max_fps', 15)
+        )
+        
+        # Modell-Laden im Hintergrund (inkl. Aufwärmen)
+        self.model_loader = ModelLoader(self.detection_engine,
+                                        thread_init_fn=self.resource_manager.pin_current_thread)
+        self.model_loader.progress.connect(lambda message: self.ui.show_status(message, "warning"))
+        self.model_loader.finished.connect(self.on_model_loaded)
+        self._model_load_reason = None
+        self._model_load_variant = None
+        
+        # Detection-Datensätze (Modell inkl. aktiver Modell-Variante, Kamera)
+        self.dataset_manager = DetectionDatasetManager()
+        
         # EINFACHER MODBUS-Manager
         self.modbus_manager = ModbusManager(self.settings)
         
@@ -93,16 +128,40 @@ class DetectionApp(QMainWindow):
         self.countdown_timer.timeout.connect(self.update_status_countdown)
         
         # Statistiken
-        self.last_cycle_detections = {}
+        # Zyklus-Statistik wird in der Render-Stufe fortgeschrieben, im GUI-Thread zurückgesetzt und ausgewertet
+        self.cycle_lock = threading.Lock()
+        self.last_cycle_detections = CycleStatistics()
+        self.cycle_evaluator = CycleEvaluator.from_settings(self.settings)
         self.current_frame_detections = []
         self.cycle_image_count = 0
-        
-        # Timer für Frame-Updates
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.process_frame)
-        
-        # Motion Detection
-        self.bg_subtractor = None
+        self.cycle_id = None              # ID des aktuellen Erkennungszyklus (Start-Zeitstempel)
+        self.last_frame = None
+        
+        # Frame-Pipeline (Capture, Vorverarbeitung, KI, Render in eigenen Threads)
+        self.frame_pipeline = FramePipeline(
+            capture_fn=self.camera_manager.wait_next,
+            preprocess_fn=self.preprocess_frame,
+            inference_fn=self.run_inference,
+            render_fn=self.render_frame,
+            queue_size=self.settings.get('pipeline_queue_size', 1),
+            capture_fps=self.settings.get('pipeline_capture_fps', 30),
+            batch_size_fn=self.get_inference_batch_size,
+            max_batch_size=self.settings.get('inference_batch_max', 8),
+            batch_window=self.settings.get('inference_batch_window', 0.1),
+            thread_init_fn=self.resource_manager.pin_current_thread
+        )
+        self.detection_engine.batch_sizer.max_batch_size = max(1, int(self.settings.get('inference_batch_max', 8)))
+        self.configure_camera_frames()
+        self.frame_pipeline.frame_ready.connect(self.process_frame)
+        self.frame_pipeline.stats_updated.connect(self.on_pipeline_stats)
+        self.pipeline_stats = {}
+        self.camera_stats = {}
+        
+        # Motion Detection (gemeinsame Vorverarbeitung: Graubild, Helligkeit, Vordergrund-Maske)
+        self.feature_extractor = FrameFeatureExtractor(
+            pyramid_level=self.settings.get('motion_pyramid_level', 2),
+            roi=self.settings.get('motion_roi', {})
+        )
         self.motion_history = []
         self.motion_stable_count = 0
         self.no_motion_stable_count = 0
@@ -116,10 +175,10 @@ class DetectionApp(QMainWindow):
         self.high_brightness_start = None
         self.brightness_auto_stop_active = False
         
-        # Einstellungen überwachen
-        self.settings_timer = QTimer()
-        self.settings_timer.timeout.connect(self.check_settings_changes)
-        self.settings_timer.start(2000)
+        # Einstellungen überwachen (Dateisystem-Ereignisse, nur betroffene Komponenten aktualisieren)
+        self.settings_watcher = SettingsWatcher(self.settings, parent=self)
+        self.setup_settings_subscriptions()
+        self.settings_watcher.start()
         
         # EINFACHER Modbus-Status-Check
         self.modbus_check_timer = QTimer()
@@ -135,6 +194,7 @@ class DetectionApp(QMainWindow):
         # Log Application Start
         self.detection_logger.log_system_event('START', 'INFO', 'DetectionApp erfolgreich gestartet', {
             'model_loaded': self.detection_engine.model_loaded,
+            'model_loading': self.model_loader.loading,
             'camera_ready': self.camera_manager.camera_ready,
             'modbus_connected': self.modbus_manager.connected
         })
@@ -290,11 +350,11 @@ class DetectionApp(QMainWindow):
         logging.info("Schnelles Beenden eingeleitet...")
         
         try:
-            # Timer stoppen
-            if hasattr(self, 'update_timer'):
-                self.update_timer.stop()
-            if hasattr(self, 'settings_timer'):
-                self.settings_timer.stop()
+            # Pipeline und Timer stoppen
+            if hasattr(self, 'frame_pipeline'):
+                self.frame_pipeline.stop()
+            if hasattr(self, 'settings_watcher'):
+                self.settings_watcher.stop()
             if hasattr(self, 'modbus_check_timer'):
                 self.modbus_check_timer.stop()
             if hasattr(self, 'countdown_timer'):
@@ -322,6 +382,9 @@ class DetectionApp(QMainWindow):
             if hasattr(self, 'detection_logger'):
                 self.detection_logger.close()
             
+            # Bild-Index-Abgleich beenden
+            self.image_saver.close()
+            
             logging.info("Anwendung wird beendet")
             QApplication.quit()
             
@@ -337,8 +400,125 @@ class DetectionApp(QMainWindow):
                 class_colors[int(class_id)] = assignment['color']
         return class_colors
 
+    def load_model_into_engine(self, model_path, reason='manual', backend=None, variant=None):
+        """Modell mit dem eingestellten Backend im Hintergrund laden und aufwärmen.
+        
+        Das Ergebnis kommt über on_model_loaded.
+        
+        Args:
+            model_path (str): Modelldatei
+            reason (str): 'auto' (Start), 'manual' (Benutzer), 'dataset' (Datensatz)
+                oder 'reload' (Einstellungsänderung)
+            backend (str): Backend der Modell-Variante (None = eingestelltes Backend)
+            variant (str): Name der Modell-Variante (nur für Status und Log)
+            
+        Returns:
+            bool: False wenn bereits ein Modell geladen wird
+        """
+        if self.model_loader.loading:
+            return False
+        self._model_load_reason = reason
+        self._model_load_variant = variant
+        return self.model_loader.load(
+            model_path,
+            backend=backend or self.settings.get('inference_backend', 'pytorch'),
+            imgsz=self.settings.get('inference_imgsz', 0) or None,
+            warmup_runs=self.settings.get('model_warmup_runs', 3),
+            warmup_shape=self.get_warmup_shape()
+        )
+
+    def get_warmup_shape(self):
+        """Kamera-Auflösung (Höhe, Breite) für die Dummy-Inferenzen, sonst None."""
+        if self.last_frame is not None:
+            return self.last_frame.shape[:2]
+        try:
+            resolution = self.camera_manager.get_camera_info().get('resolution')
+            if resolution:
+                width, height = (int(value) for value in resolution.split('x'))
+                if width > 0 and height > 0:
+                    return height, width
+        except Exception:
+            pass
+        return None
+
+    def on_model_loaded(self, success, model_path, timings):
+        """Ergebnis des Hintergrund-Ladens übernehmen (GUI-Thread)."""
+        reason = self._model_load_reason
+        variant = self._model_load_variant
+        
+        if success:
+            self.apply_class_settings_to_engine()
+            self.ui.update_model_status(model_path)
+            
+            event = {'auto': 'MODEL_AUTO_LOADED', 'manual': 'MODEL_LOADED',
+                     'dataset': 'MODEL_LOADED'}.get(reason, 'MODEL_RELOADED')
+            self.detection_logger.log_system_event(event, 'SUCCESS',
+                f'Modell geladen: {os.path.basename(model_path)}', {
+                    'model_path': model_path,
+                    'model_variant': variant,
+                    'class_names': list(self.detection_engine.class_names.values()),
+                    'load_timings': timings,
+                    'seconds_since_start': round(time.time() - self.startup_time, 3)
+                })
+            
+            if reason in ('manual', 'dataset'):
+                self.settings.set('last_model', model_path)
+                self.settings.save()
+            
+            if self.camera_manager.camera_ready:
+                if self.modbus_manager.connected:
+                    self.ui.show_status("Bereit - Alle Komponenten geladen", "ready")
+                else:
+                    self.ui.show_status("Warte auf Modbus-Verbindung", "warning")
+            else:
+                self.ui.show_status("Modell geladen - Kamera auswählen", "success")
+        else:
+            self.ui.show_status("Fehler beim Laden", "error")
+            
+            # Log Model Load Error
+            self.detection_logger.log_system_event('MODEL_LOAD_ERROR', 'ERROR', 
+                f'Fehler beim Laden des Modells: {model_path}', {
+                    'model_path': model_path,
+                    'reason': reason
+                })
+
+    def build_inference_params(self):
+        """Parameter für den Modellaufruf aus den Einstellungen ableiten.
+        
+        conf: globaler Schwellwert (confidence_threshold). Nicht auf die min_confidence
+        der Klassen anheben: Boxen darunter zählen für Gut-Klassen zur Anzahl pro Bild.
+        classes: alle Modellklassen außer den als 'ignore' markierten.
+        """
+        confidence_threshold = self.settings.get('confidence_threshold', 0.5)
+        class_assignments = self.settings.get('class_assignments', {})
+        
+        classes = None
+        if class_assignments:
+            model_class_ids = [int(class_id) for class_id in self.detection_engine.class_names]
+            active_ids = [
+                class_id for class_id in model_class_ids
+                if class_assignments.get(str(class_id), {}).get('assignment') != 'ignore'
+            ]
+            if len(active_ids) != len(model_class_ids):
+                classes = active_ids
+        
+        return {
+            'conf': confidence_threshold,
+            'iou': self.settings.get('inference_iou', 0.7),
+            'classes': classes,
+            'max_det': self.settings.get('inference_max_det', 300),
+            'imgsz': self.settings.get('inference_imgsz', 0) or None,
+        }
+
+    def apply_inference_settings_to_engine(self):
+        """Schwellwerte und Klassenfilter an den Modellaufruf übergeben."""
+        self.detection_engine.set_confidence_threshold(self.settings.get('confidence_threshold', 0.5))
+        self.detection_engine.set_inference_params(**self.build_inference_params())
+
     def apply_class_settings_to_engine(self):
         """Wendet alle Klassen-Einstellungen auf die DetectionEngine an."""
+        self.apply_inference_settings_to_engine()
+        
         class_assignments = self.settings.get('class_assignments', {})
         
         if class_assignments:
@@ -354,26 +534,8 @@ class DetectionApp(QMainWindow):
                 self.detection_engine.set_class_colors_quietly(class_colors)
 
     def auto_load_on_startup(self):
-        """Auto-Loading beim Start."""
+        """Auto-Loading beim Start (Kamera sofort, Modell im Hintergrund)."""
         try:
-            # Letztes Modell laden
-            last_model = self.settings.get('last_model', '')
-            if last_model and os.path.exists(last_model):
-                if self.detection_engine.load_model(last_model):
-                    # NEUE STRUKTUR: class_assignments verwenden
-                    self.apply_class_settings_to_engine()
-                    
-                    self.ui.update_model_status(last_model)
-                    
-                    # Log Model Auto-Loading
-                    self.detection_logger.log_system_event('MODEL_AUTO_LOADED', 'SUCCESS', 
-                        f'Modell automatisch geladen: {os.path.basename(last_model)}', {
-                            'model_path': last_model,
-                            'class_names': list(self.detection_engine.class_names.values())
-                        })
-                    
-                    logging.info(f"Auto-loaded model: {last_model}")
-            
             # Kamera-Konfiguration laden
             camera_config_path = self.settings.get('camera_config_path', '')
             if camera_config_path and os.path.exists(camera_config_path):
@@ -392,12 +554,11 @@ class DetectionApp(QMainWindow):
                     if self.camera_manager.set_source(last_source):
                         self.ui.update_camera_status(last_source, 'webcam')
             
-            # Status setzen basierend auf Modbus-Verbindung
-            if self.detection_engine.model_loaded and self.camera_manager.camera_ready:
-                if self.modbus_manager.connected:
-                    self.ui.show_status("Bereit - Alle Komponenten geladen", "ready")
-                else:
-                    self.ui.show_status("Warte auf Modbus-Verbindung", "warning")
+            # Letztes Modell im Hintergrund laden (Status kommt über on_model_loaded)
+            last_model = self.settings.get('last_model', '')
+            if last_model and os.path.exists(last_model):
+                self.load_model_into_engine(last_model, reason='auto')
+                logging.info(f"Auto-loading model im Hintergrund: {last_model}")
             else:
                 self.ui.show_status("Modell und Kamera auswählen", "warning")
                 
@@ -416,49 +577,74 @@ class DetectionApp(QMainWindow):
         # GEÄNDERT: quit_btn mit Bestätigung
         self.ui.quit_btn.clicked.connect(self.confirm_quit_application)
 
-    def check_settings_changes(self):
-        """Einstellungsänderungen prüfen - OPTIMIERT: Weniger Logging."""
-        try:
-            # Einfache Datei-Änderungsprüfung
-            if os.path.exists(self.settings.filename):
-                old_settings = self.settings.data.copy()
-                self.settings.load_quietly()  # Verwende quiet loading
-                
-                # Update Image Saver nur bei Änderungen
-                if old_settings != self.settings.data:
-                    self.image_saver.update_settings(self.settings.data)
-                    
-                    # Update Kamera-Konfiguration nur bei Pfad-Änderung
-                    old_camera_config = old_settings.get('camera_config_path', '')
-                    new_camera_config = self.settings.get('camera_config_path', '')
-                    if old_camera_config != new_camera_config and new_camera_config and os.path.exists(new_camera_config):
-                        self.camera_config_manager.load_config(new_camera_config)
-                    
-                    # NEUE: class_assignments Überwachung
-                    old_class_assignments = old_settings.get('class_assignments', {})
-                    new_class_assignments = self.settings.get('class_assignments', {})
-                    
-                    if old_class_assignments != new_class_assignments:
-                        # Klassen-Einstellungen komplett anwenden
-                        if self.detection_engine.model_loaded:
-                            self.apply_class_settings_to_engine()
-                            logging.info("Klassen-Einstellungen nach Änderung aktualisiert")
-
-                    # Motion Decay Factor bei Änderung aktualisieren
-                    old_decay = old_settings.get('motion_decay_factor', 0.1)
-                    new_decay = self.settings.get('motion_decay_factor', 0.1)
-                    if old_decay != new_decay:
-                        self.motion_decay_factor = new_decay
-                        logging.info(f"Motion Decay Factor aktualisiert: {new_decay}")
-
-                    # NEUE: Referenzlinien-Update
-                    old_reference_lines = old_settings.get('reference_lines', [])
-                    new_reference_lines = self.settings.get('reference_lines', [])
-                    if old_reference_lines != new_reference_lines:
-                        self.ui.update_reference_lines()
-                        
-        except:
-            pass
+    def setup_settings_subscriptions(self):
+        """Komponenten für Einstellungsänderungen registrieren (jede nur für ihre Schlüssel)."""
+        watcher = self.settings_watcher
+        watcher.subscribe(ImageSaver.SETTINGS_KEYS, lambda event: self.image_saver.update_settings(event.settings))
+        watcher.subscribe(('camera_config_path',), self.on_camera_config_changed)
+        watcher.subscribe(('class_assignments', 'bad_part_classes', 'red_threshold', 'bad_part_min_confidence'),
+                          self.on_evaluation_rules_changed)
+        watcher.subscribe(('class_assignments',), self.on_class_assignments_changed)
+        watcher.subscribe(('inference_backend', 'inference_imgsz'), self.on_backend_changed)
+        watcher.subscribe(('confidence_threshold', 'inference_iou', 'inference_max_det', 'inference_imgsz'),
+                          self.on_inference_params_changed)
+        watcher.subscribe(('motion_decay_factor',), self.on_motion_decay_changed)
+        watcher.subscribe(('reference_lines', 'motion_roi'), lambda event: self.ui.update_reference_lines())
+        watcher.subscribe(('inference_batch_max',), self.on_batch_max_changed)
+        watcher.subscribe(('display_max_fps',),
+                          lambda event: self.display_renderer.set_max_fps(event.get('display_max_fps', 15)))
+        watcher.subscribe(('stats_refresh_hz',),
+                          lambda event: self.ui.set_stats_refresh_rate(event.get('stats_refresh_hz', 5)))
+        watcher.subscribe(('camera_normalize',), lambda event: self.configure_camera_frames())
+        watcher.subscribe(('motion_roi', 'motion_pyramid_level'), self.on_motion_features_changed)
+
+    def on_camera_config_changed(self, event):
+        """Kamera-Konfiguration bei Pfad-Änderung laden."""
+        new_camera_config = event.get('camera_config_path', '')
+        if new_camera_config and os.path.exists(new_camera_config):
+            self.camera_config_manager.load_config(new_camera_config)
+
+    def on_evaluation_rules_changed(self, event):
+        """Regeltabelle der Zyklus-Auswertung neu übersetzen."""
+        self.cycle_evaluator = CycleEvaluator.from_settings(event.settings)
+
+    def on_class_assignments_changed(self, event):
+        """Klassen-Einstellungen komplett anwenden."""
+        if self.detection_engine.model_loaded:
+            self.apply_class_settings_to_engine()
+            logging.info("Klassen-Einstellungen nach Änderung aktualisiert")
+
+    def on_backend_changed(self, event):
+        """Backend-Wechsel (oder neue Eingabegröße bei exportierten Modellen) erfordert Neuladen."""
+        new_backend = event.get('inference_backend', 'pytorch')
+        imgsz_changed = event.changed('inference_imgsz') and new_backend != 'pytorch'
+        last_model = event.get('last_model', '')
+        if (self.detection_engine.model_loaded and last_model and os.path.exists(last_model)
+                and (event.changed('inference_backend') or imgsz_changed)):
+            if self.load_model_into_engine(last_model, reason='reload'):
+                logging.info(f"Modell wird mit Backend '{new_backend}' neu geladen")
+
+    def on_inference_params_changed(self, event):
+        """Schwellwerte für den Modellaufruf neu berechnen."""
+        if self.detection_engine.model_loaded:
+            self.apply_inference_settings_to_engine()
+
+    def on_motion_decay_changed(self, event):
+        """Motion Decay Factor übernehmen."""
+        self.motion_decay_factor = event.get('motion_decay_factor', 0.1)
+        logging.info(f"Motion Decay Factor aktualisiert: {self.motion_decay_factor}")
+
+    def on_batch_max_changed(self, event):
+        """Batch-Obergrenze der KI-Stufe übernehmen."""
+        new_batch_max = max(1, int(event.get('inference_batch_max', 8)))
+        self.detection_engine.batch_sizer.max_batch_size = new_batch_max
+        self.frame_pipeline.set_max_batch_size(new_batch_max)
+        self.configure_camera_frames()
+
+    def on_motion_features_changed(self, event):
+        """Bewegungserkennung: Pyramidenstufe und ROI (Hintergrundmodell lernt neu an)."""
+        self.feature_extractor.configure(pyramid_level=event.get('motion_pyramid_level', 2),
+                                         roi=event.get('motion_roi', {}))
 
     def toggle_login(self):
         """Login/Logout umschalten - MIT SCHÖNEM PIN-DIALOG."""
@@ -519,7 +705,7 @@ class DetectionApp(QMainWindow):
                     self.modbus_manager.set_detection_active_coil(True)
                     self.ui.update_coil_status(detection_active=True)
                 
-                self.update_timer.start(30)
+                self.frame_pipeline.start()
                 
                 # Button zu Stoppen mit Gradient und Stop-Symbol
                 self.ui.start_btn.setText("⏹ STOPPEN")
@@ -576,8 +762,8 @@ class DetectionApp(QMainWindow):
         """Detection stoppen."""
         self.running = False
         
-        if hasattr(self, 'update_timer'):
-            self.update_timer.stop()
+        if hasattr(self, 'frame_pipeline'):
+            self.frame_pipeline.stop()
         
         # COUNTDOWN-TIMER stoppen
         if hasattr(self, 'countdown_timer'):
@@ -624,11 +810,7 @@ class DetectionApp(QMainWindow):
 
     def init_robust_motion_detection(self):
         """Motion Detection initialisieren."""
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            detectShadows=False, # Deaktiviert für bessere Performance
-            varThreshold=32, # Varianz-Schwelle für bessere Erkennung
-            history=200 # History für stabilere Bewegungserkennung
-        )
+        self.feature_extractor.reset()
         
         self.motion_history = []
         self.motion_stable_count = 0
@@ -637,9 +819,10 @@ class DetectionApp(QMainWindow):
         self.current_motion_value = 0.0
         
         # Erkennungsstatistiken zurücksetzen
-        self.last_cycle_detections = {}
-        self.current_frame_detections = []
-        self.cycle_image_count = 0
+        with self.cycle_lock:
+            self.last_cycle_detections = CycleStatistics()
+            self.current_frame_detections = []
+            self.cycle_image_count = 0
         
         # Helligkeits-Auto-Stopp zurücksetzen
         self.brightness_auto_stop_active = False
@@ -660,62 +843,137 @@ class DetectionApp(QMainWindow):
         self.motion_stable_count = 0
         self.no_motion_stable_count = 0
 
-    def process_frame(self):
-        """Frame verarbeiten."""
+    # =========================================================================
+    # PIPELINE-STUFEN (laufen in Worker-Threads - KEINE UI-Zugriffe!)
+    # =========================================================================
+
+    def preprocess_frame(self, packet):
+        """Vorverarbeitungs-Stufe: alle Frame-Merkmale in einem Durchlauf berechnen."""
+        features = self.feature_extractor.compute(packet.frame)
+        packet.features = features
+        packet.brightness = features.brightness
+        packet.motion_pixels = features.motion_pixels
+
+    def run_inference(self, packets):
+        """KI-Stufe: Erkennung nur während der Erkennungsphase ausführen (ein Batch pro Aufruf)."""
+        if self.detection_running and self.running:
+            results = self.detection_engine.detect_batch([packet.frame for packet in packets])
+            for packet, detections in zip(packets, results):
+                packet.detections = detections
+
+    def get_inference_batch_size(self):
+        """Batch-Größe für die KI-Stufe: außerhalb der Erkennungsphase 1 (keine Wartezeit),
+        sonst so groß, dass der Batch vor Ende von capture_time fertig wird."""
+        if not self.detection_running or self.detection_start_time is None:
+            return 1
+        capture_time = self.settings.get('capture_time', 3.0)
+        remaining = capture_time - (time.time() - self.detection_start_time)
+        return self.detection_engine.batch_sizer.suggest(remaining)
+
+    def configure_camera_frames(self):
+        """Frame-Puffer-Pool der Kamera an die Pipeline anpassen.
+
+        Jedes Frame ist eine Sicht auf einen wiederverwendeten Puffer; der Pool muss
+        alle Frames im Ringpuffer, in der Pipeline und die in der GUI ausstehenden abdecken.
+        """
+        ring_slots = max(1, int(self.settings.get('camera_ring_slots', 4)))
+        pool_size = (ring_slots + 1 + self.frame_pipeline.max_frames_in_flight()
+                     + int(self.settings.get('camera_frame_pool_extra', 4)))
+        self.camera_manager.configure_frames(
+            pool_size=pool_size,
+            normalize=self.settings.get('camera_normalize', False),
+            ring_slots=ring_slots
+        )
+
+    def render_frame(self, packet):
+        """Render-Stufe: Erkennungen zur Zyklus-Statistik zählen und Anzeige-Bild in Label-Größe
+        erzeugen (gemäß Anzeigerate).
+
+        Gezählt wird hier und nicht im GUI-Thread, weil die GUI bei Überlast nur das
+        neueste Frame erhält - die Statistik muss aber jedes Frame der Erkennungsphase enthalten.
+        """
+        if packet.detections is not None:
+            with self.cycle_lock:
+                if self.detection_running and self.running:
+                    self.current_frame_detections = packet.detections
+                    self.update_cycle_statistics_extended(packet.detections)
+                    self.cycle_image_count += 1
+        packet.display = self.display_renderer.render(packet.frame, packet.detections)
+
+    def on_pipeline_stats(self, stats):
+        """Pipeline-Statistiken (FPS und Queue-Tiefe je Stufe) übernehmen."""
+        self.pipeline_stats = stats
+        logging.debug("Pipeline: " + format_pipeline_stats(stats))
+
+        # Kamera-Aufnahme: übersprungene (nicht verarbeitete) und verlorene Sensor-Frames
+        camera_stats = self.camera_manager.get_acquisition_stats()
+        if camera_stats['lost'] > self.camera_stats.get('lost', 0):
+            logging.warning(f"Kamera: {camera_stats['lost'] - self.camera_stats.get('lost', 0)} Sensor-Frames verloren "
+                            f"(gesamt {camera_stats['lost']})")
+        if camera_stats['pool_dropped'] > self.camera_stats.get('pool_dropped', 0):
+            logging.warning(f"Kamera: {camera_stats['pool_dropped'] - self.camera_stats.get('pool_dropped', 0)} Frames "
+                            f"verworfen - alle Frame-Puffer belegt (camera_frame_pool_extra erhöhen)")
+        self.camera_stats = camera_stats
+        logging.debug(f"Kamera: {camera_stats['captured']} aufgenommen, {camera_stats['delivered']} verarbeitet, "
+                      f"{camera_stats['skipped']} übersprungen, {camera_stats['lost']} verloren, "
+                      f"Pool +{camera_stats['pool_grown']} erweitert / {camera_stats['pool_dropped']} verworfen")
+
+    # =========================================================================
+    # GUI-STUFE
+    # =========================================================================
+
+    def process_frame(self, packet):
+        """Fertig verarbeitetes Frame im GUI-Thread übernehmen (Slot für frame_ready)."""
         try:
             if not self.running:
                 return
-                
-            frame = self.camera_manager.get_frame()
-            if frame is None:
-                return
-            
+
+            self.last_frame = packet.frame
+
             # Helligkeitsüberwachung
-            self.check_brightness_with_auto_stop(frame)
-            
+            self.check_brightness_with_auto_stop(packet.brightness)
+
             if self.brightness_auto_stop_active:
                 return
-            
-            # Motion-Wert berechnen
-            self.update_motion_display_with_decay(frame)
-            
+
+            # Motion-Wert anzeigen
+            self.update_motion_display_with_decay(packet.motion_pixels)
+
             # Workflow verarbeiten
-            self.process_industrial_workflow(frame)
-            
-            # KI-Erkennung
-            detections = []
-            if self.detection_running and self.running:
-                detections = self.detection_engine.detect(frame)
-                self.current_frame_detections = detections
-                self.update_cycle_statistics_extended(detections)
-                self.cycle_image_count += 1
-            
-            # Frame zeichnen
-            annotated_frame = self.detection_engine.draw_detections(frame, detections)
-            
+            self.process_industrial_workflow(packet)
+
+            # Gezählt wurde bereits in der Render-Stufe (render_frame)
+            if (packet.detections is not None and not self.first_detection_logged
+                    and len(packet.detections) > 0):
+                self.log_first_detection()
+
             # UI aktualisieren
             if self.running:
-                self.ui.update_video(annotated_frame)
+                if packet.display is not None:
+                    self.ui.update_video(packet.display)
                 self.ui.update_last_cycle_stats(self.last_cycle_detections)
-                
+
         except Exception as e:
             logging.error(f"Fehler bei Frame-Verarbeitung: {e}")
 
-    def update_motion_display_with_decay(self, frame):
+    def log_first_detection(self):
+        """Kaltstart-Dauer bis zur ersten Erkennung einmalig protokollieren."""
+        self.first_detection_logged = True
+        cold_start = time.time() - self.startup_time
+        logging.info(f"Kaltstart bis erste Erkennung: {cold_start:.2f}s")
+        self.detection_logger.log_system_event('FIRST_DETECTION', 'INFO',
+            f'Erste Erkennung {cold_start:.2f}s nach Programmstart', {
+                'cold_start_s': round(cold_start, 3),
+                'load_timings': self.detection_engine.load_timings
+            })
+
+    def update_motion_display_with_decay(self, motion_pixels):
         """Motion-Wert berechnen mit drastischem Abfall nach Stillstand."""
-        if self.bg_subtractor is None:
+        if not self.feature_extractor.active:
             return
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (5, 5), 0)
-        fg_mask = self.bg_subtractor.apply(gray)
-
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-
-        # Motion-Berechnung mit Downsampling-Kompensation
-        motion_pixels = cv2.countNonZero(fg_mask) * 16  # Kompensiert 4x4 Downsampling
+        # Motion-Wert in derselben Einheit wie motion_threshold (Vordergrund-Pixel / 100,
+        # bereits von Pyramidenstufe und ROI auf volle Auflösung hochgerechnet)
         current_motion = min(255, motion_pixels / 100)
         
         # ELEGANTE DECAY-MATHEMATIK: Ein-Schritt Division
@@ -733,7 +991,7 @@ class DetectionApp(QMainWindow):
         # UI aktualisieren
         self.ui.update_motion(self.current_motion_value)
 
-    def process_industrial_workflow(self, frame):
+    def process_industrial_workflow(self, packet):
         """Industrieller Workflow mit COUNTDOWN in Statusleiste."""
         current_time = time.time()
         
@@ -741,9 +999,12 @@ class DetectionApp(QMainWindow):
         capture_time = self.settings.get('capture_time', 3.0)
         blow_off_time = self.settings.get('blow_off_time', 5.0)
         
+        # Bewegungsauswertung höchstens einmal pro Frame (Schritte 1 und 2 teilen sich das Ergebnis)
+        motion_now = None
+        
         # 1. Bewegungserkennung
         if not self.motion_detected and not self.blow_off_active:
-            motion_now = self.detect_robust_motion(frame)
+            motion_now = self.detect_robust_motion(packet.motion_pixels)
             
             if motion_now and not self.motion_detected:
                 self.motion_detected = True
@@ -756,7 +1017,8 @@ class DetectionApp(QMainWindow):
         
         # 2. Ausschwingen
         if self.motion_detected and not self.motion_cleared:
-            motion_now = self.detect_robust_motion(frame)
+            if motion_now is None:
+                motion_now = self.detect_robust_motion(packet.motion_pixels)
             
             if not motion_now:
                 self.no_motion_stable_count += 1
@@ -772,8 +1034,10 @@ class DetectionApp(QMainWindow):
                         self.motion_cleared = True
                         self.detection_running = True
                         self.detection_start_time = current_time
-                        self.last_cycle_detections = {}
-                        self.cycle_image_count = 0
+                        self.cycle_id = time.strftime('%Y%m%d_%H%M%S', time.localtime(current_time)) + f"_{int(current_time * 1000) % 1000:03d}"
+                        with self.cycle_lock:
+                            self.last_cycle_detections = CycleStatistics()
+                            self.cycle_image_count = 0
                         
                         # COUNTDOWN STARTEN für Erkennungsphase
                         self.countdown_timer.start(100)  # Alle 100ms aktualisieren
@@ -788,7 +1052,9 @@ class DetectionApp(QMainWindow):
         # 3. Erkennungsphase
         if self.detection_running:
             if current_time - self.detection_start_time >= capture_time:
-                self.detection_running = False
+                # Unter der Sperre: danach zählt die Render-Stufe nichts mehr in diesen Zyklus
+                with self.cycle_lock:
+                    self.detection_running = False
                 
                 # COUNTDOWN STOPPEN
                 self.countdown_timer.stop()
@@ -796,7 +1062,7 @@ class DetectionApp(QMainWindow):
                 bad_parts_detected = self.evaluate_detection_results()
                 
                 # Bilderspeicherung
-                self.save_detection_result_image(frame, bad_parts_detected)
+                self.save_detection_result_image(packet.frame, bad_parts_detected)
                 
                 # Counter aktualisieren
                 self.ui.increment_session_counters(bad_parts_detected)
@@ -862,20 +1128,11 @@ class DetectionApp(QMainWindow):
         except Exception as e:
             logging.error(f"Fehler beim roten Blinken: {e}")
 
-    def detect_robust_motion(self, frame):
-        """Robuste Bewegungserkennung."""
-        if self.bg_subtractor is None:
+    def detect_robust_motion(self, motion_pixels):
+        """Robuste Bewegungserkennung anhand der in der Pipeline gezählten Vordergrund-Pixel."""
+        if not self.feature_extractor.active:
             return False
         
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (5, 5), 0)
-        fg_mask = self.bg_subtractor.apply(gray)
-        
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-        
-        motion_pixels = cv2.countNonZero(fg_mask)
         motion_threshold = self.settings.get('motion_threshold', 110) * 100
         has_motion = motion_pixels > motion_threshold
         
@@ -893,109 +1150,69 @@ class DetectionApp(QMainWindow):
         return self.motion_stable_count >= 3
 
     def update_cycle_statistics_extended(self, detections):
-        """Statistiken für aktuellen Zyklus."""
-        for detection in detections:
-            _, _, _, _, confidence, class_id = detection
-            class_name = self.detection_engine.class_names.get(class_id, f"Class {class_id}")
-            
-            if class_name not in self.last_cycle_detections:
-                self.last_cycle_detections[class_name] = {
-                    'count': 0,
-                    'max_confidence': 0.0,
-                    'min_confidence': 1.0,
-                    'avg_confidence': 0.0,
-                    'confidences': [],
-                    'class_id': class_id,
-                    'total_detections': 0
-                }
-            
-            stats = self.last_cycle_detections[class_name]
-            stats['count'] += 1
-            stats['total_detections'] += 1
-            stats['confidences'].append(confidence)
-            stats['max_confidence'] = max(stats['max_confidence'], confidence)
-            stats['min_confidence'] = min(stats['min_confidence'], confidence)
-            
-            confidences = stats['confidences']
-            stats['avg_confidence'] = sum(confidences) / len(confidences)
+        """Statistiken für aktuellen Zyklus (laufend pro Klasse, ohne einzelne Konfidenzen zu speichern)."""
+        detections = as_detection_array(detections)
+        self.last_cycle_detections.add_detections(
+            detections['class_id'], detections['confidence'], self.detection_engine.class_names)
 
     def evaluate_detection_results(self):
-        """KORRIGIERT: Erkennungsergebnisse auswerten mit durchschnittlicher Anzahl pro Bild."""
-        class_assignments = self.settings.get('class_assignments', {})
-        bad_parts_found = False
-        
-        # NEUE STRUKTUR verwenden wenn verfügbar
-        if class_assignments:
-            for class_name, stats in self.last_cycle_detections.items():
-                class_id = stats.get('class_id', 0)
-                max_conf = stats.get('max_confidence', 0.0)
-                total_detections = stats.get('total_detections', 0)
-                
-                # KORRIGIERT: Durchschnittliche Anzahl pro Bild berechnen (wie in Sidebar "ANZ")
-                if self.cycle_image_count > 0:
-                    avg_detections_per_image = total_detections / self.cycle_image_count
-                    avg_count = round(avg_detections_per_image)
-                else:
-                    avg_count = 0
-                
-                assignment = class_assignments.get(str(class_id), {})
-                assignment_type = assignment.get('assignment', 'ignore')
-                expected_count = assignment.get('expected_count', -1)
-                min_confidence = assignment.get('min_confidence', 0.5)
-                
-                if assignment_type == 'bad' and max_conf >= min_confidence:
-                    # Schlecht-Teil erkannt mit ausreichender Konfidenz
-                    logging.info(f"Schlecht-Teil erkannt: {class_name} (Konfidenz: {max_conf:.2f})")
-                    bad_parts_found = True
-                    
-                elif assignment_type == 'good' and expected_count != -1:
-                    # Gut-Teil mit erwarteter Anzahl prüfen
-                    if avg_count != expected_count and max_conf >= min_confidence:
-                        logging.info(f"Gut-Teil Anzahl-Fehler: {class_name} - erwartet: {expected_count}, gefunden: {avg_count}")
-                        bad_parts_found = True
-        else:
-            # FALLBACK auf alte Struktur
-            bad_part_classes = self.settings.get('bad_part_classes', [])
-            red_threshold = self.settings.get('red_threshold', 1)
-            min_confidence = self.settings.get('bad_part_min_confidence', 0.5)
-            
-            for class_name, stats in self.last_cycle_detections.items():
-                class_id = stats.get('class_id', 0)
-                max_conf = stats.get('max_confidence', 0.0)
-                total_detections = stats.get('total_detections', 0)
-                
-                if (class_id in bad_part_classes and 
-                    total_detections >= red_threshold and 
-                    max_conf >= min_confidence):
-                    logging.info(f"Schlechtes Teil (alte Struktur): {class_name}")
-                    bad_parts_found = True
+        """Erkennungsergebnisse mit der vorübersetzten Regeltabelle auswerten (Anzahl pro Bild gemittelt)."""
+        evaluation = self.cycle_evaluator.evaluate(self.last_cycle_detections, self.cycle_image_count)
+        bad_parts_found = evaluation.bad_parts_detected
+        
+        for class_name, reason, details in evaluation.flagged:
+            if evaluation.method == 'legacy':
+                logging.info(f"Schlechtes Teil (alte Struktur): {class_name}")
+            elif reason == REASON_COUNT_MISMATCH:
+                logging.info(f"Gut-Teil Anzahl-Fehler: {class_name} - erwartet: {details['expected_count']}, "
+                             f"gefunden: {details['avg_count']}")
+            else:
+                logging.info(f"Schlecht-Teil erkannt: {class_name} (Konfidenz: {details['max_confidence']:.2f})")
         
         # Log Detection Cycle Result
         self.detection_logger.log_detection_cycle(
             bad_parts_detected=bad_parts_found,
-            cycle_detections=self.last_cycle_detections,
+            cycle_detections=self.last_cycle_detections.to_dict(),
             cycle_stats={
                 'cycle_image_count': self.cycle_image_count,
-                'evaluation_method': 'class_assignments' if class_assignments else 'legacy'
+                'cycle_id': self.cycle_id,
+                'cycle_duration': time.time() - self.detection_start_time if self.detection_start_time else None,
+                'evaluation_method': evaluation.method
             }
         )
         
         return bad_parts_found
 
     def save_detection_result_image(self, frame, bad_parts_detected):
-        """Bild speichern."""
+        """Bild speichern (asynchron im Writer-Pool des ImageSavers)."""
         try:
             if bad_parts_detected:
-                self.image_saver.save_bad_image(frame, self.last_cycle_detections)
+                future = self.image_saver.save_bad_image(frame, self.last_cycle_detections, self.cycle_id)
             else:
-                self.image_saver.save_good_image(frame, self.last_cycle_detections)
+                future = self.image_saver.save_good_image(frame, self.last_cycle_detections, self.cycle_id)
+            
+            if future is not None:
+                future.add_done_callback(self.on_image_saved)
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern: {e}")
+
+    def on_image_saved(self, future):
+        """Ergebnis des asynchronen Speicherns loggen (läuft im Writer-Thread)."""
+        try:
+            filepath = future.result()
         except Exception as e:
+            filepath = None
             logging.error(f"Fehler beim Speichern: {e}")
+        
+        if filepath in (None, "DIRECTORY_FULL", "QUEUE_FULL"):
+            self.detection_logger.log_system_event('IMAGE_SAVE_FAILED', 'WARNING',
+                f"Bild nicht gespeichert: {filepath or 'Schreibfehler'}",
+                {'reason': filepath, 'write_stats': self.image_saver.get_write_stats()})
 
-    def check_brightness_with_auto_stop(self, frame):
+    def check_brightness_with_auto_stop(self, brightness):
         """Helligkeitsüberwachung."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        brightness = np.mean(gray)
+        if brightness is None:
+            return
         
         self.brightness_values.append(brightness)
         if len(self.brightness_values) > 30:
@@ -1059,36 +1276,41 @@ class DetectionApp(QMainWindow):
         self.ui.update_brightness(avg_brightness)
 
     def load_model(self):
-        """Modell laden."""
+        """Modell laden (im Hintergrund, Ergebnis in on_model_loaded)."""
         if not self.user_manager.can_change_model():
             self.ui.show_status("Admin-Login erforderlich", "error")
             return
             
         model_path = self.ui.select_model_file()
         if model_path:
-            if self.detection_engine.load_model(model_path):
-                # NEUE STRUKTUR: class_assignments verwenden
-                self.apply_class_settings_to_engine()
-                
-                self.ui.show_status(f"Modell geladen", "success")
-                self.ui.update_model_status(model_path)
-                self.settings.set('last_model', model_path)
-                self.settings.save()
-                
-                # Log Model Loaded
-                self.detection_logger.log_system_event('MODEL_LOADED', 'SUCCESS', 
-                    f'Modell manuell geladen: {os.path.basename(model_path)}', {
-                        'model_path': model_path,
-                        'class_names': list(self.detection_engine.class_names.values())
-                    })
-            else:
-                self.ui.show_status("Fehler beim Laden", "error")
-                
-                # Log Model Load Error
-                self.detection_logger.log_system_event('MODEL_LOAD_ERROR', 'ERROR', 
-                    f'Fehler beim Laden des Modells: {model_path}', {
-                        'model_path': model_path
-                    })
+            if not self.load_model_into_engine(model_path, reason='manual'):
+                self.ui.show_status("Modell wird bereits geladen", "warning")
+
+    def load_detection_dataset(self, dataset_name):
+        """Detection-Datensatz laden (Slot für DetectionDatasetDialog.dataset_selected).
+        
+        Geladen wird die aktive Modell-Variante des Datensatzes (z.B. INT8) mit ihrem
+        Backend, ohne aktive oder auffindbare Variante das Originalmodell.
+        """
+        dataset = self.dataset_manager.load_dataset(dataset_name)
+        if dataset is None:
+            self.ui.show_status(f"Datensatz '{dataset_name}' konnte nicht geladen werden", "error")
+            return
+        
+        model_path, backend, variant = self.dataset_manager.get_active_model(dataset)
+        if not model_path or not os.path.exists(model_path):
+            self.ui.show_status("Modell des Datensatzes nicht gefunden", "error")
+            logging.error(f"Datensatz '{dataset_name}': Modelldatei nicht gefunden: {model_path}")
+            return
+        
+        variant_label = variant or 'Original'
+        logging.info(f"Datensatz '{dataset_name}': lade Modell-Variante {variant_label} "
+                     f"({model_path}, Backend {backend or self.settings.get('inference_backend', 'pytorch')})")
+        if not self.load_model_into_engine(model_path, reason='dataset', backend=backend, variant=variant):
+            self.ui.show_status("Modell wird bereits geladen", "warning")
+            return
+        
+        self.ui.update_dataset_status(dataset_name, f"{os.path.basename(model_path)} ({variant_label})")
 
     def select_camera(self):
         """Kamera auswählen."""
@@ -1124,7 +1346,8 @@ class DetectionApp(QMainWindow):
 
     def take_snapshot(self):
         """Schnappschuss."""
-        frame = self.camera_manager.get_frame()
+        # Während der Detection liefert die Pipeline die Frames - Kamera nicht parallel abfragen
+        frame = self.last_frame if self.running else self.camera_manager.get_frame()
         if frame is not None:
             filename = self.camera_manager.save_snapshot(frame)
             if filename:
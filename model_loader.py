@@ -0,0 +1,71 @@
+"""
+Modell-Lader - KI-Modell im Hintergrund laden und aufwärmen
+Die GUI bleibt beim Start bedienbar; Fortschritt und Ergebnis kommen als Qt-Signale
+"""
+
+import time
+import logging
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class ModelLoader(QObject):
+    """Lädt ein Modell in einem Worker-Thread über DetectionEngine.load_model().
+
+    Signale werden aus dem Worker-Thread emittiert und von Qt in den GUI-Thread
+    zugestellt (wie bei FramePipeline).
+    """
+
+    progress = pyqtSignal(str)                 # Statusmeldung
+    finished = pyqtSignal(bool, str, dict)     # erfolgreich, Modellpfad, Zeiten
+
+    def __init__(self, detection_engine, thread_init_fn=None):
+        super().__init__()
+        self.detection_engine = detection_engine
+        self.thread_init_fn = thread_init_fn  # z.B. CPU-Affinität der KI-Kerne fürs Aufwärmen
+        self._thread = None
+
+    @property
+    def loading(self):
+        """True solange ein Ladevorgang läuft."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def load(self, model_path, backend='pytorch', imgsz=None, warmup_runs=0, warmup_shape=None):
+        """Ladevorgang starten.
+
+        Returns:
+            bool: False wenn bereits ein Modell geladen wird
+        """
+        if self.loading:
+            logging.warning("Modell wird bereits geladen - Anfrage ignoriert")
+            return False
+
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(model_path, backend, imgsz, warmup_runs, warmup_shape),
+            name="model-loader",
+            daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, model_path, backend, imgsz, warmup_runs, warmup_shape):
+        if self.thread_init_fn is not None:
+            try:
+                self.thread_init_fn('inference')
+            except Exception as e:
+                logging.warning(f"Initialisierung des Lade-Threads fehlgeschlagen: {e}")
+
+        start = time.perf_counter()
+        success = self.detection_engine.load_model(
+            model_path,
+            backend=backend,
+            imgsz=imgsz,
+            warmup_runs=warmup_runs,
+            warmup_shape=warmup_shape,
+            progress_fn=self.progress.emit
+        )
+        timings = dict(self.detection_engine.load_timings) if success else {}
+        timings['total_s'] = round(time.perf_counter() - start, 3)
+        self.finished.emit(success, model_path, timings)
@@ -0,0 +1,436 @@
+"""
+Modell-Quantisierung - INT8 Post-Training-Quantisierung für CPU-Stationen
+Kalibrierung mit Bildern aus good_images/bad_images (vom ImageSaver gefüllt)
+Vor der Aktivierung werden mAP50 und Entscheidungs-Übereinstimmung gegen das FP32-Modell
+auf einem getrennten Hold-out-Set gemessen
+Das Ergebnis wird als Modell-Variante im Detection-Datensatz gespeichert
+
+Aufruf (aus dem Projektverzeichnis):
+    python model_quantizer.py <modell.pt> [--dataset NAME] [--activate]
+"""
+
+import sys
+import json
+import random
+import logging
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from detection_engine import (export_onnx_cached, create_backend, create_exported_backend,
+                              letterbox, group_detections_by_class)
+from detection_dataset_manager import DetectionDatasetManager
+from cycle_evaluator import CycleEvaluator
+from image_saver import IMAGE_EXTENSIONS
+from settings import Settings
+
+try:
+    import onnx
+    from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod, QuantFormat,
+                                          QuantType, quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+    QUANTIZATION_AVAILABLE = True
+except ImportError:
+    CalibrationDataReader = object
+    QUANTIZATION_AVAILABLE = False
+
+# Freigabe-Kriterien (gegen das FP32-Modell auf dem Hold-out-Set)
+MAX_MAP_DROP = 0.02                 # mAP50 darf höchstens 2 Prozentpunkte fallen
+MIN_DECISION_AGREEMENT = 0.99       # Gut/Schlecht-Entscheidung muss bei 99% der Bilder gleich sein
+
+
+# =============================================================================
+# BILDAUSWAHL
+# =============================================================================
+
+def collect_images(image_dirs):
+    """Alle gespeicherten Bilder einsammeln (auch aus Datums-/Stunden-Shards).
+
+    Args:
+        image_dirs (dict): {label: verzeichnis}, z.B. {'good': 'good_images', 'bad': 'bad_images'}
+
+    Returns:
+        list: [(pfad, label), ...] sortiert
+    """
+    images = []
+    for label, directory in image_dirs.items():
+        directory = Path(directory)
+        if not directory.exists():
+            logging.warning(f"Bildverzeichnis nicht gefunden: {directory}")
+            continue
+        for path in directory.rglob('*'):
+            if path.suffix.lower() in IMAGE_EXTENSIONS:
+                images.append((path, label))
+    images.sort()
+    return images
+
+
+def split_images(images, calibration_count, holdout_count, seed=0):
+    """Bilder in disjunkte Kalibrier- und Hold-out-Mengen aufteilen.
+
+    Gut- und Schlecht-Bilder werden getrennt gemischt und anteilig verteilt,
+    damit beide Mengen seltene Schlecht-Bilder enthalten.
+
+    Returns:
+        tuple: (kalibrierung, holdout) als Listen von (pfad, label)
+    """
+    rng = random.Random(seed)
+    by_label = {}
+    for path, label in images:
+        by_label.setdefault(label, []).append((path, label))
+
+    total = max(1, len(images))
+    calibration, holdout = [], []
+    for items in by_label.values():
+        rng.shuffle(items)
+        share = len(items) / total
+        n_holdout = min(len(items), int(round(holdout_count * share)))
+        n_calibration = min(len(items) - n_holdout, int(round(calibration_count * share)))
+        holdout.extend(items[:n_holdout])
+        calibration.extend(items[n_holdout:n_holdout + n_calibration])
+    return calibration, holdout
+
+
+class ImageCalibrationReader(CalibrationDataReader):
+    """Liefert Kalibrier-Blobs mit derselben Vorverarbeitung wie ExportedModelBackend."""
+
+    def __init__(self, image_paths, input_name, imgsz):
+        self.image_paths = list(image_paths)
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._index = 0
+
+    def get_next(self):
+        while self._index < len(self.image_paths):
+            frame = cv2.imread(str(self.image_paths[self._index]))
+            self._index += 1
+            if frame is None:
+                continue
+            image, _, _ = letterbox(frame, self.imgsz)
+            blob = cv2.dnn.blobFromImage(image, scalefactor=1 / 255.0, swapRB=True, crop=False)
+            return {self.input_name: blob}
+        return None
+
+    def rewind(self):
+        self._index = 0
+
+
+# =============================================================================
+# QUANTISIERUNG
+# =============================================================================
+
+def _head_node_names(model):
+    """Knoten des Detektionskopfs (Box-Dekodierung/DFL) - bleiben in FP32.
+
+    Die Box-Koordinaten reagieren empfindlich auf INT8-Rundung; der Kopf ist
+    der letzte '/model.N/'-Block des ultralytics-Exports.
+    """
+    indices = []
+    for node in model.graph.node:
+        parts = node.name.split('/')
+        if len(parts) > 1 and parts[1].startswith('model.'):
+            try:
+                indices.append(int(parts[1].split('.')[1]))
+            except (IndexError, ValueError):
+                pass
+    if not indices:
+        return []
+    head = f"/model.{max(indices)}/"
+    return [node.name for node in model.graph.node
+            if node.name.startswith(head) and ('dfl' in node.name or node.op_type in ('Concat', 'Split', 'Sigmoid', 'Softmax'))]
+
+
+def quantize_to_int8(onnx_path, metadata, calibration_paths):
+    """Exportiertes FP32-ONNX-Modell statisch nach INT8 (QDQ) quantisieren.
+
+    Args:
+        onnx_path (Path): FP32-Modell aus export_onnx_cached
+        metadata (dict): Zugehörige Metadaten (imgsz, class_names)
+        calibration_paths (list): Kalibrierbilder
+
+    Returns:
+        tuple: (int8_pfad, metadata) oder (None, None)
+    """
+    if not QUANTIZATION_AVAILABLE:
+        logging.error("INT8-Quantisierung benötigt onnx und onnxruntime")
+        return None, None
+
+    onnx_path = Path(onnx_path)
+    prepared_path = onnx_path.with_name(f"{onnx_path.stem}.prep.onnx")
+    int8_path = onnx_path.with_name(f"{onnx_path.stem}.int8.onnx")
+
+    try:
+        start = time.perf_counter()
+        quant_pre_process(str(onnx_path), str(prepared_path), skip_symbolic_shape=True)
+
+        model = onnx.load(str(prepared_path))
+        input_name = model.graph.input[0].name
+        excluded = _head_node_names(model)
+
+        reader = ImageCalibrationReader(calibration_paths, input_name, int(metadata['imgsz']))
+        quantize_static(
+            str(prepared_path), str(int8_path), reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+            calibrate_method=CalibrationMethod.MinMax,
+            nodes_to_exclude=excluded,
+        )
+
+        int8_metadata = dict(metadata)
+        int8_metadata.update({
+            'precision': 'int8',
+            'calibration_images': len(calibration_paths),
+            'fp32_model': onnx_path.name,
+        })
+        with open(int8_path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+            json.dump(int8_metadata, f, indent=2, ensure_ascii=False)
+
+        logging.info(f"INT8-Modell erstellt: {int8_path.name} ({len(calibration_paths)} Kalibrierbilder, "
+                     f"{len(excluded)} Kopf-Knoten in FP32, {time.perf_counter() - start:.1f}s)")
+        return int8_path, int8_metadata
+
+    except Exception as e:
+        logging.error(f"Fehler bei der INT8-Quantisierung: {e}")
+        return None, None
+
+    finally:
+        if prepared_path.exists():
+            prepared_path.unlink()
+
+
+# =============================================================================
+# BEWERTUNG
+# =============================================================================
+
+def _box_iou(box, boxes):
+    """IoU einer Box gegen mehrere Boxen (DETECTION_DTYPE)."""
+    x1 = np.maximum(box['x1'], boxes['x1'])
+    y1 = np.maximum(box['y1'], boxes['y1'])
+    x2 = np.minimum(box['x2'], boxes['x2'])
+    y2 = np.minimum(box['y2'], boxes['y2'])
+    inter = np.clip(x2 - x1, 0, None).astype(np.float64) * np.clip(y2 - y1, 0, None)
+    area = float(box['x2'] - box['x1']) * float(box['y2'] - box['y1'])
+    areas = (boxes['x2'] - boxes['x1']).astype(np.float64) * (boxes['y2'] - boxes['y1'])
+    union = area + areas - inter
+    return np.where(union > 0, inter / union, 0.0)
+
+
+def mean_average_precision(references, candidates, iou_threshold=0.5):
+    """mAP50 der Kandidaten-Erkennungen gegen Referenz-Erkennungen als Ground Truth.
+
+    Die Hold-out-Bilder sind nicht annotiert; als Referenz dienen die Erkennungen
+    des FP32-Modells (dessen mAP gegen sich selbst ist 1.0).
+
+    Args:
+        references, candidates: Listen von DETECTION_DTYPE-Arrays (ein Eintrag pro Bild)
+
+    Returns:
+        float: mAP50 über alle Klassen mit Referenz-Boxen (1.0 wenn keine vorhanden)
+    """
+    class_ids = set()
+    for detections in references:
+        class_ids.update(detections['class_id'].tolist())
+    if not class_ids:
+        return 1.0
+
+    average_precisions = []
+    for class_id in sorted(class_ids):
+        ground_truth = [ref[ref['class_id'] == class_id] for ref in references]
+        n_ground_truth = sum(len(gt) for gt in ground_truth)
+
+        predictions = []
+        for image_index, cand in enumerate(candidates):
+            for detection in cand[cand['class_id'] == class_id]:
+                predictions.append((float(detection['confidence']), image_index, detection))
+        predictions.sort(key=lambda item: -item[0])
+
+        matched = [np.zeros(len(gt), dtype=bool) for gt in ground_truth]
+        true_positives = np.zeros(len(predictions))
+        for i, (_, image_index, detection) in enumerate(predictions):
+            gt = ground_truth[image_index]
+            if len(gt) == 0:
+                continue
+            ious = _box_iou(detection, gt)
+            ious[matched[image_index]] = 0.0
+            best = int(np.argmax(ious))
+            if ious[best] >= iou_threshold:
+                matched[image_index][best] = True
+                true_positives[i] = 1
+
+        if not predictions:
+            average_precisions.append(0.0)
+            continue
+
+        cumulative_tp = np.cumsum(true_positives)
+        recall = cumulative_tp / n_ground_truth
+        precision = cumulative_tp / np.arange(1, len(predictions) + 1)
+
+        # Flächen unter der interpolierten Precision-Recall-Kurve (alle Punkte)
+        recall = np.concatenate(([0.0], recall, [1.0]))
+        precision = np.concatenate(([1.0], precision, [0.0]))
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+        steps = np.where(recall[1:] != recall[:-1])[0]
+        average_precisions.append(float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1])))
+
+    return float(np.mean(average_precisions))
+
+
+def decide_bad(detections, settings):
+    """Gut/Schlecht-Entscheidung für ein einzelnes Bild (gleiche Regeln wie die Zyklus-Auswertung).
+
+    Args:
+        detections: DETECTION_DTYPE-Array
+        settings (dict): Anwendungseinstellungen (class_assignments bzw. alte Struktur)
+
+    Returns:
+        bool: True wenn das Bild als schlecht gilt
+    """
+    class_ids, counts, _, _, maxima = group_detections_by_class(detections)
+    return bool(CycleEvaluator.from_settings(settings).evaluate_arrays(class_ids, counts, maxima, 1).any())
+
+
+def evaluate_variant(reference_backend, candidate_backend, holdout_paths, params, settings):
+    """INT8-Variante gegen das FP32-Modell auf dem Hold-out-Set bewerten.
+
+    Returns:
+        dict: Bericht mit mAP50, Entscheidungs-Übereinstimmung und Latenzen
+    """
+    references, candidates = [], []
+    agreements = 0
+    timings = {'fp32': 0.0, 'int8': 0.0}
+
+    for path in holdout_paths:
+        frame = cv2.imread(str(path))
+        if frame is None:
+            continue
+
+        start = time.perf_counter()
+        reference = reference_backend.predict([frame], params)[0]
+        timings['fp32'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        candidate = candidate_backend.predict([frame], params)[0]
+        timings['int8'] += time.perf_counter() - start
+
+        references.append(reference)
+        candidates.append(candidate)
+        agreements += decide_bad(reference, settings) == decide_bad(candidate, settings)
+
+    evaluated = len(references)
+    if evaluated == 0:
+        return {'holdout_images': 0, 'accepted': False}
+
+    map50 = mean_average_precision(references, candidates)
+    decision_agreement = agreements / evaluated
+    return {
+        'holdout_images': evaluated,
+        'map50': round(map50, 4),
+        'map50_delta': round(map50 - 1.0, 4),
+        'decision_agreement': round(decision_agreement, 4),
+        'latency_fp32_ms': round(timings['fp32'] / evaluated * 1000, 2),
+        'latency_int8_ms': round(timings['int8'] / evaluated * 1000, 2),
+        'accepted': (1.0 - map50) <= MAX_MAP_DROP and decision_agreement >= MIN_DECISION_AGREEMENT,
+    }
+
+
+def quantize_model(model_path, settings, calibration_count=200, holdout_count=100, seed=0):
+    """Kompletter Ablauf: Export, Kalibrierung, Quantisierung, Bewertung.
+
+    Args:
+        model_path (str): .pt-Modell
+        settings (dict): Anwendungseinstellungen (Bildverzeichnisse, Klassenzuteilung, Schwellwerte)
+
+    Returns:
+        tuple: (variante, bericht) oder (None, bericht) bei Fehler
+    """
+    images = collect_images({
+        'good': settings.get('good_images_directory', 'good_images'),
+        'bad': settings.get('bad_images_directory', 'bad_images'),
+    })
+    calibration, holdout = split_images(images, calibration_count, holdout_count, seed)
+    report = {'calibration_images': len(calibration)}
+    if not calibration or not holdout:
+        logging.error(f"Zu wenige Bilder für Kalibrierung/Hold-out ({len(images)} gefunden)")
+        report['error'] = 'not_enough_images'
+        return None, report
+
+    imgsz = settings.get('inference_imgsz', 0) or None
+    onnx_path, metadata = export_onnx_cached(model_path, imgsz)
+    if onnx_path is None:
+        report['error'] = 'export_failed'
+        return None, report
+
+    int8_path, _ = quantize_to_int8(onnx_path, metadata, [path for path, _ in calibration])
+    if int8_path is None:
+        report['error'] = 'quantization_failed'
+        return None, report
+
+    reference_backend = create_backend(model_path, 'pytorch')
+    candidate_backend = create_exported_backend(int8_path, 'onnxruntime')
+    if reference_backend is None or candidate_backend is None:
+        report['error'] = 'backend_unavailable'
+        return None, report
+
+    params = {
+        'conf': settings.get('confidence_threshold', 0.5),
+        'iou': settings.get('inference_iou', 0.7),
+        'max_det': settings.get('inference_max_det', 300),
+    }
+    report.update(evaluate_variant(reference_backend, candidate_backend,
+                                   [path for path, _ in holdout], params, settings))
+
+    variant = {
+        'path': str(int8_path),
+        'backend': 'onnxruntime',
+        'precision': 'int8',
+        'source_model': str(model_path),
+        'created': datetime.now().isoformat(),
+        'report': report,
+    }
+    return variant, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8-Quantisierung eines YOLO-Modells")
+    parser.add_argument('model', help="Pfad zur .pt Modelldatei")
+    parser.add_argument('--dataset', help="Detection-Datensatz, in dem die Variante gespeichert wird")
+    parser.add_argument('--variant', default='int8', help="Name der Variante im Datensatz")
+    parser.add_argument('--activate', action='store_true',
+                        help="Variante aktivieren, wenn die Freigabe-Kriterien erfüllt sind")
+    parser.add_argument('--calibration', type=int, default=200, help="Anzahl Kalibrierbilder")
+    parser.add_argument('--holdout', type=int, default=100, help="Anzahl Hold-out-Bilder")
+    parser.add_argument('--settings', default='settings.json', help="Einstellungsdatei")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    settings = Settings(args.settings).data
+    variant, report = quantize_model(args.model, settings, args.calibration, args.holdout)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if variant is None:
+        sys.exit(1)
+
+    if not report['accepted']:
+        print(f"Freigabe NICHT erfüllt (mAP50-Verlust <= {MAX_MAP_DROP}, "
+              f"Übereinstimmung >= {MIN_DECISION_AGREEMENT}) - Variante wird nicht aktiviert")
+
+    if args.dataset:
+        manager = DetectionDatasetManager()
+        if not manager.add_model_variant(args.dataset, args.variant, variant):
+            sys.exit(1)
+        if args.activate and report['accepted']:
+            manager.set_active_variant(args.dataset, args.variant)
+            print(f"Variante '{args.variant}' in Datensatz '{args.dataset}' aktiviert")
+
+    sys.exit(0 if report['accepted'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
 """ Standalone Parquet Viewer - Zum Anzeigen der Detection Event Logs Kann während der Anwendung läuft die Parquet-Dateien öffnen und anzeigen """
+import os
 import sys
-import pandas as pd
 import json
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QTableView, QVBoxLayout, QHBoxLayout,
 QWidget, QPushButton, QLineEdit, QLabel, QComboBox, QStatusBar,
 QHeaderView, QFileDialog, QMessageBox, QTextEdit, QSplitter,
-QListWidget, QGroupBox, QFormLayout)
-from PyQt6.QtCore import Qt, QSortFilterProxyModel, pyqtSignal
-from PyQt6.QtGui import QStandardItemModel, QStandardItem, QFont
+QListWidget, QGroupBox, QFormLayout, QDateEdit)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, pyqtSignal
+from PyQt6.QtGui import QFont
+
+from detection_logger import EVENTS_PREFIX, CYCLES_PREFIX, create_log_scanner
 
 class DetailViewWidget(QWidget):
     """Widget zur Anzeige der Event-Details als formatierter JSON."""
@@ -43,53 +49,250 @@ class DetailViewWidget(QWidget):
         except json.JSONDecodeError:
             self.details_text.setPlainText(f"Ungültiges JSON:\n{details_json_str}")
 
-class CustomProxyModel(QSortFilterProxyModel):
-    """Erweiterte Proxy-Model für kombinierte Filter."""
-    
+class ArrowTableModel(QAbstractTableModel):
+    """Virtualisiertes Tabellen-Modell direkt auf einer Arrow-Tabelle.
+
+    Zeilen werden blockweise nachgeladen (canFetchMore/fetchMore), Zellen erst
+    formatiert wenn die View sie anfragt. Filter und Sortierung laufen in
+    pyarrow.compute auf der gesamten Tabelle statt zeilenweise über Qt.
+    """
+
+    FETCH_BATCH_SIZE = 1000     # Zeilen pro fetchMore
+    CACHE_BATCHES = 64          # Zwischengespeicherte Blöcke (Python-Werte)
+    MAX_CELL_LENGTH = 100       # Längere Texte werden gekürzt (Volltext als Tooltip)
+
     def __init__(self):
         super().__init__()
+        self.table = None           # Vollständige Tabelle
+        self.row_indices = None     # Zeilen der gefilterten, sortierten Sicht (None = alle, Originalreihenfolge)
+        self.view_rows = 0
+        self.columns = []
+        self.loaded_rows = 0
+        self.sort_column = 'timestamp'
+        self.sort_order = 'descending'
         self.event_type_filter = ""
         self.status_filter = ""
         self.search_filter = ""
-        
+        self._batch_cache = OrderedDict()
+
+    def set_table(self, table, display_columns):
+        """Neue Tabelle setzen (Sortierung und Filter bleiben erhalten)."""
+        self.beginResetModel()
+        self.table = table
+        self.columns = [name for name in display_columns if name in table.column_names]
+        self._rebuild_view()
+        self.endResetModel()
+
+    def clear(self):
+        """Modell leeren."""
+        self.beginResetModel()
+        self.table = None
+        self.row_indices = None
+        self.view_rows = 0
+        self.columns = []
+        self.loaded_rows = 0
+        self._batch_cache.clear()
+        self.endResetModel()
+
+    def total_rows(self):
+        """Anzahl Zeilen der ungefilterten Tabelle."""
+        return self.table.num_rows if self.table is not None else 0
+
+    def filtered_rows(self):
+        """Anzahl Zeilen nach Filterung (unabhängig vom Nachladen)."""
+        return self.view_rows
+
+    # Filter (Arrow compute)
+
     def setEventTypeFilter(self, text):
         self.event_type_filter = text
-        self.invalidateFilter()
-        
+        self._apply_view()
+
     def setStatusFilter(self, text):
         self.status_filter = text
-        self.invalidateFilter()
-        
+        self._apply_view()
+
     def setSearchFilter(self, text):
         self.search_filter = text
-        self.invalidateFilter()
-        
-    def filterAcceptsRow(self, source_row, source_parent):
-        model = self.sourceModel()
-        
-        # Event-Type Filter (Spalte 1)
-        if self.event_type_filter and self.event_type_filter != "Alle":
-            event_type_index = model.index(source_row, 1, source_parent)
-            event_type_value = model.data(event_type_index, Qt.ItemDataRole.DisplayRole)
-            if event_type_value != self.event_type_filter:
-                return False
-        
-        # Status Filter (Spalte 3)
-        if self.status_filter and self.status_filter != "Alle":
-            status_index = model.index(source_row, 3, source_parent)
-            status_value = model.data(status_index, Qt.ItemDataRole.DisplayRole)
-            if status_value != self.status_filter:
-                return False
-        
-        # Text-Suche in Nachrichten (Spalte 4)
-        if self.search_filter:
-            message_index = model.index(source_row, 4, source_parent)
-            message_value = model.data(message_index, Qt.ItemDataRole.DisplayRole)
-            if message_value and self.search_filter.lower() not in message_value.lower():
-                return False
-        
-        return True
-            
+        self._apply_view()
+
+    def set_filters(self, event_type, status, search_text):
+        """Alle Filter auf einmal setzen (nur eine Neuberechnung)."""
+        self.event_type_filter = event_type
+        self.status_filter = status
+        self.search_filter = search_text
+        self._apply_view()
+
+    def _filter_mask(self):
+        """Kombinierte Filtermaske berechnen oder None wenn kein Filter aktiv."""
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else pc.and_kleene(current, condition)
+
+        names = self.table.column_names
+
+        # Event-Type Filter
+        if self.event_type_filter and self.event_type_filter != "Alle" and 'event_type' in names:
+            mask = combine(mask, pc.equal(self.table['event_type'], self.event_type_filter))
+
+        # Status Filter
+        if self.status_filter and self.status_filter != "Alle" and 'status' in names:
+            status_column = self.table['status']
+            if pa.types.is_dictionary(status_column.type):
+                status_column = status_column.cast(pa.string())
+            mask = combine(mask, pc.equal(status_column, self.status_filter))
+
+        # Text-Suche in Nachrichten
+        if self.search_filter and 'message' in names:
+            mask = combine(mask, pc.match_substring(self.table['message'], self.search_filter, ignore_case=True))
+
+        return mask
+
+    def _rebuild_view(self):
+        """Gefilterte und sortierte Sicht neu berechnen.
+
+        Es werden nur Zeilen-Indizes berechnet - die Tabelle selbst wird nicht kopiert.
+        """
+        self._batch_cache.clear()
+        self.loaded_rows = 0
+
+        if self.table is None:
+            self.row_indices = None
+            self.view_rows = 0
+            return
+
+        row_indices = None
+        mask = self._filter_mask()
+        if mask is not None:
+            row_indices = pc.indices_nonzero(pc.fill_null(mask, False))
+
+        if self.sort_column in self.table.column_names:
+            sort_values = self.table[self.sort_column]
+            if row_indices is not None:
+                sort_values = sort_values.take(row_indices)
+            if pa.types.is_dictionary(sort_values.type):
+                sort_values = sort_values.cast(sort_values.type.value_type)
+            try:
+                order = pc.array_sort_indices(sort_values, order=self.sort_order)
+                row_indices = order if row_indices is None else row_indices.take(order)
+            except pa.ArrowNotImplementedError:
+                # Verschachtelte Spalten (z.B. Klassen-Listen) sind nicht sortierbar
+                pass
+
+        self.row_indices = row_indices
+        self.view_rows = len(row_indices) if row_indices is not None else self.table.num_rows
+        self.loaded_rows = min(self.FETCH_BATCH_SIZE, self.view_rows)
+
+    def _apply_view(self):
+        if self.table is None:
+            return
+        self.beginResetModel()
+        self._rebuild_view()
+        self.endResetModel()
+
+    # Qt-Modell-Schnittstelle
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.loaded_rows < self.view_rows
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        remaining = self.view_rows - self.loaded_rows
+        count = min(self.FETCH_BATCH_SIZE, remaining)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded_rows, self.loaded_rows + count - 1)
+        self.loaded_rows += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.columns):
+                return self.columns[section]
+            return None
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+
+        value = self.value(index.row(), self.columns[index.column()])
+        if value is None:
+            return "" if role == Qt.ItemDataRole.DisplayRole else None
+
+        text = self._format_value(value)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return text if len(text) > self.MAX_CELL_LENGTH else None
+
+        # Lange Texte (z.B. Details-JSON) für Tabellen-Anzeige kürzen
+        if len(text) > self.MAX_CELL_LENGTH:
+            return text[:self.MAX_CELL_LENGTH - 3] + "..."
+        return text
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self.columns):
+            return
+        self.sort_column = self.columns[column]
+        self.sort_order = 'ascending' if order == Qt.SortOrder.AscendingOrder else 'descending'
+        self._apply_view()
+
+    # Zellwerte
+
+    def value(self, row, column_name):
+        """Python-Wert einer Zelle der aktuellen Sicht (blockweise zwischengespeichert)."""
+        batch_index = row // self.FETCH_BATCH_SIZE
+        batch = self._batch_cache.get(batch_index)
+
+        if batch is None:
+            batch = {}
+            self._batch_cache[batch_index] = batch
+            if len(self._batch_cache) > self.CACHE_BATCHES:
+                self._batch_cache.popitem(last=False)
+        else:
+            self._batch_cache.move_to_end(batch_index)
+
+        values = batch.get(column_name)
+        if values is None:
+            start = batch_index * self.FETCH_BATCH_SIZE
+            column = self.table[column_name]
+            if self.row_indices is None:
+                column = column.slice(start, self.FETCH_BATCH_SIZE)
+            else:
+                column = column.take(self.row_indices.slice(start, self.FETCH_BATCH_SIZE))
+            if pa.types.is_timestamp(column.type):
+                column = column.cast(pa.timestamp('us'))
+            values = column.to_pylist()
+            batch[column_name] = values
+
+        return values[row - batch_index * self.FETCH_BATCH_SIZE]
+
+    def row_dict(self, row):
+        """Alle Spalten einer Zeile der aktuellen Sicht als Dict."""
+        return {name: self.value(row, name) for name in self.table.column_names}
+
+    def _format_value(self, value):
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Millisekunden
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return str(value)
+
 class ParquetViewer(QMainWindow):
     """Hauptfenster für Parquet Event Log Viewer."""
 
@@ -100,10 +303,11 @@ class ParquetViewer(QMainWindow):
         # Fenster maximiert öffnen
         self.showMaximized()
         
-        self.df = None
-        self.model = QStandardItemModel()
-        self.proxy_model = CustomProxyModel()
-        self.proxy_model.setSourceModel(self.model)
+        self.table = None
+        self.current_file = None
+        self.current_directory = None   # Verzeichnis-Modus: mehrtägige Abfrage über alle Logs
+        self.scanned_filters = None     # (event_type, status) des letzten Verzeichnis-Scans
+        self.model = ArrowTableModel()
         
         self.init_ui()
         
@@ -151,6 +355,30 @@ class ParquetViewer(QMainWindow):
         self.open_button.clicked.connect(self.open_file)
         toolbar_layout.addWidget(self.open_button)
         
+        self.open_directory_button = QPushButton("🗂️ Log-Verzeichnis öffnen")
+        self.open_directory_button.setFixedHeight(30)
+        self.open_directory_button.clicked.connect(self.open_directory)
+        toolbar_layout.addWidget(self.open_directory_button)
+        
+        # Verzeichnis-Modus: Log-Art und Zeitraum (werden als Filter an den Scanner übergeben)
+        self.log_type_combo = QComboBox()
+        self.log_type_combo.addItem("Events", EVENTS_PREFIX)
+        self.log_type_combo.addItem("Zyklen", CYCLES_PREFIX)
+        self.log_type_combo.currentIndexChanged.connect(self.reload_directory)
+        toolbar_layout.addWidget(self.log_type_combo)
+        
+        toolbar_layout.addWidget(QLabel("Von:"))
+        self.start_date_edit = QDateEdit(QDate.currentDate().addDays(-7))
+        self.start_date_edit.setCalendarPopup(True)
+        self.start_date_edit.dateChanged.connect(self.reload_directory)
+        toolbar_layout.addWidget(self.start_date_edit)
+        
+        toolbar_layout.addWidget(QLabel("Bis:"))
+        self.end_date_edit = QDateEdit(QDate.currentDate())
+        self.end_date_edit.setCalendarPopup(True)
+        self.end_date_edit.dateChanged.connect(self.reload_directory)
+        toolbar_layout.addWidget(self.end_date_edit)
+        
         self.refresh_button = QPushButton("🔄 Aktualisieren")
         self.refresh_button.setFixedHeight(30)
         self.refresh_button.clicked.connect(self.refresh_current_file)
@@ -203,12 +431,14 @@ class ParquetViewer(QMainWindow):
         
         # Tabelle
         self.table_view = QTableView()
-        self.table_view.setSortingEnabled(True)
         self.table_view.setAlternatingRowColors(True)
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
-        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # Interactive statt ResizeToContents: sonst misst Qt bei jedem Nachladen alle Zeilen aus
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.table_view.horizontalHeader().setStretchLastSection(True)
-        self.table_view.setModel(self.proxy_model)
+        self.table_view.horizontalHeader().setSortIndicator(0, Qt.SortOrder.DescendingOrder)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setModel(self.model)
         
         # Selection-Handler für Detail-View
         self.table_view.selectionModel().selectionChanged.connect(self.on_row_selected)
@@ -229,122 +459,159 @@ class ParquetViewer(QMainWindow):
         if file_name:
             self.load_file(file_name)
 
+    def open_directory(self):
+        """Log-Verzeichnis öffnen (alle Tage als ein Dataset)."""
+        directory = QFileDialog.getExistingDirectory(self, "Log-Verzeichnis öffnen", "")
+        
+        if directory:
+            self.load_directory(directory)
+
+    def load_directory(self, directory):
+        """Logs aller Tage im gewählten Zeitraum über den Dataset-Scanner laden."""
+        try:
+            self.status_bar.showMessage(f"Lade Log-Verzeichnis: {directory}...")
+            self.current_directory = directory
+            self.current_file = None
+            
+            prefix = self.log_type_combo.currentData()
+            start = self.start_date_edit.date().toPyDate()
+            end = self.end_date_edit.date().toPyDate()
+            # Event-Typ und Status an den Scanner übergeben (Row-Groups ohne Treffer werden nicht gelesen)
+            event_type = self.event_type_combo.currentText()
+            status = self.status_combo.currentText()
+            self.scanned_filters = (event_type, status)
+            event_types = [event_type] if event_type != "Alle" and prefix == EVENTS_PREFIX else None
+            statuses = [status] if status != "Alle" else None
+            # Ende inklusiv: bis Mitternacht des gewählten Tages
+            scanner = create_log_scanner(directory, prefix,
+                                         start=datetime.combine(start, datetime.min.time()),
+                                         end=datetime.combine(end + timedelta(days=1), datetime.min.time()),
+                                         event_types=event_types, statuses=statuses)
+            if scanner is None:
+                self.table = None
+                self.model.clear()
+                self.file_info_label.setText(f"{os.path.basename(directory)}: keine Logs von {start} bis {end}")
+                self.status_bar.showMessage("Keine Log-Dateien im gewählten Zeitraum")
+                return
+            
+            self.table = scanner.to_table()
+            self.display_data()
+            
+            rows = self.table.num_rows
+            self.status_bar.showMessage(f"Log-Verzeichnis geladen: {rows} Events von {start} bis {end}")
+            self.file_info_label.setText(f"{os.path.basename(directory)} ({prefix}, {start} – {end}, {rows} Events)")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler", f"Fehler beim Laden des Log-Verzeichnisses:\n{str(e)}")
+            self.status_bar.showMessage("Fehler beim Laden des Log-Verzeichnisses")
+
+    def reload_directory(self):
+        """Verzeichnis-Modus nach Änderung von Log-Art oder Zeitraum neu laden."""
+        if self.current_directory:
+            self.load_directory(self.current_directory)
+
     def load_file(self, file_name):
         """Datei laden und anzeigen."""
         try:
             self.status_bar.showMessage(f"Lade Datei: {file_name}...")
             self.current_file = file_name
+            self.current_directory = None
+            self.scanned_filters = None
             
-            # Parquet-Datei laden
-            self.df = pd.read_parquet(file_name)
-            
-            # Timestamp-Spalte korrekt konvertieren
-            if 'timestamp' in self.df.columns:
-                self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
-                # Nach Timestamp absteigend sortieren (neueste zuerst)
-                self.df = self.df.sort_values('timestamp', ascending=False)
+            # Parquet-Datei als Arrow-Tabelle laden (memory-mapped, keine Konvertierung nach pandas)
+            self.table = pq.read_table(file_name, memory_map=True)
             
             self.display_data()
             
-            rows, cols = self.df.shape
+            rows, cols = self.table.num_rows, self.table.num_columns
             self.status_bar.showMessage(f"Datei geladen: {rows} Events, {cols} Spalten")
             
             # Datei-Info aktualisieren
-            import os
-            file_size = os.path.getsize(file_name) / (1024 * 1024)  # MB
+            file_size = self._get_path_size(file_name) / (1024 * 1024)  # MB
             self.file_info_label.setText(f"{os.path.basename(file_name)} ({file_size:.1f} MB, {rows} Events)")
             
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Laden der Datei:\n{str(e)}")
             self.status_bar.showMessage("Fehler beim Laden der Datei")
 
+    def _get_path_size(self, path):
+        """Dateigröße bzw. Summe der Teil-Dateien eines Tagesverzeichnisses."""
+        if os.path.isdir(path):
+            return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+                       if name.endswith('.parquet') and not name.startswith('_'))
+        return os.path.getsize(path)
+
     def refresh_current_file(self):
         """Aktuelle Datei neu laden."""
-        if hasattr(self, 'current_file') and self.current_file:
+        if self.current_directory:
+            self.load_directory(self.current_directory)
+        elif self.current_file:
             self.load_file(self.current_file)
         else:
             QMessageBox.information(self, "Info", "Keine Datei zum Aktualisieren ausgewählt")
 
     def display_data(self):
         """Daten in der Tabelle anzeigen."""
-        if self.df is None:
+        if self.table is None:
             return
         
-        # Modell zurücksetzen
-        self.model.clear()
-        
-        # Spalten für bessere Lesbarkeit anpassen
-        display_columns = ['timestamp', 'event_type', 'sub_type', 'status', 'message']
-        if 'details_json' in self.df.columns:
-            display_columns.append('details_json')
-        
-        # Nur relevante Spalten für Tabelle
-        display_df = self.df[display_columns].copy()
+        # Spalten für bessere Lesbarkeit anpassen - Event-Logs zuerst, sonst alle Spalten (z.B. Zyklus-Logs)
+        display_columns = ['timestamp', 'event_type', 'sub_type', 'status', 'message', 'details_json']
+        if 'event_type' not in self.table.column_names:
+            display_columns = self.table.column_names
         
-        # Timestamp formatieren für bessere Lesbarkeit
-        if 'timestamp' in display_df.columns:
-            display_df['timestamp'] = display_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Millisekunden
-        
-        # Header setzen
-        self.model.setHorizontalHeaderLabels(display_df.columns)
-        
-        # Filter-Combos aktualisieren
+        # Filter-Combos aktualisieren (Signale blockieren - Filter werden unten einmalig gesetzt)
         self.update_filter_combos()
         
-        # Daten einfügen
-        for row_idx, (_, row_data) in enumerate(display_df.iterrows()):
-            items = []
-            for val in row_data:
-                item = QStandardItem()
-                if pd.isna(val):
-                    item.setText("")
-                else:
-                    # Details-JSON kürzen für Tabellen-Anzeige
-                    if isinstance(val, str) and len(val) > 100:
-                        display_text = val[:97] + "..."
-                        item.setText(display_text)
-                        item.setToolTip(val)  # Volltext als Tooltip
-                    else:
-                        item.setText(str(val))
-                items.append(item)
-            self.model.appendRow(items)
+        self.model.set_table(self.table, display_columns)
+        self.apply_filters()
+        self.table_view.resizeColumnsToContents()
 
     def update_filter_combos(self):
         """Filter-ComboBoxen mit verfügbaren Werten aktualisieren."""
-        if self.df is None:
+        if self.table is None:
             return
         
-        # Event-Type Filter
-        self.event_type_combo.clear()
-        self.event_type_combo.addItem("Alle")
-        if 'event_type' in self.df.columns:
-            unique_types = sorted(self.df['event_type'].dropna().unique())
-            self.event_type_combo.addItems(unique_types)
-        
-        # Status Filter
-        self.status_combo.clear()
-        self.status_combo.addItem("Alle")
-        if 'status' in self.df.columns:
-            unique_statuses = sorted(self.df['status'].dropna().unique())
-            self.status_combo.addItems(unique_statuses)
+        for combo, column_name in ((self.event_type_combo, 'event_type'), (self.status_combo, 'status')):
+            current = combo.currentText()
+            if self.current_directory and current != "Alle" and column_name in self.table.column_names:
+                # Verzeichnis-Modus: Scan war auf diesen Wert eingeschränkt - bisherige Auswahl behalten
+                continue
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem("Alle")
+            if column_name in self.table.column_names:
+                column = self.table[column_name]
+                if pa.types.is_dictionary(column.type):
+                    column = column.cast(pa.string())
+                unique_values = sorted(value for value in pc.unique(column).to_pylist() if value is not None)
+                combo.addItems(unique_values)
+            # Bisherige Auswahl beim Aktualisieren beibehalten
+            if combo.findText(current) >= 0:
+                combo.setCurrentText(current)
+            combo.blockSignals(False)
 
     def apply_filters(self):
-        """Filter auf die Tabelle anwenden - jetzt mit korrigierter Kombinationslogik."""
-        if self.df is None:
+        """Filter auf die Tabelle anwenden - Filterung erfolgt in Arrow compute."""
+        if self.table is None:
             return
         
-        # Alle Filter an das Proxy-Model übergeben
+        # Alle Filter an das Modell übergeben
         event_type = self.event_type_combo.currentText()
         status = self.status_combo.currentText()
         search_text = self.search_input.text().strip()
         
-        self.proxy_model.setEventTypeFilter(event_type)
-        self.proxy_model.setStatusFilter(status)
-        self.proxy_model.setSearchFilter(search_text)
+        if self.current_directory and (event_type, status) != self.scanned_filters:
+            # Verzeichnis-Modus: Event-Typ/Status werden beim Scan gefiltert - neu scannen
+            self.load_directory(self.current_directory)
+            return
+        
+        self.model.set_filters(event_type, status, search_text)
+        self.detail_view.update_details('')
         
         # Status-Meldung aktualisieren
-        filtered_rows = self.proxy_model.rowCount()
-        total_rows = self.model.rowCount()
+        filtered_rows = self.model.filtered_rows()
+        total_rows = self.model.total_rows()
         
         if event_type != "Alle" or status != "Alle" or search_text:
             self.status_bar.showMessage(f"Filter angewendet: {filtered_rows} von {total_rows} Events angezeigt")
@@ -353,17 +620,24 @@ class ParquetViewer(QMainWindow):
 
     def reset_filters(self):
         """Alle Filter zurücksetzen."""
+        for widget in (self.event_type_combo, self.status_combo, self.search_input):
+            widget.blockSignals(True)
         self.event_type_combo.setCurrentText("Alle")
         self.status_combo.setCurrentText("Alle")
         self.search_input.clear()
+        for widget in (self.event_type_combo, self.status_combo, self.search_input):
+            widget.blockSignals(False)
+        
+        if self.current_directory and self.scanned_filters != ("Alle", "Alle"):
+            # Scan war auf Event-Typ/Status eingeschränkt - ungefiltert neu scannen
+            self.load_directory(self.current_directory)
+            return
         
-        # Filter am Proxy-Model zurücksetzen
-        self.proxy_model.setEventTypeFilter("")
-        self.proxy_model.setStatusFilter("")
-        self.proxy_model.setSearchFilter("")
+        # Filter am Modell zurücksetzen
+        self.model.set_filters("", "", "")
         
-        if self.df is not None:
-            total_rows = self.model.rowCount()
+        if self.table is not None:
+            total_rows = self.model.total_rows()
             self.status_bar.showMessage(f"Alle {total_rows} Events angezeigt")
 
     def on_row_selected(self, selected, deselected):
@@ -371,17 +645,14 @@ class ParquetViewer(QMainWindow):
         if not selected.indexes():
             return
         
-        # Erste ausgewählte Zeile ermitteln
-        source_index = self.proxy_model.mapToSource(selected.indexes()[0])
-        row = source_index.row()
+        # Erste ausgewählte Zeile ermitteln (Zeilen beziehen sich auf die gefilterte, sortierte Sicht)
+        row = selected.indexes()[0].row()
         
-        # Details-JSON aus der ursprünglichen DataFrame holen
-        if self.df is not None and 'details_json' in self.df.columns:
-            # Row-Index in Original-DataFrame ermitteln
-            # Da wir nach timestamp sortiert haben, müssen wir das berücksichtigen
-            original_row_index = self.df.index[row]
-            details_json = self.df.loc[original_row_index, 'details_json']
-            self.detail_view.update_details(details_json)
+        if self.table is not None and 'details_json' in self.table.column_names:
+            self.detail_view.update_details(self.model.value(row, 'details_json'))
+        elif self.table is not None:
+            # Typisierte Logs (z.B. Zyklus-Log): ganze Zeile anzeigen
+            self.detail_view.update_details(json.dumps(self.model.row_dict(row), default=str))
 
 def main():
     """Hauptfunktion für Standalone Parquet Viewer."""
@@ -389,8 +660,10 @@ def main():
     window = ParquetViewer()
     window.show()
 
-    # Startdatei automatisch laden, falls angegeben
-    if len(sys.argv) > 1 and sys.argv[1].endswith('.parquet'):
+    # Startdatei oder Log-Verzeichnis automatisch laden, falls angegeben
+    if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]) and not sys.argv[1].endswith('.parquet'):
+        window.load_directory(sys.argv[1])
+    elif len(sys.argv) > 1 and sys.argv[1].endswith('.parquet'):
         try:
             window.load_file(sys.argv[1])
         except Exception as e:
@@ -0,0 +1,135 @@
+"""
+Ressourcen-Manager - Thread-Pools und CPU-Kerne für KI, OpenCV und Pipeline-Threads
+Verhindert Überbelegung: Torch, OpenCV (inkl. MOG2) und ONNX Runtime starten sonst je einen
+Thread-Pool in Standardgröße und konkurrieren mit dem Qt-GUI-Thread
+Kern-Zuordnung (Affinität) pro Thread-Rolle nur wo das Betriebssystem es erlaubt (Linux)
+"""
+
+import os
+import logging
+import threading
+
+import cv2
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+# Thread-Rollen mit eigener Kern-Zuordnung (Pipeline-Stufen + GUI)
+THREAD_ROLES = ('ui', 'capture', 'preprocess', 'inference', 'render')
+
+AFFINITY_SUPPORTED = hasattr(os, 'sched_setaffinity')
+
+
+def parse_core_list(cores):
+    """Kernliste aus Settings normalisieren ([0, 1] oder "2-7" oder "0,2,4").
+
+    Returns:
+        set: Kern-IDs (leer = keine Einschränkung)
+    """
+    if not cores:
+        return set()
+    if isinstance(cores, str):
+        result = set()
+        for part in cores.split(','):
+            part = part.strip()
+            if '-' in part:
+                start, end = part.split('-', 1)
+                result.update(range(int(start), int(end) + 1))
+            elif part:
+                result.add(int(part))
+        return result
+    return {int(core) for core in cores}
+
+
+class ResourceManager:
+    """Wendet Thread- und Affinitäts-Einstellungen aus settings.json an.
+
+    Settings:
+        torch_threads (int): Intra-Op-Threads für Torch/ONNX Runtime/OpenVINO (0 = Standard)
+        torch_interop_threads (int): Inter-Op-Threads für Torch (0 = Standard, nur beim Start änderbar)
+        opencv_threads (int): OpenCV-Threads (-1 = Standard, 0/1 = sequentiell)
+        cpu_affinity (dict): {'enabled': bool, rolle: kernliste}
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.applied = {}
+        self._interop_set = False
+
+    def apply_global(self):
+        """Thread-Pool-Größen setzen (vor dem Laden des Modells aufrufen)."""
+        torch_threads = int(self.settings.get('torch_threads', 0) or 0)
+        interop_threads = int(self.settings.get('torch_interop_threads', 0) or 0)
+        opencv_threads = int(self.settings.get('opencv_threads', -1))
+
+        if TORCH_AVAILABLE:
+            if torch_threads > 0:
+                torch.set_num_threads(torch_threads)
+            if interop_threads > 0 and not self._interop_set:
+                try:
+                    torch.set_num_interop_threads(interop_threads)
+                    self._interop_set = True
+                except RuntimeError as e:
+                    # Nur möglich, bevor Torch parallele Arbeit gestartet hat
+                    logging.warning(f"Torch Inter-Op-Threads nicht änderbar: {e}")
+
+        # Für ONNX Runtime / OpenVINO (wirkt beim nächsten Laden des Modells)
+        try:
+            from detection_engine import set_inference_threads
+            set_inference_threads(torch_threads)
+        except ImportError as e:
+            logging.debug(f"Inferenz-Threads nicht gesetzt: {e}")
+
+        if opencv_threads >= 0:
+            cv2.setNumThreads(opencv_threads)
+
+        self.applied = {
+            'torch_threads': torch.get_num_threads() if TORCH_AVAILABLE else None,
+            'torch_interop_threads': torch.get_num_interop_threads() if TORCH_AVAILABLE else None,
+            'opencv_threads': cv2.getNumThreads(),
+            'cpu_count': os.cpu_count(),
+        }
+        logging.info(f"Ressourcen: {self.applied}")
+        return self.applied
+
+    def get_cores(self, role):
+        """Kerne für eine Thread-Rolle (leer = keine Einschränkung)."""
+        affinity = self.settings.get('cpu_affinity', {}) or {}
+        if not affinity.get('enabled', False):
+            return set()
+        return parse_core_list(affinity.get(role))
+
+    def pin_current_thread(self, role):
+        """Aufrufenden Thread auf die Kerne seiner Rolle festlegen.
+
+        Unter Linux gilt sched_setaffinity pro Thread; Threads, die danach aus
+        diesem Thread gestartet werden (z.B. Torch-Worker), erben die Zuordnung.
+        Hilfs-Threads ohne eigene Rolle (Bildspeicher, Logger) erben daher die
+        Kerne des GUI-Threads. Auf anderen Systemen wird nichts geändert.
+
+        Returns:
+            bool: True wenn die Zuordnung gesetzt wurde
+        """
+        cores = self.get_cores(role)
+        if not cores:
+            return False
+        if not AFFINITY_SUPPORTED:
+            logging.debug(f"CPU-Affinität auf diesem System nicht unterstützt ({role})")
+            return False
+
+        cpu_count = os.cpu_count() or 1
+        cores = {core for core in cores if 0 <= core < cpu_count}
+        if not cores:
+            logging.warning(f"Keine gültigen Kerne für Rolle '{role}' - Affinität nicht gesetzt")
+            return False
+
+        try:
+            os.sched_setaffinity(threading.get_native_id(), cores)
+            logging.info(f"Thread '{threading.current_thread().name}' ({role}) auf Kerne {sorted(cores)} festgelegt")
+            return True
+        except OSError as e:
+            logging.warning(f"CPU-Affinität für '{role}' nicht gesetzt: {e}")
+            return False
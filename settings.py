@@ -83,20 +83,50 @@ class Settings:
         return {
             # KI-Einstellungen
             'confidence_threshold': 0.5,
+            'inference_iou': 0.7,                # IoU-Schwelle für NMS im Modellaufruf
+            'inference_max_det': 300,            # Maximale Anzahl Boxen pro Bild
+            'inference_imgsz': 0,                # Eingabegröße (0 = Trainingsgröße des Modells)
+            'inference_backend': 'pytorch',      # 'pytorch', 'onnxruntime' oder 'openvino' (CPU-Stationen)
+            'model_warmup_runs': 3,              # Dummy-Inferenzen nach dem Laden (Kamera-Auflösung)
             'last_model': '',                    # Auto-Loading: Letztes Modell
             
             # Kamera-Einstellungen  
             'last_source': None,                 # Auto-Loading: Letzte Kamera/Video
             'last_mode_was_video': False,        # Auto-Loading: War es Video oder Kamera?
             'camera_config_path': '',            # Pfad zur IDS Peak Kamera-Konfigurationsdatei
+            'camera_normalize': False,           # Min/Max-Normalisierung der IDS-Frames (kostet Rechenzeit)
+            'camera_frame_pool_extra': 4,        # Frame-Puffer über den Pipeline-Bedarf hinaus (GUI-Rückstand)
+            'camera_ring_slots': 4,              # Ringpuffer des Aufnahme-Threads (neueste Frames)
             
             # Workflow - Zeiteinstellungen
             'motion_threshold': 110,      # Schwellwert für Bewegungserkennung
             'motion_decay_factor': 0.1,  # Abklingfaktor für Motion-Anzeige (0.1-0.99)
+            'motion_pyramid_level': 2,    # Bewegungserkennung auf 1/2^n Auflösung (0 = volle Auflösung)
             'settling_time': 1.0,         # Ausschwingzeit nach Bewegung (Sekunden)
             'capture_time': 3.0,          # Aufnahme-/Erkennungszeit (Sekunden)
             'blow_off_time': 5.0,         # Wartezeit nach Abblasen (Sekunden)
-            
+
+            # Frame-Pipeline (Capture, Vorverarbeitung, KI, Render in eigenen Threads)
+            'pipeline_queue_size': 1,     # Queue-Tiefe zwischen den Stufen (neuestes Frame gewinnt)
+            'pipeline_capture_fps': 30,   # Maximale Aufnahmerate (0 = unbegrenzt)
+            'inference_batch_max': 8,     # Max. Frames pro KI-Batch in der Erkennungsphase (1 = kein Batching)
+            'inference_batch_window': 0.1,  # Max. Sammelzeit eines Batches (Sekunden)
+            'display_max_fps': 15,        # Maximale Bildrate der Live-Anzeige (0 = jedes Frame)
+            'stats_refresh_hz': 5,        # Aktualisierungsrate der Zyklus-Statistik-Tabelle
+
+            # Thread-Pools und CPU-Kerne (DEV_benchmarks/sweep_thread_config.py ermittelt Werte)
+            'torch_threads': 0,           # Intra-Op-Threads Torch/ONNX Runtime/OpenVINO (0 = Standard)
+            'torch_interop_threads': 0,   # Inter-Op-Threads Torch (0 = Standard, nur beim Start)
+            'opencv_threads': -1,         # OpenCV-Threads (-1 = Standard)
+            'cpu_affinity': {             # Kernlisten pro Thread-Rolle (nur Linux, leer = alle Kerne)
+                'enabled': False,
+                'ui': [],
+                'capture': [],
+                'preprocess': [],
+                'inference': [],
+                'render': [],
+            },
+
             # ERWEITERTE Klassen-Konfiguration - NEUE STRUKTUR
             'class_assignments': {
                 # Format: {class_id: {assignment, expected_count, min_confidence, color}}
@@ -140,11 +170,26 @@ class Settings:
             'bad_images_directory': 'bad_images',         # Verzeichnis für Schlechtbilder
             'good_images_directory': 'good_images',       # Verzeichnis für Gutbilder
             'max_image_files': 100000,                    # Maximale Dateien pro Verzeichnis
+            'image_storage_layout': 'hourly',             # Ablage: 'flat', 'daily' (JJJJ/MM/TT) oder 'hourly' (JJJJ/MM/TT/HH) mit Index pro Ordner
+            'image_retention_mode': 'refuse',             # Bei vollem Verzeichnis: 'refuse' (nicht speichern) oder 'fifo' (älteste löschen)
+            'image_index_reconcile_interval': 300.0,      # Abgleich des Bild-Index mit dem Dateisystem (Sekunden)
+            'image_format': 'jpg',                        # Bildformat: 'jpg', 'png', 'webp' oder 'tiff' (verlustfrei, LZW)
+            'image_quality': 95,                          # JPEG/WebP-Qualität (0-100)
+            'image_png_compression': 3,                   # PNG-Kompressionsstufe (0-9)
+            'image_write_workers': 2,                     # Threads für Kodierung und Schreiben (Neustart nötig)
+            'image_write_queue_size': 16,                 # Maximale wartende Bilder im Writer-Pool
+            'image_write_overflow_policy': 'drop',        # Bei voller Queue: 'drop' (Bild verwerfen) oder 'block' (warten)
             
             # PARQUET-LOGGING-Einstellungen
             'parquet_log_enabled': True,                  # Parquet-Logging aktiviert
             'parquet_log_directory': 'logs/detection_events',  # Verzeichnis für Parquet-Logs
             'parquet_log_max_files': 1000000,               # Maximale Anzahl Log-Dateien
+            'parquet_log_batch_size': 256,                # Events pro Row-Group (Flush bei Erreichen)
+            'parquet_log_flush_interval': 5.0,            # Spätestens nach x Sekunden flushen
+            'parquet_log_part_interval': 60.0,            # Teil-Datei nach x Sekunden für Reader abschließen
+            'parquet_log_part_max_rows': 100000,          # Maximale Events pro Teil-Datei
+            'parquet_log_queue_size': 10000,              # Maximale wartende Events für den Writer-Thread
+            'parquet_log_overflow_policy': 'drop_oldest', # Bei voller Queue: 'drop_oldest', 'block' oder 'spill'
             
             # REFERENZLINIEN-Einstellungen
             'reference_lines': [
@@ -178,6 +223,15 @@ class Settings:
                 }
             ],
             
+            # BEWEGUNGS-ROI (nur dieser Bildbereich wird auf Bewegung geprüft, z.B. Förderband)
+            'motion_roi': {
+                'enabled': False,
+                'x': 0,                       # Linke Kante in % (0-100)
+                'y': 0,                       # Obere Kante in % (0-100)
+                'width': 100,                 # Breite in %
+                'height': 100                 # Höhe in %
+            },
+            
             # UI-Einstellungen
             'sidebar_width': 350,
             'show_confidence': True,
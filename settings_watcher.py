@@ -0,0 +1,235 @@
+"""
+Einstellungs-Überwachung - settings.json per Dateisystem-Ereignis neu laden statt zyklisch pollen
+Geparst wird nur, wenn sich Größe/Änderungszeit und Inhalt (Hash) geändert haben
+Änderungen werden als Diff pro Schlüssel ermittelt und nur an die betroffenen Abonnenten verteilt
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher
+
+_MISSING = object()   # Schlüssel fehlt (unterscheidbar von None)
+
+
+class SettingChange:
+    """Änderung eines Einstellungs-Schlüssels (oberste Ebene).
+
+    paths enthält die geänderten Pfade innerhalb verschachtelter Werte,
+    z.B. 'class_assignments.3.color'; bei einfachen Werten nur den Schlüssel.
+    """
+
+    __slots__ = ('key', 'old', 'new', 'paths')
+
+    def __init__(self, key, old, new, paths):
+        self.key = key
+        self.old = old
+        self.new = new
+        self.paths = paths
+
+    def __repr__(self):
+        return f"SettingChange({self.key!r}, {self.old!r} -> {self.new!r})"
+
+
+class SettingsChangeEvent:
+    """Ereignis für einen Abonnenten - enthält nur die abonnierten, geänderten Schlüssel."""
+
+    __slots__ = ('changes', 'settings')
+
+    def __init__(self, changes, settings):
+        self.changes = changes      # dict: Schlüssel -> SettingChange
+        self.settings = settings    # vollständige neue Einstellungen (dict)
+
+    @property
+    def keys(self):
+        return set(self.changes)
+
+    def changed(self, *keys):
+        """True wenn einer der Schlüssel geändert wurde."""
+        return any(key in self.changes for key in keys)
+
+    def get(self, key, default=None):
+        """Neuer Wert eines Schlüssels (auch wenn er nicht geändert wurde)."""
+        return self.settings.get(key, default)
+
+
+def _changed_paths(old, new, prefix):
+    """Geänderte Pfade zweier Werte (rekursiv durch dicts)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        paths = []
+        for key in sorted(set(old) | set(new), key=str):
+            if old.get(key, _MISSING) != new.get(key, _MISSING):
+                paths.extend(_changed_paths(old.get(key, _MISSING), new.get(key, _MISSING), f"{prefix}.{key}"))
+        return paths
+    return [prefix]
+
+
+def diff_settings(old, new):
+    """Strukturierter Diff zweier Einstellungs-Dicts.
+
+    Returns:
+        dict: Schlüssel -> SettingChange (fehlende Werte als None)
+    """
+    changes = {}
+    for key in set(old) | set(new):
+        old_value = old.get(key, _MISSING)
+        new_value = new.get(key, _MISSING)
+        if old_value != new_value:
+            changes[key] = SettingChange(
+                key,
+                None if old_value is _MISSING else old_value,
+                None if new_value is _MISSING else new_value,
+                _changed_paths(old_value, new_value, key),
+            )
+    return changes
+
+
+class SettingsWatcher(QObject):
+    """Überwacht die Einstellungsdatei und verteilt Änderungen an Abonnenten.
+
+    Überwacht werden Datei und Verzeichnis (Editoren ersetzen die Datei oft
+    atomar, dann fällt die Datei aus der Überwachung). Ereignisse werden kurz
+    gesammelt (debounce_ms). Ein langsamer Abgleich über os.stat (fallback_ms)
+    fängt Dateisysteme ohne Benachrichtigung ab - geparst wird auch dort nur bei
+    geänderter Datei.
+
+    Verglichen wird mit dem zuletzt verteilten Stand, nicht mit settings.data:
+    Änderungen aus dem Einstellungs-Dialog (set() + save()) werden so ebenfalls
+    erkannt und verteilt.
+    """
+
+    def __init__(self, settings, debounce_ms=200, fallback_ms=10000, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.path = os.path.abspath(str(settings.filename))
+        self._subscribers = []
+        self._applied = copy.deepcopy(settings.data)
+        self._fingerprint = self._stat()
+        self._digest = self._hash_file()
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.check)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_fs_event)
+        self._watcher.directoryChanged.connect(self._on_fs_event)
+
+        self._fallback = QTimer(self)
+        self._fallback.setInterval(fallback_ms)
+        self._fallback.timeout.connect(self.check)
+
+    def subscribe(self, keys, callback):
+        """Rückruf für Änderungen an bestimmten Schlüsseln registrieren.
+
+        Args:
+            keys: Iterable von Schlüsseln (None = alle Änderungen)
+            callback: Funktion(SettingsChangeEvent), läuft im GUI-Thread
+        """
+        self._subscribers.append((frozenset(keys) if keys is not None else None, callback))
+
+    def start(self):
+        """Überwachung starten."""
+        self._watch_paths()
+        self._fallback.start()
+        logging.info(f"Einstellungs-Überwachung aktiv: {self.path}")
+
+    def stop(self):
+        """Überwachung beenden."""
+        self._debounce.stop()
+        self._fallback.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _watch_paths(self):
+        """Datei (falls vorhanden) und Verzeichnis überwachen."""
+        directory = os.path.dirname(self.path) or '.'
+        if directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        if os.path.exists(self.path) and self.path not in self._watcher.files():
+            self._watcher.addPath(self.path)
+
+    def _on_fs_event(self, path):
+        # Bei Verzeichnis-Ereignissen nur reagieren, wenn die Einstellungsdatei betroffen sein kann
+        if path != self.path and self._stat() == self._fingerprint:
+            return
+        self._debounce.start()
+
+    def _stat(self):
+        """(Änderungszeit, Größe) der Datei oder None."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _hash_file(self, data=None):
+        """SHA-1 des Dateiinhalts (oder der übergebenen Bytes)."""
+        if data is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return None
+        return hashlib.sha1(data).hexdigest()
+
+    def check(self):
+        """Datei prüfen und bei geändertem Inhalt neu laden und verteilen.
+
+        Returns:
+            dict: Verteilte Änderungen (Schlüssel -> SettingChange), leer wenn keine
+        """
+        self._watch_paths()
+        fingerprint = self._stat()
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return {}
+
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            logging.warning(f"Einstellungsdatei nicht lesbar: {e}")
+            return {}
+
+        digest = self._hash_file(raw)
+        if digest == self._digest:
+            self._fingerprint = fingerprint
+            return {}
+
+        try:
+            new_data = json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            # Halb geschriebene Datei - aktuelle Einstellungen behalten, nächstes Ereignis abwarten
+            logging.warning(f"Einstellungsdatei ungültig, Änderung ignoriert: {e}")
+            return {}
+        if not isinstance(new_data, dict):
+            logging.warning("Einstellungsdatei enthält kein Objekt, Änderung ignoriert")
+            return {}
+
+        self._fingerprint = fingerprint
+        self._digest = digest
+        changes = diff_settings(self._applied, new_data)
+        self.settings.data = new_data
+        self._applied = copy.deepcopy(new_data)
+
+        if changes:
+            logging.info(f"Einstellungen geändert: {', '.join(sorted(changes))}")
+            self._dispatch(changes)
+        return changes
+
+    def _dispatch(self, changes):
+        """Änderungen an die betroffenen Abonnenten verteilen (Fehler je Abonnent isoliert)."""
+        for keys, callback in self._subscribers:
+            relevant = changes if keys is None else {key: change for key, change in changes.items() if key in keys}
+            if not relevant:
+                continue
+            try:
+                callback(SettingsChangeEvent(relevant, self.settings.data))
+            except Exception as e:
+                name = getattr(callback, '__qualname__', repr(callback))
+                logging.error(f"Fehler beim Anwenden der Einstellungen ({name}): {e}")
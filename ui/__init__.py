@@ -5,7 +5,7 @@ Importiert alle UI-Komponenten fuer einfache Verwendung
 
 from .main_ui import MainUI
 from .dialogs import CameraSelectionDialog, SettingsDialog
-from .widgets import StatusIndicator, CounterWidget, ProgressIndicator
+from .widgets import StatusIndicator, CounterWidget, ProgressIndicator, StatsTableModel
 from .styles import UIStyles
 
 __all__ = [
@@ -15,5 +15,6 @@ __all__ = [
     'StatusIndicator',
     'CounterWidget',
     'ProgressIndicator',
+    'StatsTableModel',
     'UIStyles'
 ]
\ No newline at end of file
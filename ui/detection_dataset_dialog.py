@@ -248,6 +248,19 @@ class DetectionDatasetDialog(QDialog):
         self.model_info_label.setStyleSheet("color: gray; font-style: italic;")
         model_layout.addWidget(self.model_info_label)
         
+        # Modell-Variante (Original oder z.B. quantisiertes INT8-Modell aus model_quantizer.py)
+        variant_layout = QHBoxLayout()
+        variant_layout.addWidget(QLabel("Variante:"))
+        self.model_variant_combo = QComboBox()
+        self.model_variant_combo.addItem("Original", None)
+        self.model_variant_combo.currentIndexChanged.connect(self.on_model_variant_changed)
+        variant_layout.addWidget(self.model_variant_combo, 1)
+        model_layout.addLayout(variant_layout)
+        
+        self.model_variant_report_label = QLabel("")
+        self.model_variant_report_label.setStyleSheet("color: gray; font-size: 11px;")
+        model_layout.addWidget(self.model_variant_report_label)
+        
         layout.addWidget(model_group)
         
         # Kamera/Video-Quelle
@@ -350,6 +363,35 @@ class DetectionDatasetDialog(QDialog):
             self.save_btn.setEnabled(True)
             self.revert_btn.setEnabled(True)
     
+    def on_model_variant_changed(self):
+        """Bewertungsbericht der gewählten Modell-Variante anzeigen."""
+        report = self.model_variant_combo.currentData(Qt.ItemDataRole.UserRole + 1) or {}
+        if report:
+            self.model_variant_report_label.setText(
+                f"mAP50 {report.get('map50', 0):.3f} ({report.get('map50_delta', 0):+.3f}), "
+                f"Übereinstimmung {report.get('decision_agreement', 0):.1%}, "
+                f"{report.get('latency_fp32_ms', 0):.0f} → {report.get('latency_int8_ms', 0):.0f} ms/Bild"
+                + ("" if report.get('accepted') else " - Freigabe NICHT erfüllt")
+            )
+        else:
+            self.model_variant_report_label.setText("")
+        self.on_editor_changed()
+    
+    def load_model_variants(self, detection_settings):
+        """Modell-Varianten des Datensatzes in die Auswahl übernehmen."""
+        self.model_variant_combo.blockSignals(True)
+        self.model_variant_combo.clear()
+        self.model_variant_combo.addItem("Original", None)
+        for variant_name, variant in detection_settings.get('model_variants', {}).items():
+            self.model_variant_combo.addItem(f"{variant_name} ({variant.get('backend', '')})", variant_name)
+            self.model_variant_combo.setItemData(self.model_variant_combo.count() - 1,
+                                                 variant.get('report', {}), Qt.ItemDataRole.UserRole + 1)
+        
+        index = self.model_variant_combo.findData(detection_settings.get('active_variant'))
+        self.model_variant_combo.setCurrentIndex(max(0, index))
+        self.model_variant_combo.blockSignals(False)
+        self.on_model_variant_changed()
+    
     def on_camera_type_changed(self):
         """Kamera-Typ wurde geändert."""
         self.current_camera_source = None
@@ -591,6 +633,9 @@ class DetectionDatasetDialog(QDialog):
             model_path, camera_source, camera_type
         )
         
+        if success and self.model_variant_combo.count() > 1:
+            success = self.dataset_manager.set_active_variant(name, self.model_variant_combo.currentData())
+        
         if success:
             self.refresh_datasets()
             self.save_btn.setEnabled(False)
@@ -634,6 +679,7 @@ class DetectionDatasetDialog(QDialog):
         self.model_path_edit.setText(detection_settings['model_path'])
         model_name = os.path.basename(detection_settings['model_path']) if detection_settings['model_path'] else "Kein Modell"
         self.model_info_label.setText(f"Geladen: {model_name}")
+        self.load_model_variants(detection_settings)
         
         self.camera_type_combo.setCurrentText(detection_settings['camera_type'])
         self.current_camera_source = detection_settings['camera_source']
@@ -678,6 +724,7 @@ class DetectionDatasetDialog(QDialog):
         self.settings_count_label.setText("0")
         
         self.model_info_label.setText("Kein Modell ausgewählt")
+        self.load_model_variants({})
         self.camera_info_label.setText("Keine Quelle ausgewählt")
         
         self.test_model_btn.setEnabled(False)
@@ -8,7 +8,7 @@ GEFIXT: Button-Signal-Verbindungen und User-Interface-Updates
 import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-    QSplitter, QFrame, QTableWidget, QTableWidgetItem, QHeaderView, 
+    QSplitter, QFrame, QTableView, QHeaderView, 
     QToolButton, QScrollArea, QMessageBox, QDialog
 )
 from PyQt6.QtCore import Qt, QTimer
@@ -22,6 +22,7 @@ from .dialogs import SettingsDialog
 from .detection_dataset_dialog import DetectionDatasetDialog
 from .styles import UIStyles
 from .reference_line_overlay import ReferenceLineOverlay
+from .widgets import StatsTableModel
 
 class MainUI(QWidget):
     """Hauptbenutzeroberflaeche mit Detection-Datensatz-Management und Referenzlinien-Overlay."""
@@ -159,8 +160,10 @@ class MainUI(QWidget):
 
     def _create_stats_section(self, layout):
         """Statistiken erstellen - ERWEITERT: 50% höher."""
-        self.last_cycle_table = QTableWidget(0, 5)
-        self.last_cycle_table.setHorizontalHeaderLabels(["Klasse", "Img", "Min", "Max", "Anz"])
+        # Model/View: nur geänderte Zellen werden neu gezeichnet
+        self.last_cycle_model = StatsTableModel(["Klasse", "Img", "Min", "Max", "Anz"], self)
+        self.last_cycle_table = QTableView()
+        self.last_cycle_table.setModel(self.last_cycle_model)
         self.last_cycle_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.last_cycle_table.verticalHeader().hide()
         
@@ -169,6 +172,17 @@ class MainUI(QWidget):
         
         self.last_cycle_table.setStyleSheet(UIStyles.get_stats_table_style())
         layout.addWidget(self.last_cycle_table)
+        
+        # Aktualisierung im festen Takt, unabhängig von der Bildrate
+        self._pending_cycle_stats = None
+        self.stats_refresh_timer = QTimer(self)
+        self.stats_refresh_timer.timeout.connect(self._refresh_last_cycle_stats)
+        self.set_stats_refresh_rate(self.app.settings.get('stats_refresh_hz', 5))
+        self.stats_refresh_timer.start()
+
+    def set_stats_refresh_rate(self, refresh_hz):
+        """Aktualisierungsrate der Statistik-Tabelle setzen (Hz)."""
+        self.stats_refresh_timer.setInterval(1000 // max(1, int(refresh_hz)))
 
     def _create_united_status_section(self, layout):
         """VEREINT: Status Grenzwerte + WAGO Modbus erstellen."""
@@ -378,6 +392,10 @@ class MainUI(QWidget):
         # Overlay exakt über Video-Label positionieren
         self.reference_overlay.setGeometry(self.video_label.geometry())
         
+        # Anzeige-Bilder in dieser Größe rendern lassen
+        if hasattr(self.app, 'display_renderer'):
+            self.app.display_renderer.set_target_size(event.size().width(), event.size().height())
+        
         # Original resizeEvent aufrufen
         QLabel.resizeEvent(self.video_label, event)
     
@@ -467,6 +485,7 @@ class MainUI(QWidget):
             if hasattr(self, 'reference_overlay'):
                 reference_lines = self.app.settings.get('reference_lines', [])
                 self.reference_overlay.update_reference_lines(reference_lines)
+                self.reference_overlay.update_motion_roi(self.app.settings.get('motion_roi', {}))
                 logging.debug(f"Referenzlinien aktualisiert: {len(reference_lines)} Linien")
         except Exception as e:
             logging.error(f"Fehler beim Aktualisieren der Referenzlinien: {e}")
@@ -692,68 +711,66 @@ class MainUI(QWidget):
         self.brightness_warning.setVisible(False)
     
     def update_last_cycle_stats(self, last_cycle_stats):
-        """Letzte Erkennungen aktualisieren."""
-        self.last_cycle_table.setRowCount(len(last_cycle_stats))
+        """Letzte Erkennungen vormerken - die Tabelle wird im festen Takt aktualisiert (stats_refresh_timer)."""
+        self._pending_cycle_stats = last_cycle_stats
+    
+    def _refresh_last_cycle_stats(self):
+        """Vorgemerkte Statistik in das Tabellen-Modell übernehmen (nur geänderte Zellen)."""
+        if self._pending_cycle_stats is None:
+            return
+        last_cycle_stats = self._pending_cycle_stats
+        self._pending_cycle_stats = None
         
-        for row, (class_name, stats) in enumerate(last_cycle_stats.items()):
-            # Klasse
-            self.last_cycle_table.setItem(row, 0, QTableWidgetItem(class_name))
-            
+        # Die Render-Stufe schreibt die Statistik im Worker-Thread fort - nur unter der Sperre lesen
+        with self.app.cycle_lock:
             # Img (Gesamtanzahl Bilder im Zyklus)
             cycle_image_count = self.app.cycle_image_count if hasattr(self.app, 'cycle_image_count') else 0
-            img_item = QTableWidgetItem(str(cycle_image_count))
-            img_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.last_cycle_table.setItem(row, 1, img_item)
-            
-            # Min Konfidenz im letzten Zyklus
-            min_conf = stats.get('min_confidence', 0.0)
-            if min_conf == 1.0:
-                min_conf = 0.0
-            min_conf_item = QTableWidgetItem(f"{min_conf:.2f}")
-            min_conf_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.last_cycle_table.setItem(row, 2, min_conf_item)
-            
-            # Max Konfidenz im letzten Zyklus
-            max_conf_item = QTableWidgetItem(f"{stats['max_confidence']:.2f}")
-            max_conf_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.last_cycle_table.setItem(row, 3, max_conf_item)
+        
+            rows = []
+            for class_name, stats in last_cycle_stats.items():
+                # Min Konfidenz im letzten Zyklus
+                min_conf = stats.get('min_confidence', 0.0)
+                if min_conf == 1.0:
+                    min_conf = 0.0
             
-            # Anz (Durchschnittliche Anzahl pro Bild)
-            total_detections = stats.get('total_detections', 0)
-            if cycle_image_count > 0:
-                avg_detections_per_image = total_detections / cycle_image_count
-                avg_rounded = round(avg_detections_per_image)
-            else:
-                avg_rounded = 0
+                # Anz (Durchschnittliche Anzahl pro Bild)
+                total_detections = stats.get('total_detections', 0)
+                if cycle_image_count > 0:
+                    avg_rounded = round(total_detections / cycle_image_count)
+                else:
+                    avg_rounded = 0
             
-            anz_item = QTableWidgetItem(str(avg_rounded))
-            anz_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.last_cycle_table.setItem(row, 4, anz_item)
+                rows.append((
+                    class_name,
+                    str(cycle_image_count),
+                    f"{min_conf:.2f}",
+                    f"{stats['max_confidence']:.2f}",
+                    str(avg_rounded),
+                ))
+        
+        self.last_cycle_model.set_rows(rows)
     
     def update_video(self, frame):
-        """Video-Frame aktualisieren."""
+        """Video-Frame aktualisieren.
+        
+        Erwartet ein BGR-Bild in Label-Größe vom DisplayRenderer (keine Farbkonvertierung,
+        kein Skalieren im GUI-Thread). Größere Frames werden einmal mit INTER_AREA verkleinert.
+        """
         try:
-            # Frame zu Qt-Format konvertieren
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_frame.shape
-            bytes_per_line = ch * w
+            label_size = self.video_label.size()
+            h, w = frame.shape[:2]
+            if w > label_size.width() or h > label_size.height():
+                scale = min(label_size.width() / w, label_size.height() / h)
+                size = (max(1, int(w * scale)), max(1, int(h * scale)))
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                h, w = frame.shape[:2]
+            if not frame.flags['C_CONTIGUOUS']:
+                frame = np.ascontiguousarray(frame)
             
-            # QPixmap erstellen
+            # QImage direkt auf den BGR-Daten, QPixmap.fromImage kopiert einmal
             from PyQt6.QtGui import QImage
-            qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(qt_image)
-            
-            # Skalieren fuer Video-Label
-            scaled_pixmap = pixmap.scaled(
-                self.video_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            
-            self.video_label.setPixmap(scaled_pixmap)
-            
-            # Overlay an Video-Label-Größe anpassen
-            self.reference_overlay.setGeometry(self.video_label.geometry())
+            qt_image = QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_BGR888)
+            self.video_label.setPixmap(QPixmap.fromImage(qt_image))
             
         except Exception as e:
             print(f"Fehler beim Video-Update: {e}")
@@ -1,6 +1,6 @@
 """
 Referenzlinien-Overlay Widget
-Zeichnet Referenzlinien über den Video-Stream als transparentes Overlay
+Zeichnet Referenzlinien und den Bewegungs-ROI über den Video-Stream als transparentes Overlay
 """
 
 from PyQt6.QtWidgets import QWidget
@@ -20,6 +20,7 @@ class ReferenceLineOverlay(QWidget):
         
         # Referenzlinien-Daten
         self.reference_lines = []
+        self.motion_roi = {}
         
         # Standard-Laser-Farben
         self.laser_colors = {
@@ -44,9 +45,18 @@ class ReferenceLineOverlay(QWidget):
         self.reference_lines = lines_config or []
         self.update()  # Widget neu zeichnen
     
+    def update_motion_roi(self, roi_config):
+        """Bewegungs-ROI aktualisieren.
+        
+        Args:
+            roi_config (dict): {'enabled': bool, 'x', 'y', 'width', 'height': int (0-100%)}
+        """
+        self.motion_roi = roi_config or {}
+        self.update()
+    
     def paintEvent(self, event):
-        """Zeichne die Referenzlinien."""
-        if not self.reference_lines:
+        """Zeichne die Referenzlinien und den Bewegungs-ROI."""
+        if not self.reference_lines and not self.motion_roi.get('enabled', False):
             return
             
         painter = QPainter(self)
@@ -59,6 +69,9 @@ class ReferenceLineOverlay(QWidget):
         if width <= 0 or height <= 0:
             return
         
+        if self.motion_roi.get('enabled', False):
+            self._draw_motion_roi(painter, width, height)
+        
         for line_config in self.reference_lines:
             if not line_config.get('enabled', False):
                 continue
@@ -80,6 +93,20 @@ class ReferenceLineOverlay(QWidget):
             except Exception as e:
                 logging.error(f"Fehler beim Zeichnen der Referenzlinie: {e}")
     
+    def _draw_motion_roi(self, painter, width, height):
+        """Bewegungs-ROI als gestricheltes Rechteck zeichnen."""
+        roi = self.motion_roi
+        x = int(roi.get('x', 0) / 100.0 * width)
+        y = int(roi.get('y', 0) / 100.0 * height)
+        w = int(roi.get('width', 100) / 100.0 * width)
+        h = int(roi.get('height', 100) / 100.0 * height)
+        
+        pen = QPen(QColor(255, 255, 255, 160), 2)
+        pen.setStyle(Qt.PenStyle.DashLine)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(x, y, w, h)
+    
     def _draw_laser_line(self, painter, line_type, position_percent, color, thickness, width, height):
         """Zeichne eine einzelne Laser-Linie mit Glow-Effekt."""
         
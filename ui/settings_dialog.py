@@ -286,6 +286,19 @@ class SettingsDialog(QDialog):
         self.confidence_spin.setDecimals(2)
         layout.addRow("Allgemeine Konfidenz-Schwelle:", self.confidence_spin)
         
+        # KI-Backend
+        backend_info = self._create_info_label(
+            "Recheneinheit für die KI-Erkennung. Auf Stationen ohne GPU sind ONNX Runtime "
+            "und OpenVINO deutlich schneller. Das Modell wird beim ersten Laden einmalig exportiert."
+        )
+        layout.addRow(backend_info)
+        
+        self.inference_backend_combo = QComboBox()
+        self.inference_backend_combo.addItem("PyTorch (Standard, GPU)", 'pytorch')
+        self.inference_backend_combo.addItem("ONNX Runtime (CPU)", 'onnxruntime')
+        self.inference_backend_combo.addItem("OpenVINO (Intel CPU)", 'openvino')
+        layout.addRow("KI-Backend:", self.inference_backend_combo)
+        
         self.tab_widget.addTab(scroll, "⚙️ Allgemein")
     
     def _create_class_assignments_tab(self):
@@ -500,6 +513,9 @@ class SettingsDialog(QDialog):
             line_frame = self._create_reference_line_config(i)
             layout.addWidget(line_frame)
         
+        # Bewegungs-ROI
+        layout.addWidget(self._create_motion_roi_config())
+        
         layout.addStretch()
         
         self.tab_widget.addTab(scroll, "📏 Referenzlinien")
@@ -546,6 +562,43 @@ class SettingsDialog(QDialog):
         
         self.reference_line_widgets.append(widgets)
         return frame
+    
+    def _create_motion_roi_config(self):
+        """Konfiguration des Bewegungs-ROI (Bereich für die Bewegungserkennung)."""
+        frame = QFrame()
+        frame.setStyleSheet("QFrame { border: 1px solid #ccc; border-radius: 5px; padding: 10px; }")
+        layout = QFormLayout(frame)
+        
+        header = QLabel("Bewegungs-ROI")
+        header.setFont(QFont("", 12, QFont.Weight.Bold))
+        layout.addRow(header)
+        
+        info_label = self._create_info_label(
+            "Nur dieser Bildbereich (z.B. das Förderband) wird auf Bewegung geprüft. "
+            "Wird als gestricheltes Rechteck über dem Video angezeigt."
+        )
+        layout.addRow(info_label)
+        
+        self.motion_roi_widgets = {}
+        self.motion_roi_widgets['enabled'] = QCheckBox("ROI aktivieren")
+        layout.addRow(self.motion_roi_widgets['enabled'])
+        
+        for key, label in (('x', "Links:"), ('y', "Oben:"), ('width', "Breite:"), ('height', "Höhe:")):
+            spin = QSpinBox()
+            spin.setRange(0, 100)
+            spin.setSuffix(" %")
+            self.motion_roi_widgets[key] = spin
+            layout.addRow(label, spin)
+        
+        # Pyramidenstufe - Rechenaufwand der Bewegungserkennung
+        self.motion_pyramid_combo = QComboBox()
+        self.motion_pyramid_combo.addItem("Volle Auflösung", 0)
+        self.motion_pyramid_combo.addItem("1/2 Auflösung", 1)
+        self.motion_pyramid_combo.addItem("1/4 Auflösung (empfohlen)", 2)
+        self.motion_pyramid_combo.addItem("1/8 Auflösung", 3)
+        layout.addRow("Auflösung Bewegungserkennung:", self.motion_pyramid_combo)
+        
+        return frame
         
     def _create_interfaces_tab(self):
         """Tab 4: 🔌 Schnittstellen (ehemals Hardware)"""
@@ -784,7 +837,7 @@ class SettingsDialog(QDialog):
         
         # Maximale Dateien - MIT INFO
         max_files_info = self._create_info_label(
-            "Maximale Anzahl Bilder pro Verzeichnis. Bei Erreichen werden keine weiteren Bilder gespeichert. "
+            "Maximale Anzahl Bilder pro Verzeichnis. Bei Erreichen werden keine weiteren Bilder gespeichert (oder mit FIFO die ältesten ersetzt). "
             "Verhindert Speicher-Überlauf bei Langzeitbetrieb."
         )
         layout.addRow(max_files_info)
@@ -795,6 +848,10 @@ class SettingsDialog(QDialog):
         self.max_images_spin.setValue(100000)
         layout.addRow("Max. Dateien pro Verzeichnis:", self.max_images_spin)
         
+        self.image_fifo_check = QCheckBox()
+        self.image_fifo_check.setToolTip("Bei vollem Verzeichnis die ältesten Bilder löschen statt nicht mehr zu speichern")
+        layout.addRow("Älteste Bilder ersetzen (FIFO):", self.image_fifo_check)
+        
         self._add_spacer(layout)
         
         # Helligkeitsüberwachung
@@ -1206,6 +1263,8 @@ class SettingsDialog(QDialog):
         self.blow_off_time_spin.setValue(self.settings.get('blow_off_time', 5.0))
         self.motion_decay_spin.setValue(self.settings.get('motion_decay_factor', 0.1))
         self.confidence_spin.setValue(self.settings.get('confidence_threshold', 0.5))
+        backend_index = self.inference_backend_combo.findData(self.settings.get('inference_backend', 'pytorch'))
+        self.inference_backend_combo.setCurrentIndex(max(0, backend_index))
         
         # Erweiterte Klassenzuteilungen laden
         self._load_class_assignments()
@@ -1241,6 +1300,7 @@ class SettingsDialog(QDialog):
         self.bad_images_dir_input.setText(self.settings.get('bad_images_directory', 'bad_images'))
         self.good_images_dir_input.setText(self.settings.get('good_images_directory', 'good_images'))
         self.max_images_spin.setValue(self.settings.get('max_image_files', 100000))
+        self.image_fifo_check.setChecked(self.settings.get('image_retention_mode', 'refuse') == 'fifo')
         
         self.brightness_low_spin.setValue(self.settings.get('brightness_low_threshold', 30))
         self.brightness_high_spin.setValue(self.settings.get('brightness_high_threshold', 220))
@@ -1285,6 +1345,16 @@ class SettingsDialog(QDialog):
                 widgets['position'].setValue(line_config.get('position', 50))
                 widgets['color'].setCurrentText(line_config.get('color', 'red'))
                 widgets['thickness'].setValue(line_config.get('thickness', 2))
+        
+        motion_roi = self.settings.get('motion_roi', {})
+        self.motion_roi_widgets['enabled'].setChecked(motion_roi.get('enabled', False))
+        self.motion_roi_widgets['x'].setValue(motion_roi.get('x', 0))
+        self.motion_roi_widgets['y'].setValue(motion_roi.get('y', 0))
+        self.motion_roi_widgets['width'].setValue(motion_roi.get('width', 100))
+        self.motion_roi_widgets['height'].setValue(motion_roi.get('height', 100))
+        
+        pyramid_index = self.motion_pyramid_combo.findData(self.settings.get('motion_pyramid_level', 2))
+        self.motion_pyramid_combo.setCurrentIndex(max(0, pyramid_index))
     
     def save_settings(self):
         """Einstellungen speichern."""
@@ -1297,6 +1367,7 @@ class SettingsDialog(QDialog):
         self.settings.set('capture_time', self.capture_time_spin.value())
         self.settings.set('blow_off_time', self.blow_off_time_spin.value())
         self.settings.set('confidence_threshold', self.confidence_spin.value())
+        self.settings.set('inference_backend', self.inference_backend_combo.currentData())
         
         # Erweiterte Klassenzuteilungen speichern
         self._save_class_assignments()
@@ -1322,6 +1393,7 @@ class SettingsDialog(QDialog):
         self.settings.set('bad_images_directory', self.bad_images_dir_input.text())
         self.settings.set('good_images_directory', self.good_images_dir_input.text())
         self.settings.set('max_image_files', self.max_images_spin.value())
+        self.settings.set('image_retention_mode', 'fifo' if self.image_fifo_check.isChecked() else 'refuse')
         
         self.settings.set('brightness_low_threshold', self.brightness_low_spin.value())
         self.settings.set('brightness_high_threshold', self.brightness_high_spin.value())
@@ -1392,6 +1464,12 @@ class SettingsDialog(QDialog):
             reference_lines.append(line_config)
         
         self.settings.set('reference_lines', reference_lines)
+        
+        self.settings.set('motion_roi', {
+            key: (widget.isChecked() if key == 'enabled' else widget.value())
+            for key, widget in self.motion_roi_widgets.items()
+        })
+        self.settings.set('motion_pyramid_level', self.motion_pyramid_combo.currentData())
     
     def reset_settings(self):
         """Einstellungen zurücksetzen."""
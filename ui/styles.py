@@ -699,7 +699,7 @@ class UIStyles:
     def get_stats_table_style():
         """Style für Statistics Table."""
         return """
-            QTableWidget {
+            QTableView {
                 background: rgba(255, 255, 255, 0.05);
                 color: #e2e8f0;
                 border: 1px solid rgba(255, 255, 255, 0.1);
@@ -717,11 +717,11 @@ class UIStyles:
                 font-weight: 600;
                 text-transform: uppercase;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 2px 3px;
                 border: none;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background: rgba(255, 255, 255, 0.1);
             }
         """
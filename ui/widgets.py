@@ -4,7 +4,7 @@ Hier koennen zukuenftige spezielle Widgets hinzugefuegt werden
 """
 
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QFont
 
 class StatusIndicator(QWidget):
@@ -162,4 +162,79 @@ class ProgressIndicator(QWidget):
     def reset(self):
         """Fortschritt zuruecksetzen."""
         self.current_time = 0.0
-        self.update_progress(0.0)
\ No newline at end of file
+        self.update_progress(0.0)
+
+
+class StatsTableModel(QAbstractTableModel):
+    """Tabellen-Modell fuer Statistik-Zeilen mit Diff-Aktualisierung.
+
+    set_rows() vergleicht mit dem bisherigen Stand und meldet nur geaenderte
+    Zellen per dataChanged. Neue Zeilen am Ende werden eingefuegt; nur wenn sich
+    die Zeilen-Schluessel anders aendern, wird das Modell zurueckgesetzt.
+    """
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self._keys = []
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() > 0:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def set_rows(self, rows):
+        """Zeilen setzen - erste Spalte ist der Schluessel der Zeile.
+
+        Args:
+            rows (list): Liste von Tupeln mit Anzeige-Texten
+
+        Returns:
+            int: Anzahl geaenderter Zellen
+        """
+        rows = [tuple(row) for row in rows]
+        keys = [row[0] for row in rows]
+
+        if keys[:len(self._keys)] != self._keys:
+            # Zeilen entfernt oder umsortiert (z.B. neuer Zyklus)
+            self.beginResetModel()
+            self._keys = keys
+            self._rows = rows
+            self.endResetModel()
+            return len(rows) * len(self.headers)
+
+        changed = 0
+        last_column = len(self.headers) - 1
+        for row_index, (old, new) in enumerate(zip(self._rows, rows)):
+            if old == new:
+                continue
+            columns = [column for column in range(len(new)) if old[column] != new[column]]
+            self._rows[row_index] = new
+            changed += len(columns)
+            self.dataChanged.emit(self.index(row_index, columns[0]), self.index(row_index, min(columns[-1], last_column)))
+
+        if len(rows) > len(self._rows):
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, len(rows) - 1)
+            self._keys = keys
+            self._rows.extend(rows[first:])
+            self.endInsertRows()
+            changed += (len(rows) - first) * len(self.headers)
+
+        return changed